@@ -1,33 +1,176 @@
 # Import required libraries
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, send_file, g, Response, stream_with_context
 from flask_cors import CORS  # Enable Cross-Origin Resource Sharing
-import base64  # For handling base64 encoded images
-import cv2     # For image processing
-import numpy as np  # For numerical operations
-from video_processor import VideoProcessor  # Custom video processing class
+import base64  # For decoding base64 encoded uploads
+import json  # NDJSON lines of batch results
 import os  # For file operations
-from text_processor import TextProcessor  # Custom text processing class
-from document_processor import IEEEDocumentProcessor  # Custom document processing class
+import uuid  # Unique temp file names
+import tasks  # Job functions run in worker processes
+from job_manager import JobManager, DONE, FAILED, CANCELLED  # Process pools for processing jobs
+from feature_cache import feature_cache  # Cached frame embeddings per video
+from youtube_cache import youtube_cache  # Cached downloads and transcripts per YouTube id
+from document_cache import document_cache  # Cached text, sections and slides per document
+from disk_cache import hash_file
+from image_store import image_store  # Slide images served by reference
+from upload_store import UploadStore, UploadError  # Streamed, resumable uploads
+from document_batch import DocumentBatch, BatchError  # Many documents (or a zip) in one request
+from instrumentation import metrics  # Latency histograms and counters for /metrics
 import threading
-import queue
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.serving import make_server
+from werkzeug.utils import secure_filename
 import time
 
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
-
-# Create a queue for processing requests
-processing_queue = queue.Queue()
-processing_lock = threading.Lock()
+# Largest request body (multipart or raw); resumable uploads are held to the same total
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_MB', '2048')) * 1024 * 1024
 
 # Create temporary directory for file uploads
 if not os.path.exists('temp'):
     os.makedirs('temp')
 
+# Latest stats reported by each worker process, by job type and pid
+worker_stats = {}
+
+def record_worker_stats(job):
+    metrics.inc('jobs_total', type=job.type, status=job.status)
+    metrics.observe('job_wait_seconds', job.started_at - job.submitted_at, type=job.type)
+    metrics.observe('job_run_seconds', job.finished_at - job.started_at, type=job.type)
+    if job.status != DONE:
+        return
+    stats = job.result.get('stats', {})
+    # Fold the worker's histograms and counters into this process's metrics
+    metrics.merge(stats.pop('metrics', None))
+    worker_stats.setdefault(job.type, {})[stats.get('worker_pid')] = stats
+
+# Bounded worker pools with per-type concurrency limits
+jobs = JobManager(
+    limits={
+        'video': int(os.getenv('JOB_LIMIT_VIDEO', '1')),
+        'text': int(os.getenv('JOB_LIMIT_TEXT', '4')),
+        'document': int(os.getenv('JOB_LIMIT_DOCUMENT', '2'))
+    },
+    initializers={'video': tasks.init_video_worker},
+    on_complete=record_worker_stats
+)
+
+# Uploaded files are streamed to disk in bounded chunks
+uploads = UploadStore(max_bytes=app.config['MAX_CONTENT_LENGTH'])
+
 # Global server instance
 server = None
 
+@app.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+        metrics.add_gauge('http_requests_in_flight', 1)
+
+@app.after_request
+def record_request_metrics(response):
+    if metrics.enabled and 'request_start' in g:
+        endpoint = request.endpoint or 'unknown'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - g.request_start,
+                        endpoint=endpoint, method=request.method)
+        metrics.inc('http_requests_total', endpoint=endpoint, method=request.method, status=response.status_code)
+    return response
+
+@app.teardown_request
+def finish_request(error=None):
+    if metrics.enabled and 'request_start' in g:
+        metrics.add_gauge('http_requests_in_flight', -1)
+
+def wants_async(data=None):
+    # Clients opt into job mode with ?async=1, or "async": true in the JSON body / form
+    value = request.args.get('async') or (data.get('async') if data else None)
+    return value is True or str(value).lower() in ('1', 'true', 'yes')
+
+def wants_timings(data=None):
+    # Clients opt into per-request timing metadata with ?timings=1, or "timings": true in the body / form
+    value = request.args.get('timings') or (data.get('timings') if data else None)
+    return value is True or str(value).lower() in ('1', 'true', 'yes')
+
+def job_timings(job):
+    # Queue wait, run time and the worker's per-stage durations for a finished job
+    info = job.to_dict()
+    return {
+        'wait_time': info['wait_time'],
+        'run_time': info['run_time'],
+        'stages': (job.result or {}).get('stats', {}).get('spans', {})
+    }
+
+def job_response(job, run_async, timings=False):
+    # Return the job id right away, or wait for the job and respond as before
+    if run_async:
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status
+        }), 202
+
+    job.wait()
+    return job_result_response(job, timings)
+
+def upload_json(upload):
+    # Upload metadata without the server-side path
+    return {
+        'success': True,
+        'upload_id': upload['upload_id'],
+        'offset': upload['offset'],
+        'total_size': upload['total_size'],
+        'complete': upload['complete'],
+        'sha256': upload['sha256']
+    }
+
+def upload_error_response(error):
+    body = {
+        'success': False,
+        'error': str(error)
+    }
+    if error.offset is not None:
+        body['offset'] = error.offset
+    return jsonify(body), error.status
+
+def too_large_response():
+    return jsonify({
+        'success': False,
+        'error': f"Request is larger than {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)} MB"
+    }), 413
+
+def image_mode(data=None):
+    # "imageMode": "url" returns slide images by reference; "inline" (or unset) keeps base64 images
+    mode = request.args.get('imageMode') or (data.get('imageMode') if data else None)
+    return mode if mode in ('inline', 'url') else None
+
+def submit_uploaded_video(upload, mode=None):
+    # The job owns the uploaded file from here on and deletes it when done
+    uploads.release(upload['upload_id'])
+    return jobs.submit('video', tasks.process_video, upload['path'], upload['sha256'], upload['path'], mode,
+                       owned_path=upload['path'])
+
+def job_result_response(job, timings=False):
+    if job.status == DONE:
+        body = {
+            'success': True,
+            'slides': job.result['slides']
+        }
+        if timings:
+            body['timings'] = job_timings(job)
+        return jsonify(body)
+    if job.status in (FAILED, CANCELLED):
+        return jsonify({
+            'success': False,
+            'status': job.status,
+            'error': job.error or 'Job was cancelled'
+        }), 500 if job.status == FAILED else 410
+    return jsonify({
+        'success': False,
+        'status': job.status,
+        'error': 'Job has not finished yet'
+    }), 409
+
 # Health check endpoint
 @app.route('/')
 def home():
@@ -36,13 +179,212 @@ def home():
         'message': 'API is working. Use /api/process-video endpoint for video processing.'
     })
 
+# Model status endpoint
+@app.route('/api/models')
+def model_status():
+    # Models live in the video worker processes; report what each one last sent back
+    return jsonify({
+        'success': True,
+        'workers': {
+            str(pid): stats.get('models', {})
+            for pid, stats in worker_stats.get('video', {}).items()
+        }
+    })
+
+def aggregate_cache_stats():
+    # Caches live in the worker processes; counters are summed over each
+    # worker's latest report (plus this process's own document cache hits),
+    # disk usage is read from disk directly
+    reports = [stats.get('caches', {}) for job_type in ('video', 'document')
+               for stats in worker_stats.get(job_type, {}).values()]
+    caches = {'features': feature_cache.stats(), 'youtube': youtube_cache.stats(), 'images': image_store.stats(),
+              'documents': document_cache.stats()}
+    document_counters = [f'{tier}_{kind}' for tier in ('text', 'sections', 'slides') for kind in ('hits', 'misses')]
+    for name in ('features', 'summaries', 'youtube', 'documents'):
+        totals = dict(caches.get(name, {}))
+        for key in ['hits', 'misses', 'evictions', 'expirations', 'memory_hits', 'disk_hits'] + document_counters:
+            values = [report[name][key] for report in reports if key in report.get(name, {})]
+            if values:
+                # Only document lookups also happen in this process; the other local counters stay zero
+                totals[key] = sum(values) + (totals.get(key, 0) if name == 'documents' else 0)
+        lookups = totals.get('hits', 0) + totals.get('misses', 0)
+        totals['hit_rate'] = round(totals.get('hits', 0) / lookups, 3) if lookups else 0.0
+        caches[name] = totals
+    return caches
+
+# Cache statistics endpoint
+@app.route('/api/cache')
+def cache_status():
+    return jsonify({
+        'success': True,
+        'caches': aggregate_cache_stats()
+    })
+
+# Metrics endpoint (Prometheus text exposition format)
+@app.route('/metrics')
+def metrics_endpoint():
+    if not metrics.enabled:
+        return Response('# metrics disabled (METRICS_ENABLED=0)\n', mimetype='text/plain; version=0.0.4')
+    # Gauges read at scrape time: job queues, model load times per worker, cache counters
+    gauges = []
+    for job_type, stats in jobs.stats().items():
+        gauges.append(('jobs_running', {'type': job_type}, stats['running']))
+        gauges.append(('jobs_queued', {'type': job_type}, stats['queued']))
+    for pid, stats in worker_stats.get('video', {}).items():
+        for model, model_stats in stats.get('models', {}).items():
+            gauges.append(('model_load_seconds', {'model': model, 'worker': pid}, model_stats.get('load_time')))
+            gauges.append(('model_size_bytes', {'model': model, 'worker': pid}, model_stats.get('size_bytes')))
+    for cache, stats in aggregate_cache_stats().items():
+        for key in ('hits', 'misses', 'hit_rate', 'evictions', 'size_bytes'):
+            if key in stats:
+                gauges.append((f'cache_{key}', {'cache': cache}, stats[key]))
+    return Response(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
+# Job queue statistics endpoint
+@app.route('/api/jobs')
+def job_stats():
+    return jsonify({
+        'success': True,
+        'queues': jobs.stats()
+    })
+
+# Job status endpoint
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    status = dict(job.to_dict(), success=True)
+    if job.status == DONE:
+        # Per-stage timings reported by the worker, e.g. the video text/visual branches
+        status['timings'] = job.result.get('stats', {}).get('timings')
+    return jsonify(status)
+
+# Job result endpoint
+@app.route('/api/jobs/<job_id>/result')
+def job_result(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    return job_result_response(job, wants_timings())
+
+# Job cancellation endpoint
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    if not jobs.cancel(job_id):
+        return jsonify({
+            'success': False,
+            'error': 'Job not found or already finished'
+        }), 404
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': jobs.get(job_id).status
+    })
+
+# Slide image endpoint: content-addressed, so the id doubles as a strong ETag
+@app.route('/api/images/<image_id>')
+def slide_image(image_id):
+    path = image_store.path(image_id)
+    if path is None:
+        return jsonify({
+            'success': False,
+            'error': 'Image not found'
+        }), 404
+    response = send_file(path, mimetype='image/jpeg', etag=image_id, max_age=365 * 24 * 3600, conditional=True)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+# Upload endpoints: one-shot (multipart or raw body) or resumable in chunks
+@app.route('/api/uploads', methods=['POST'])
+def create_upload():
+    try:
+        if request.args.get('resumable', '').lower() in ('1', 'true', 'yes'):
+            total_size = request.args.get('size')
+            upload_id = uploads.create(request.args.get('filename'), int(total_size) if total_size else None)
+            return jsonify(upload_json(uploads.get(upload_id))), 201
+
+        if request.mimetype == 'multipart/form-data':
+            file = request.files.get('file')
+            if file is None or file.filename == '':
+                return jsonify({
+                    'success': False,
+                    'error': 'No file uploaded'
+                }), 400
+            upload = uploads.save_stream(file.stream, file.filename)
+        else:
+            upload = uploads.save_stream(request.stream, request.args.get('filename'))
+        return jsonify(upload_json(upload)), 201
+    except UploadError as e:
+        return upload_error_response(e)
+    except RequestEntityTooLarge:
+        return too_large_response()
+    except Exception as e:
+        print(f"Error saving upload: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    try:
+        return jsonify(upload_json(uploads.get(upload_id)))
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.route('/api/uploads/<upload_id>', methods=['PATCH'])
+def append_upload(upload_id):
+    # Raw chunk bytes in the body; Upload-Offset must equal the bytes received so far
+    try:
+        offset = int(request.headers.get('Upload-Offset', '0'))
+        new_offset = uploads.append(upload_id, request.stream, offset)
+        return jsonify({
+            'success': True,
+            'upload_id': upload_id,
+            'offset': new_offset
+        })
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid Upload-Offset header'
+        }), 400
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    try:
+        return jsonify(upload_json(uploads.complete(upload_id)))
+    except UploadError as e:
+        return upload_error_response(e)
+
 # Video processing endpoint
 @app.route('/api/process-video', methods=['POST'])
 def process_video():
     try:
         print("Received request")
+
+        # Video file streamed straight to this endpoint as multipart/form-data
+        if request.mimetype == 'multipart/form-data':
+            file = request.files.get('file')
+            if file is None or file.filename == '':
+                return jsonify({
+                    'success': False,
+                    'error': 'No file uploaded'
+                }), 400
+            upload = uploads.save_stream(file.stream, file.filename)
+            return job_response(submit_uploaded_video(upload, image_mode(request.form)),
+                                wants_async(request.form), wants_timings(request.form))
+
         data = request.json
-        print("Request data:", data)
         
         # Validate request data
         if not data:
@@ -51,37 +393,38 @@ def process_video():
                 'error': 'No data received'
             }), 400
         
-        # Use a lock to prevent concurrent processing
-        with processing_lock:
-            # Handle YouTube URL processing
-            if 'youtubeUrl' in data:
-                print("Processing YouTube URL:", data['youtubeUrl'])
-                processor = VideoProcessor()
-                slides = processor.process(data['youtubeUrl'])
-            else:
-                # Handle direct video upload
-                print("Processing uploaded video")
-                video_base64 = data['video'].split(',')[1]  # Remove data URL prefix
-                video_bytes = base64.b64decode(video_base64)  # Decode base64 to bytes
-                
-                # Save video temporarily
-                temp_path = 'temp/temp_video.mp4'
-                with open(temp_path, 'wb') as f:
-                    f.write(video_bytes)
-                
-                # Process video and generate slides
-                processor = VideoProcessor()
-                slides = processor.process(temp_path)
-                
-                # Clean up temporary file
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+        # Handle YouTube URL processing
+        if 'youtubeUrl' in data:
+            print("Processing YouTube URL:", data['youtubeUrl'])
+            job = jobs.submit('video', tasks.process_video, data['youtubeUrl'], None, None, image_mode(data))
+        elif 'uploadId' in data:
+            # Video previously sent through /api/uploads
+            upload = uploads.get(data['uploadId'])
+            if not upload['complete']:
+                return jsonify({
+                    'success': False,
+                    'error': 'Upload is not complete'
+                }), 409
+            job = submit_uploaded_video(upload, image_mode(data))
+        else:
+            # Handle direct video upload (legacy base64 in JSON)
+            print("Processing uploaded video")
+            video_base64 = data['video'].split(',')[1]  # Remove data URL prefix
+            video_bytes = base64.b64decode(video_base64)  # Decode base64 to bytes
+            
+            # Save video under a unique name; the job removes it when done
+            temp_path = os.path.join('temp', f'{uuid.uuid4().hex}.mp4')
+            with open(temp_path, 'wb') as f:
+                f.write(video_bytes)
+            
+            job = jobs.submit('video', tasks.process_video, temp_path, None, temp_path, image_mode(data),
+                              owned_path=temp_path)
         
-        print("Slides generated:", slides)
-        return jsonify({
-            'success': True,
-            'slides': slides
-        })
+        return job_response(job, wants_async(data), wants_timings(data))
+    except UploadError as e:
+        return upload_error_response(e)
+    except RequestEntityTooLarge:
+        return too_large_response()
     except Exception as e:
         print("Error:", str(e))
         return jsonify({
@@ -94,23 +437,19 @@ def process_video():
 def process_text():
     try:
         data = request.json
-        processor = TextProcessor()
         
         # Handle topic-based or direct text input
         if 'topic' in data:
-            slides = processor.process_topic(data['topic'])
+            job = jobs.submit('text', tasks.process_text, 'topic', data['topic'])
         elif 'text' in data:
-            slides = processor.process_text(data['text'])
+            job = jobs.submit('text', tasks.process_text, 'text', data['text'])
         else:
             return jsonify({
                 'success': False,
                 'error': 'No topic or text provided'
             }), 400
             
-        return jsonify({
-            'success': True,
-            'slides': slides
-        })
+        return job_response(job, wants_async(data), wants_timings(data))
     except Exception as e:
         print("Error:", str(e))
         return jsonify({
@@ -136,35 +475,133 @@ def process_document():
                 'error': 'No file selected'
             }), 400
             
-        # Save uploaded file temporarily
-        temp_path = os.path.join('temp', file.filename)
+        # Save uploaded file under a unique name; the job removes it when done
+        temp_path = os.path.join('temp', f'{uuid.uuid4().hex}_{secure_filename(file.filename)}')
         file.save(temp_path)
-        
-        # Process document and generate slides
-        processor = IEEEDocumentProcessor()
-        slides = processor.process_document(temp_path)
-        
-        # Clean up temporary file
+
+        job = submit_document(temp_path)
+        return job_response(job, wants_async(request.form), wants_timings(request.form))
+    except Exception as e:
+        print(f"Error processing document: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def submit_document(temp_path):
+    # A repeat upload is answered from the slide cache without queueing a job;
+    # a miss is counted by the worker, which looks again
+    file_hash = hash_file(temp_path)
+    keys = document_cache.keys(file_hash, os.path.splitext(temp_path)[1].lower())
+    slides = document_cache.get('slides', keys['slides'], count_miss=False)
+    if slides is not None:
         os.remove(temp_path)
-        
+        return jobs.complete('document', {'slides': slides, 'stats': {'cached': 'slides'}})
+    return jobs.submit('document', tasks.process_document, temp_path, file_hash, owned_path=temp_path)
+
+def batch_result(index, entry, job=None, timings=False):
+    # One NDJSON line per document; a failure never affects the other documents
+    line = {'index': index, 'filename': entry['filename']}
+    if job is None:
+        return dict(line, success=False, error=entry['error'])
+    stats = (job.result or {}).get('stats', {})
+    line.update(job_id=job.id, status=job.status, cached=stats.get('cached'),
+                pages=stats.get('pdf', {}).get('pages'), run_time=job.to_dict()['run_time'])
+    if job.status != DONE or stats.get('error'):
+        line.update(success=False, error=stats.get('error') or job.error or 'Job was cancelled')
+    else:
+        line.update(success=True, slides=job.result['slides'])
+    if timings:
+        line['timings'] = job_timings(job)
+    return line
+
+def stream_batch_results(entries, submitted, started, timings=False):
+    summary = {'documents': len(entries), 'succeeded': 0, 'failed': 0, 'cached': 0, 'pages': 0}
+
+    def emit(line):
+        summary['succeeded' if line['success'] else 'failed'] += 1
+        summary['cached'] += line.get('cached') == 'slides'
+        summary['pages'] += line.get('pages') or 0
+        metrics.inc('batch_documents_total', status='succeeded' if line['success'] else 'failed')
+        return json.dumps(line) + '\n'
+
+    # Files rejected up front first, then documents in the order they finish
+    for index, entry in enumerate(entries):
+        if index not in submitted:
+            yield emit(batch_result(index, entry))
+    indexes = {job.id: index for index, job in submitted.items()}
+    try:
+        for job in jobs.as_completed(list(submitted.values())):
+            index = indexes[job.id]
+            yield emit(batch_result(index, entries[index], job, timings))
+    finally:
+        # The client went away: drop documents still queued (cancelling deletes their files)
+        for job in submitted.values():
+            if not job.done.is_set():
+                jobs.cancel(job.id)
+
+    elapsed = time.perf_counter() - started
+    summary.update(
+        elapsed=round(elapsed, 3),
+        documents_per_s=round(len(entries) / elapsed, 2) if elapsed > 0 else None,
+        pages_per_s=round(summary['pages'] / elapsed, 1) if elapsed > 0 else None
+    )
+    yield json.dumps({'summary': summary}) + '\n'
+
+# Batch document processing endpoint (NDJSON stream of per-document results)
+@app.route('/api/process-documents', methods=['POST'])
+def process_documents():
+    files = [f for f in request.files.getlist('files') + request.files.getlist('file') if f.filename]
+    if not files:
         return jsonify({
-            'success': True,
-            'slides': slides
-        })
+            'success': False,
+            'error': 'No files uploaded'
+        }), 400
+
+    batch = DocumentBatch()
+    try:
+        for file in files:
+            batch.add_upload(file)
+    except BatchError as e:
+        batch.cleanup()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
-        print(f"Error processing document: {e}")
+        batch.cleanup()
+        print(f"Error saving document batch: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+    # Throughput is measured from here, once every file is on disk
+    started = time.perf_counter()
+    submitted = {}
+    for index, entry in enumerate(batch.entries):
+        if entry['path'] is None:
+            continue
+        try:
+            submitted[index] = submit_document(entry['path'])
+        except Exception as e:
+            entry['error'] = str(e)
+            if os.path.exists(entry['path']):
+                os.remove(entry['path'])
+    return Response(stream_with_context(stream_batch_results(batch.entries, submitted, started,
+                                                             wants_timings(request.form))),
+                    mimetype='application/x-ndjson')
+
 def start_server():
     global server
-    server = make_server('127.0.0.1', 5000, app)
+    server = make_server('127.0.0.1', 5000, app, threaded=True)
     server.serve_forever()
 
 if __name__ == '__main__':
     try:
+        # Start worker pools up front so video workers warm their models before the first request
+        jobs.start()
+
         # Start the server in a separate thread
         server_thread = threading.Thread(target=start_server)
         server_thread.daemon = True
@@ -176,4 +613,5 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         if server:
             server.shutdown()
+        jobs.shutdown()
         print("Server stopped.") 
\ No newline at end of file
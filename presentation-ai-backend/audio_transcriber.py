@@ -0,0 +1,181 @@
+import multiprocessing
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def load_audio(path, sample_rate=SAMPLE_RATE):
+    """Decode the audio track of any container to mono float32 PCM with ffmpeg"""
+    cmd = [
+        'ffmpeg', '-nostdin', '-threads', '0', '-i', path,
+        '-vn', '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(sample_rate), '-'
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to extract audio: {result.stderr.decode(errors='ignore')[-500:]}")
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def find_speech_windows(audio, sample_rate=SAMPLE_RATE, frame_ms=30, silence_db=-40.0,
+                        min_silence=0.5, max_window=30.0, min_window=0.3):
+    """Split audio into (start, end) sample ranges at silences, skipping long silent stretches.
+
+    Frames quieter than silence_db (dBFS RMS) count as silence. Runs of at
+    least min_silence seconds separate speech regions; neighbouring regions
+    are merged into windows of up to max_window seconds (Whisper's context),
+    and longer regions are cut at their quietest frame.
+    """
+    frame_len = int(sample_rate * frame_ms / 1000)
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return []
+
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    db = 20 * np.log10(np.maximum(rms, 1e-10))
+    voiced = db > silence_db
+
+    # Speech regions in frames: voiced runs, bridging silent gaps shorter than min_silence
+    min_gap = max(1, int(min_silence * 1000 / frame_ms))
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    regions = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    # Merge regions into windows no longer than max_window, splitting long ones at quiet points
+    max_frames = int(max_window * 1000 / frame_ms)
+    windows = []
+    for start, end in regions:
+        while end - start > max_frames:
+            search_from = start + max_frames // 2
+            cut = search_from + int(np.argmin(db[search_from:start + max_frames]))
+            windows.append([start, cut])
+            start = cut
+        if windows and end - windows[-1][0] <= max_frames and start - windows[-1][1] < min_gap * 4:
+            windows[-1][1] = end
+        else:
+            windows.append([start, end])
+
+    min_frames = int(min_window * 1000 / frame_ms)
+    return [(start * frame_len, end * frame_len) for start, end in windows if end - start >= min_frames]
+
+
+# Transcription workers are started on first use and kept for later videos in this process,
+# so each worker loads Whisper once for its lifetime rather than once per request
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker)
+        return _pool
+
+
+def shutdown_pool(pool=None):
+    """Stop the transcription workers (only if pool is still the current one, when given)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and (pool is None or pool is _pool):
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _init_worker():
+    from model_registry import registry
+
+    registry.get('whisper')
+
+
+def _transcribe_window(audio, language=None):
+    from model_registry import registry
+
+    result = registry.get('whisper').transcribe(audio, fp16=False, language=language)
+    return result['segments']
+
+
+class AudioTranscriber:
+    """Whisper transcription of the speech windows of a video, in parallel worker processes.
+
+    The worker pool is shared by every transcriber in the process and sized
+    by the first one to use it.
+    """
+
+    def __init__(self, model=None, workers=None, language=None):
+        # model is used when transcribing in-process (workers <= 1); the registry's Whisper when None
+        self.model = model
+        self.workers = workers if workers is not None else int(os.getenv('AUDIO_WORKERS', '2'))
+        self.language = language or os.getenv('AUDIO_LANGUAGE') or None
+        self.stats = {}
+
+    def transcribe(self, video_path):
+        """Yield {'start', 'end', 'text'} segments (seconds) in order as windows finish"""
+        start_time = time.perf_counter()
+        audio = load_audio(video_path)
+        duration = len(audio) / SAMPLE_RATE
+        windows = find_speech_windows(audio)
+        speech = sum(end - start for start, end in windows) / SAMPLE_RATE
+        print(f"Audio: {duration:.1f}s, {len(windows)} speech windows, "
+              f"{duration - speech:.1f}s of silence skipped")
+
+        for offset, segments in self._transcribe_windows(audio, windows):
+            for segment in segments:
+                yield {
+                    'start': round(offset + segment['start'], 3),
+                    'end': round(offset + segment['end'], 3),
+                    'text': segment['text']
+                }
+
+        elapsed = time.perf_counter() - start_time
+        self.stats = {
+            'audio_duration': round(duration, 3),
+            'speech_duration': round(speech, 3),
+            'windows': len(windows),
+            'elapsed': round(elapsed, 3),
+            'real_time_factor': round(elapsed / duration, 3) if duration else None
+        }
+        print(f"Transcribed {duration:.1f}s of audio in {elapsed:.1f}s "
+              f"(real-time factor {self.stats['real_time_factor']})")
+
+    def _transcribe_windows(self, audio, windows):
+        # Yields (offset_seconds, segments) per window, in window order. With workers > 1 even a
+        # single window goes to the pool: the pool is kept, and this process may have no Whisper loaded
+        if self.workers <= 1:
+            model = self.model
+            if model is None:
+                from model_registry import registry
+
+                model = registry.get('whisper')
+            for start, end in windows:
+                result = model.transcribe(audio[start:end], fp16=False, language=self.language)
+                yield start / SAMPLE_RATE, result['segments']
+            return
+
+        pool = _get_pool(self.workers)
+        futures = [
+            (start / SAMPLE_RATE, pool.submit(_transcribe_window, audio[start:end], self.language))
+            for start, end in windows
+        ]
+        try:
+            for offset, future in futures:
+                yield offset, future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); the next video starts a fresh pool
+            shutdown_pool(pool)
+            raise
+        finally:
+            for _, future in futures:
+                future.cancel()
@@ -0,0 +1,86 @@
+"""Latency of repeat document uploads with the per-stage document cache.
+
+Processes a synthetic IEEE-style PDF cold, then again with each cache
+tier as the deepest hit: slides (a repeat upload, as the web process
+answers it and as a worker does), sections (after a key point scoring
+change) and text (after a section matching change). Asserts every run
+returns the same slides. Needs the NLTK data (`python setup_nltk_data.py`).
+
+Run from presentation-ai-backend/:
+    python -m benchmarks.document_cache --pages 20 200
+"""
+import argparse
+import os
+import tempfile
+
+import document_cache as cache_module
+from benchmarks.harness import median_time, time_runs, write_report
+from benchmarks.pdf_extraction import paper_pdf
+from disk_cache import hash_file
+from document_cache import DocumentCache
+from document_processor import IEEEDocumentProcessor
+
+
+def web_lookup(cache, path):
+    # What /api/process-document does before queueing a job
+    keys = cache.keys(hash_file(path), os.path.splitext(path)[1].lower())
+    return cache.get('slides', keys['slides'], count_miss=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='*', default=[20, 200])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args()
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = paper_pdf(os.path.join(tmp, f'paper_{pages}.pdf'), pages)
+            cache = DocumentCache(os.path.join(tmp, f'cache_{pages}'), 64 * 1024 * 1024)
+            processor = IEEEDocumentProcessor(cache=cache)
+            file_hash = hash_file(path)
+
+            # No caching, then a cold run that fills all three tiers
+            expected, uncached_s = median_time(lambda: processor.process_document(path), args.repeats)
+            cold, (cold_s,) = time_runs(lambda: processor.process_document(path, file_hash), 1)
+
+            runs = {'slides_web': lambda: web_lookup(cache, path),
+                    'slides_worker': lambda: processor.process_document(path, file_hash)}
+            results = {}
+            for name, func in runs.items():
+                results[name] = median_time(func, args.repeats)
+
+            # A newer stage version misses that tier and the later ones, then refills them
+            original = cache_module.SLIDES_VERSION, cache_module.SECTIONS_VERSION
+            try:
+                for name, attribute in (('sections', 'SLIDES_VERSION'), ('text', 'SECTIONS_VERSION')):
+                    def bump_and_process(name=name, attribute=attribute):
+                        setattr(cache_module, attribute, getattr(cache_module, attribute) + 1)
+                        slides = processor.process_document(path, file_hash)
+                        if processor.stats.get('cached') != name:
+                            raise AssertionError(f"Expected a {name} tier hit, got {processor.stats.get('cached')}")
+                        return slides
+
+                    results[name] = median_time(bump_and_process, args.repeats)
+            finally:
+                cache_module.SLIDES_VERSION, cache_module.SECTIONS_VERSION = original
+
+            for name, (slides, _) in results.items():
+                if slides != expected or cold != expected:
+                    raise AssertionError(f"Slides from the {name} tier differ from uncached processing")
+
+            report[f'{pages}_pages'] = {
+                'identical_slides': True,
+                'uncached_ms': round(uncached_s * 1000, 2),
+                'cold_ms': round(cold_s * 1000, 2),
+                **{f'{name}_hit_ms': round(seconds * 1000, 2) for name, (_, seconds) in results.items()},
+                'cache': cache.stats()
+            }
+
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
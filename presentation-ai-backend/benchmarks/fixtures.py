@@ -0,0 +1,196 @@
+import cv2
+import numpy as np
+
+# Deterministic inputs shared by the benchmarks
+
+TRANSCRIPT = (
+    "Welcome to this lecture on distributed systems. Today we begin with the basic question of why "
+    "we split work across many machines at all. The first reason is scale, because a single server "
+    "can only hold so much memory and serve so many requests. The second reason is availability, "
+    "since a service that runs on one machine goes down whenever that machine does. "
+    "An important idea in this course is that failures are normal rather than exceptional. "
+    "Disks fail, networks partition, and processes crash in the middle of writing data. "
+    "A key point is that every design decision we make has to account for these failures. "
+    "For example, consider a bank that stores account balances on two replicas. "
+    "If a transfer updates one replica and the network fails before the second is updated, "
+    "the two copies now disagree about how much money the customer has. "
+    "Such as in this case, we need a protocol that decides which copy is correct. "
+    "The main approach we will study is consensus, where a group of nodes agrees on a single value. "
+    "Paxos and Raft are the two algorithms that most production systems use for this purpose. "
+    "Raft was designed to be easier to understand, and it splits the problem into leader election, "
+    "log replication and safety. The leader receives every write, appends it to its log and sends "
+    "it to the followers, and an entry counts as committed once a majority has stored it. "
+    "A significant benefit of this design is that the cluster keeps working as long as a majority "
+    "of nodes are alive and can talk to each other. "
+    "Another example is a key value store that uses consistent hashing to spread keys over nodes. "
+    "When a node joins or leaves, only a small fraction of the keys have to move, which keeps "
+    "rebalancing cheap even for very large clusters. "
+    "We will also look at the trade off between consistency and latency, because waiting for a "
+    "majority of replicas adds round trips to every write. "
+    "Many systems therefore offer several consistency levels so that applications can choose. "
+    "In summary, distributed systems give us scale and availability, but they force us to deal "
+    "with partial failure, replication and agreement. "
+    "Finally, next week we will implement a small Raft cluster and measure how it behaves when "
+    "we kill the leader in the middle of a workload."
+)
+
+
+def slide_frame(index, width=1280, height=720):
+    """Slide-like RGB frame: coloured background, title bar, text lines and a chart, seeded by index"""
+    rng = np.random.default_rng(index)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = rng.integers(180, 256, size=3)
+
+    bar = int(height * 0.15)
+    cv2.rectangle(frame, (0, 0), (width, bar), tuple(int(c) for c in rng.integers(0, 120, size=3)), -1)
+    scale = height / 720
+    cv2.putText(frame, f"Slide {index}", (int(40 * scale), int(bar * 0.7)),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.6 * scale, (255, 255, 255), max(1, int(3 * scale)))
+
+    for line in range(int(rng.integers(3, 7))):
+        y = bar + int((60 + line * 70) * scale)
+        length = int(width * rng.uniform(0.2, 0.5))
+        cv2.putText(frame, "-" * (length // int(20 * scale + 1)), (int(60 * scale), y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0 * scale, (40, 40, 40), max(1, int(2 * scale)))
+
+    # Bar chart on the right half
+    base = int(height * 0.9)
+    for bar_index in range(int(rng.integers(3, 8))):
+        x = int(width * 0.55) + bar_index * int(60 * scale)
+        top = base - int(rng.integers(50, int(height * 0.55)))
+        color = tuple(int(c) for c in rng.integers(0, 256, size=3))
+        cv2.rectangle(frame, (x, top), (x + int(40 * scale), base), color, -1)
+    return frame
+
+
+def slide_frames(count, width=1280, height=720):
+    return [slide_frame(i, width, height) for i in range(count)]
+
+
+def transcript_sections(copies=1):
+    """The fixture transcript split into summarizable sections, repeated to make longer inputs"""
+    sentences = TRANSCRIPT.split('. ') * copies
+    return ['. '.join(sentences[i:i + 8]) for i in range(0, len(sentences), 8)]
+
+
+def write_slide_video(path, width=1280, height=720, seconds=60, fps=10, scene_seconds=(4, 12), seed=0):
+    """Write a deterministic slide-deck style video: static slides with hard cuts and a moving pointer.
+
+    Returns the cut times in milliseconds (the start of every slide after the first).
+    """
+    rng = np.random.default_rng(seed)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"Could not open video writer for {path}")
+
+    cuts = []
+    total = int(seconds * fps)
+    written = 0
+    scene = 0
+    try:
+        while written < total:
+            if written:
+                cuts.append(int(written * 1000 / fps))
+            length = min(total - written, int(rng.uniform(*scene_seconds) * fps))
+            slide = cv2.cvtColor(slide_frame(seed * 1000 + scene, width, height), cv2.COLOR_RGB2BGR)
+            radius = max(2, height // 90)
+            for i in range(length):
+                frame = slide.copy()
+                # A small pointer drifting across the slide, like a presenter's cursor
+                x = int((0.1 + 0.8 * i / max(1, length)) * width)
+                y = int((0.5 + 0.3 * np.sin(i / fps)) * height)
+                cv2.circle(frame, (x, y), radius, (0, 0, 255), -1)
+                writer.write(frame)
+            written += length
+            scene += 1
+    finally:
+        writer.release()
+    return cuts
+
+
+PAPER_HEADINGS = (
+    '# {title}', 'Abstract', 'Abstract—{body}', 'Index Terms—{body}', 'Keywords: {body}',
+    'I. INTRODUCTION', '1 Introduction', 'II. RELATED WORK', '2. Related Work', 'III. METHODOLOGY',
+    '3 Method', 'IV. RESULTS', '4. Results and Analysis', 'V. DISCUSSION', '5 Discussion',
+    'VI. CONCLUSION', '6. Conclusions', 'ACKNOWLEDGMENTS', 'Appendix A', 'REFERENCES', 'Bibliography'
+)
+
+
+def synthetic_paper(pages=20, lines_per_page=60, seed=0):
+    """Lines of an IEEE-style paper: headings in several spellings, body text, page numbers,
+    figure captions and near-miss lines that start like headings but are not"""
+    rng = np.random.default_rng(seed)
+    words = TRANSCRIPT.replace('.', '').split()
+    near_misses = ('In this paper we', 'Index of symbols', 'Results show that', 'Video frames are',
+                   '1 2 3', '#hashtag', 'İndex terms', 'KEYWORDS', 'references [1]', 'bibliography of',
+                   'iv  results were', 'A', 'Fig. 3 shows', 'Table 2 lists')
+    lines = []
+    for page in range(pages):
+        for _ in range(lines_per_page):
+            roll = rng.random()
+            if roll < 0.02:
+                heading = PAPER_HEADINGS[rng.integers(len(PAPER_HEADINGS))]
+                body = ' '.join(rng.choice(words, size=6))
+                lines.append(heading.format(title=body.title(), body=body))
+            elif roll < 0.08:
+                lines.append(near_misses[rng.integers(len(near_misses))] + ' ' + ' '.join(rng.choice(words, size=4)))
+            elif roll < 0.1:
+                lines.append('')
+            else:
+                lines.append(' '.join(rng.choice(words, size=int(rng.integers(4, 14)))))
+        lines.append(str(page + 1))
+    return lines
+
+
+def paper_sections(sentences_per_section=40, seed=0):
+    """{section: text} with sentences built to exercise every key point heuristic: numbers, long words,
+    leading 'The/This/We', parenthesized acronyms, repeated sentences and equal-score ties"""
+    rng = np.random.default_rng(seed)
+    words = TRANSCRIPT.replace('.', '').replace(',', '').split()
+    openers = ('The', 'This', 'These', 'We', 'Our', 'In', 'A', 'Results')
+    extras = ('(RAFT)', '(KV)', '(x)', 'in 2023', 'by 42%', 'consistency', '', '', '', '')
+    sections = {}
+    for section in ('abstract', 'introduction', 'related_work', 'methodology', 'results', 'discussion', 'conclusion'):
+        sentences = []
+        for _ in range(sentences_per_section):
+            if sentences and rng.random() < 0.08:
+                sentences.append(sentences[rng.integers(len(sentences))])
+                continue
+            body = ' '.join(rng.choice(words, size=int(rng.integers(3, 18))))
+            sentences.append(f"{rng.choice(openers)} {body} {rng.choice(extras)}".strip() + '.')
+        sections[section] = ' '.join(sentences)
+    return sections
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_text_pdf(path, pages):
+    """Minimal PDF with one Helvetica text line per string, a page per list of lines"""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for lines in pages:
+        body = ['BT /F1 9 Tf 11 TL 40 760 Td']
+        body += [f'({_pdf_escape(line)}) Tj T*' for line in lines]
+        body.append('ET')
+        stream = '\n'.join(body).encode('latin-1', 'replace')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (len(objects)))
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % kid for kid in kids), len(kids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+    return path
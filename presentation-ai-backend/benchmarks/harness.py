@@ -0,0 +1,31 @@
+"""Timing and report helpers shared by the benchmarks"""
+import json
+import statistics
+import time
+
+
+def time_runs(func, repeats):
+    """(result of the last call, wall time in seconds of each of `repeats` calls to func)"""
+    times = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def median_time(func, repeats):
+    """(result of the last call, median wall time in seconds over `repeats` calls to func)"""
+    result, times = time_runs(func, repeats)
+    return result, statistics.median(times)
+
+
+def write_report(report, path=None):
+    """Print the JSON report, and write it to path when given; returns the JSON text"""
+    output = json.dumps(report, indent=2)
+    print(output)
+    if path:
+        with open(path, 'w') as f:
+            f.write(output + '\n')
+    return output
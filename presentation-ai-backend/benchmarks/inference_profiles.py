@@ -0,0 +1,122 @@
+"""Compare the 'accurate' and 'fast-cpu' inference profiles on fixture inputs.
+
+Reports ViT and BART latency, model size and RSS growth per profile, and
+how closely the fast profile agrees with fp32: cosine similarity of the
+CLS features and ROUGE-1 / ROUGE-L F1 of the summaries.
+
+Run from presentation-ai-backend/:
+    python -m benchmarks.inference_profiles --frames 32 --repeats 3 --output profiles.json
+"""
+import argparse
+import statistics
+
+import numpy as np
+
+from benchmarks.fixtures import slide_frames, transcript_sections
+from benchmarks.harness import time_runs, write_report
+from memory_usage import current_rss_bytes
+from model_registry import create_registry
+from video_processor import VideoProcessor
+
+
+def run_profile(profile, frames, sections, repeats):
+    models = create_registry(profile)
+    rss_before = current_rss_bytes()
+    models.warm_up(['vit_processor', 'vit', 'summarizer'])
+    rss_after = current_rss_bytes()
+
+    processor = VideoProcessor(models=models, cache=False, cache_summaries=False, cache_youtube=False)
+    features, vit_times = time_runs(lambda: processor._extract_features(frames), repeats)
+    summaries, bart_times = time_runs(lambda: processor._summarize_texts(sections), repeats)
+
+    model_stats = models.stats()
+    report = {
+        'vit_median_s': round(statistics.median(vit_times), 4),
+        'vit_frames_per_s': round(len(frames) / statistics.median(vit_times), 2),
+        'bart_median_s': round(statistics.median(bart_times), 4),
+        'bart_sections_per_s': round(len(sections) / statistics.median(bart_times), 3),
+        'model_bytes': {name: stats['size_bytes'] for name, stats in model_stats.items() if stats['loaded']},
+        'load_time_s': {name: stats['load_time'] for name, stats in model_stats.items() if stats['loaded']},
+        'rss_growth_bytes': rss_after - rss_before
+    }
+    return report, np.asarray(features), summaries
+
+
+def cosine_similarity(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+
+def _f1(overlap, candidate_len, reference_len):
+    if overlap == 0:
+        return 0.0
+    precision = overlap / candidate_len
+    recall = overlap / reference_len
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_1(candidate, reference):
+    cand, ref = candidate.lower().split(), reference.lower().split()
+    counts = {}
+    for token in ref:
+        counts[token] = counts.get(token, 0) + 1
+    overlap = 0
+    for token in cand:
+        if counts.get(token, 0) > 0:
+            counts[token] -= 1
+            overlap += 1
+    return _f1(overlap, len(cand), len(ref))
+
+
+def rouge_l(candidate, reference):
+    cand, ref = candidate.lower().split(), reference.lower().split()
+    if not cand or not ref:
+        return 0.0
+    # Longest common subsequence, one row at a time
+    previous = [0] * (len(ref) + 1)
+    for token in cand:
+        current = [0]
+        for j, ref_token in enumerate(ref):
+            current.append(previous[j] + 1 if token == ref_token else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(cand), len(ref))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=32)
+    parser.add_argument('--copies', type=int, default=2, help='repeat the fixture transcript this many times')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args()
+
+    frames = slide_frames(args.frames)
+    sections = transcript_sections(args.copies)
+
+    accurate, accurate_features, accurate_summaries = run_profile('accurate', frames, sections, args.repeats)
+    fast, fast_features, fast_summaries = run_profile('fast-cpu', frames, sections, args.repeats)
+
+    similarity = cosine_similarity(accurate_features, fast_features)
+    report = {
+        'inputs': {'frames': args.frames, 'sections': len(sections), 'repeats': args.repeats},
+        'profiles': {'accurate': accurate, 'fast-cpu': fast},
+        'agreement': {
+            'cls_cosine_mean': round(float(similarity.mean()), 4),
+            'cls_cosine_min': round(float(similarity.min()), 4),
+            'rouge1_f1_mean': round(statistics.mean(
+                rouge_1(f, a) for f, a in zip(fast_summaries, accurate_summaries)), 4),
+            'rougeL_f1_mean': round(statistics.mean(
+                rouge_l(f, a) for f, a in zip(fast_summaries, accurate_summaries)), 4)
+        },
+        'speedup': {
+            'vit': round(accurate['vit_median_s'] / fast['vit_median_s'], 2),
+            'bart': round(accurate['bart_median_s'] / fast['bart_median_s'], 2)
+        }
+    }
+
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
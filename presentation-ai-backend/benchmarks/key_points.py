@@ -0,0 +1,118 @@
+"""Throughput of key point extraction, checked against the previous per-sentence loop.
+
+Scores the sections of synthetic papers with KeyPointScorer and with the
+old loop (kept below as the reference), asserts both pick the same
+sentences in the same order and reports sentences/second. Uses NLTK's
+punkt and stopwords when they are installed (`python setup_nltk_data.py`),
+otherwise a regex sentence splitter and a small stopword list; the
+comparison holds either way since both sides share the tokenizers.
+
+Run from presentation-ai-backend/:
+    python -m benchmarks.key_points --sentences 40 400 --repeats 5
+"""
+import argparse
+import re
+from collections import defaultdict
+
+from nltk.tokenize import NLTKWordTokenizer
+
+from benchmarks.fixtures import paper_sections
+from benchmarks.harness import median_time, write_report
+from key_point_scorer import KeyPointScorer
+
+FALLBACK_STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it', 'of', 'on',
+    'or', 'that', 'the', 'this', 'to', 'we', 'with', 'our', 'these', 'which', 'how'
+}
+# max_points per section, as in IEEEDocumentProcessor._organize_slides
+MAX_POINTS = {'methodology': 6, 'results': 6}
+
+
+def load_tokenizers():
+    """(sent_tokenize, word_tokenize, stop_words, source)"""
+    try:
+        import document_processor  # noqa: F401 - puts NLTK_DATA_DIR on the search path
+        from nltk.corpus import stopwords
+        from nltk.tokenize import sent_tokenize, word_tokenize
+        stop_words = set(stopwords.words('english'))
+        sent_tokenize('Probe. Sentence.')
+        return sent_tokenize, word_tokenize, stop_words, 'nltk'
+    except LookupError:
+        tokenizer = NLTKWordTokenizer()
+        return (lambda text: re.split(r'(?<=[.!?])\s+', text) if text else [],
+                tokenizer.tokenize, FALLBACK_STOP_WORDS, 'fallback')
+
+
+def reference_key_points(sentences, max_points, stop_words, word_tokenize):
+    # Scoring loop of IEEEDocumentProcessor._extract_key_points before KeyPointScorer, unchanged
+    scores = {}
+    word_freq = defaultdict(int)
+
+    for sentence in sentences:
+        words = word_tokenize(sentence.lower())
+        for word in words:
+            if word not in stop_words and word.isalnum():
+                word_freq[word] += 1
+
+    for sentence in sentences:
+        words = word_tokenize(sentence.lower())
+        score = sum(word_freq.get(word, 0) for word in words if word not in stop_words)
+
+        if any(char.isdigit() for char in sentence):
+            score *= 1.5
+        if any(len(word) >= 8 for word in words):
+            score *= 1.3
+        if sentence.startswith(('The ', 'This ', 'These ', 'We ', 'Our ')):
+            score *= 1.2
+        if re.search(r'\([A-Z]{2,}\)', sentence):
+            score *= 1.2
+
+        scores[sentence] = score / max(1, len(words))
+
+    return [sent for sent, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:max_points]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sentences', type=int, nargs='*', default=[40, 400], help='sentences per section')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seeds', type=int, default=20, help='papers per size checked for identical rankings')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args()
+
+    sent_tokenize, word_tokenize, stop_words, source = load_tokenizers()
+    scorer = KeyPointScorer(stop_words, word_tokenize)
+
+    def requests_for(seed, count):
+        return [(sent_tokenize(text), MAX_POINTS.get(section, 4))
+                for section, text in paper_sections(count, seed=seed).items()]
+
+    report = {'tokenizers': source}
+    for count in args.sentences:
+        for seed in range(args.seeds):
+            requests = requests_for(seed, count)
+            expected = [reference_key_points(sentences, k, stop_words, word_tokenize) for sentences, k in requests]
+            if scorer.top_k(requests) != expected:
+                raise AssertionError(f"Ranking mismatch for {count} sentences per section, seed {seed}")
+
+        requests = requests_for(0, count)
+        total = sum(len(sentences) for sentences, _ in requests)
+        _, reference_s = median_time(
+            lambda: [reference_key_points(sentences, k, stop_words, word_tokenize) for sentences, k in requests],
+            args.repeats
+        )
+        _, scorer_s = median_time(lambda: scorer.top_k(requests), args.repeats)
+
+        report[f'{count}_sentences_per_section'] = {
+            'sentences': total,
+            'identical_rankings': True,
+            'reference_sentences_per_s': round(total / reference_s),
+            'scorer_sentences_per_s': round(total / scorer_s),
+            'speedup': round(reference_s / scorer_s, 1)
+        }
+
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Compare keyframe selectors on selection time and slide diversity.
+
+Uses synthetic embedding sequences by default: a video of --slides scenes,
+each a random 768-d direction held for a random number of frames plus
+noise. --features loads real embeddings (an .npy of shape (frames, 768),
+e.g. features.npy from a feature cache entry) instead.
+
+Diversity is the mean pairwise cosine distance between the selected
+embeddings; coverage is the fraction of synthetic scenes with at least one
+selected frame.
+
+Run from presentation-ai-backend/:
+    python -m benchmarks.keyframe_selectors --frames 100 --slides 15 --repeats 50
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.harness import median_time, write_report
+from keyframe_selector import SELECTORS, create_selector
+
+
+def synthetic_features(frames, slides, dim=768, noise=0.05, seed=0):
+    """(features, scene id per frame) for a video that cycles through `slides` scenes"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.multinomial(frames - slides, np.ones(slides) / slides) + 1
+    scenes = np.repeat(np.arange(slides), lengths)
+    centers = rng.normal(size=(slides, dim)).astype(np.float32)
+    features = centers[scenes] + noise * rng.normal(size=(frames, dim)).astype(np.float32)
+    return features, scenes
+
+
+def diversity(features, indices):
+    if len(indices) < 2:
+        return 0.0
+    unit = features[indices] / np.linalg.norm(features[indices], axis=1, keepdims=True)
+    similarity = unit @ unit.T
+    upper = np.triu_indices(len(indices), k=1)
+    return float(np.mean(1.0 - similarity[upper]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--slides', type=int, default=15)
+    parser.add_argument('--interval-ms', type=int, default=6000, help='time between analyzed frames')
+    parser.add_argument('--features', help='.npy file of real embeddings to use instead of synthetic ones')
+    parser.add_argument('--selectors', nargs='*', default=list(SELECTORS))
+    parser.add_argument('--repeats', type=int, default=50)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args()
+
+    if args.features:
+        features, scenes = np.load(args.features).astype(np.float32), None
+    else:
+        features, scenes = synthetic_features(args.frames, args.slides)
+    timestamps = [i * args.interval_ms for i in range(len(features))]
+
+    report = {'inputs': {'frames': len(features), 'slides': None if scenes is None else args.slides}, 'selectors': {}}
+    for name in args.selectors:
+        selector = create_selector(name)
+        indices, seconds = median_time(lambda: selector.select(features, timestamps), args.repeats)
+        result = {
+            'median_ms': round(seconds * 1000, 3),
+            'selected': len(indices),
+            'indices': indices,
+            'diversity': round(diversity(features, indices), 4)
+        }
+        if scenes is not None:
+            result['scene_coverage'] = round(len(set(scenes[indices].tolist())) / args.slides, 3)
+        report['selectors'][name] = result
+
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Throughput of PDF text extraction, checked against the previous single-process loop.
+
+Writes synthetic IEEE-style papers as PDFs and extracts them with the old
+page loop (kept below as the reference), with PDFExtractor in-process and
+with its worker pool. Asserts the text is identical, and that sections
+matched on the streamed pages equal those matched on the full text, then
+reports pages/second and the time until section matching is done.
+
+Run from presentation-ai-backend/:
+    python -m benchmarks.pdf_extraction --pages 20 200 --workers 4
+"""
+import argparse
+import os
+import re
+import tempfile
+
+from benchmarks.fixtures import synthetic_paper, write_text_pdf
+from benchmarks.harness import median_time, write_report
+from pdf_extractor import PDFExtractor, process_two_columns
+from section_matcher import SectionMatcher
+
+
+def reference_extract_from_pdf(file_path):
+    # IEEEDocumentProcessor._extract_from_pdf before PDFExtractor, unchanged
+    import PyPDF2
+
+    text = []
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                processed_text = process_two_columns(page_text)
+                processed_text = re.sub(r'\s+\n\s+', '\n', processed_text)
+                processed_text = re.sub(r'-\n(\w)', r'\1', processed_text)
+                text.append(processed_text)
+
+    full_text = '\n'.join(text)
+    full_text = re.sub(r'(\n\s*){3,}', '\n\n', full_text)
+    return re.sub(r'^\s*\d+\s*$', '', full_text, flags=re.MULTILINE)
+
+
+def paper_pdf(path, pages, seed=0, lines_per_page=60):
+    lines = synthetic_paper(pages, lines_per_page=lines_per_page, seed=seed)
+    # Hyphenated line breaks, which page cleanup joins back together
+    lines = [line + ' distrib-' if i % 17 == 0 and line else line for i, line in enumerate(lines)]
+    size = lines_per_page + 1
+    return write_text_pdf(path, [lines[i:i + size] for i in range(0, len(lines), size)])
+
+
+def streamed_sections(extractor, matcher, path):
+    return matcher.identify(line for page in extractor.iter_pages(path) for line in page.split('\n'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='*', default=[20, 200])
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument('--pages-per-task', type=int, default=8)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seeds', type=int, default=3, help='papers per size checked for identical output')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args()
+
+    matcher = SectionMatcher()
+    sequential = PDFExtractor(workers=1, pages_per_task=args.pages_per_task)
+    parallel = PDFExtractor(workers=args.workers, pages_per_task=args.pages_per_task, min_pages=0)
+    report = {'workers': args.workers, 'pages_per_task': args.pages_per_task}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for pages in args.pages:
+                for seed in range(args.seeds):
+                    path = paper_pdf(os.path.join(tmp, f'paper_{pages}_{seed}.pdf'), pages, seed=seed)
+                    expected = reference_extract_from_pdf(path)
+                    expected_sections = matcher.identify(expected.split('\n'))
+                    for extractor in (sequential, parallel):
+                        if extractor.extract_text(path) != expected:
+                            raise AssertionError(f"Text mismatch for {pages} pages, seed {seed}")
+                        if streamed_sections(extractor, matcher, path) != expected_sections:
+                            raise AssertionError(f"Section mismatch for {pages} pages, seed {seed}")
+
+                path = os.path.join(tmp, f'paper_{pages}_0.pdf')
+                parallel.extract_text(path)  # start the pool outside the timings
+                _, reference_s = median_time(lambda: reference_extract_from_pdf(path), args.repeats)
+                _, sequential_s = median_time(lambda: sequential.extract_text(path), args.repeats)
+                _, parallel_s = median_time(lambda: parallel.extract_text(path), args.repeats)
+                _, reference_sections_s = median_time(
+                    lambda: matcher.identify(reference_extract_from_pdf(path).split('\n')), args.repeats)
+                stats = {}
+                _, streamed_s = median_time(
+                    lambda: matcher.identify(line for page in parallel.iter_pages(path, stats)
+                                             for line in page.split('\n')), args.repeats)
+
+                report[f'{pages}_pages'] = {
+                    'identical_text': True,
+                    'identical_sections': True,
+                    'reference_pages_per_s': round(pages / reference_s, 1),
+                    'in_process_pages_per_s': round(pages / sequential_s, 1),
+                    'parallel_pages_per_s': round(pages / parallel_s, 1),
+                    'speedup': round(reference_s / parallel_s, 1),
+                    'mean_page_seconds': stats['mean_page_seconds'],
+                    'max_page_seconds': stats['max_page_seconds'],
+                    'reference_sections_done_s': round(reference_sections_s, 3),
+                    'streamed_sections_done_s': round(streamed_s, 3)
+                }
+    finally:
+        parallel.shutdown()
+
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
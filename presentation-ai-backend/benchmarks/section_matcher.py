@@ -0,0 +1,108 @@
+"""Throughput of the document section matcher, checked against the previous implementation.
+
+Runs SectionMatcher.identify and the old per-pattern loop (kept below as
+the reference, with its per-line debug prints sent to /dev/null) over
+synthetic IEEE-style papers, asserts both return identical sections and
+reports lines/second.
+
+Run from presentation-ai-backend/:
+    python -m benchmarks.section_matcher --pages 20 200 --repeats 5
+"""
+import argparse
+import contextlib
+import os
+import re
+
+from benchmarks.fixtures import synthetic_paper
+from benchmarks.harness import median_time, write_report
+from section_matcher import SectionMatcher, IEEE_SECTION_PATTERNS, IEEE_IGNORE_PATTERN
+
+
+def reference_identify_sections(text, section_patterns=IEEE_SECTION_PATTERNS, ignore_patterns=IEEE_IGNORE_PATTERN):
+    # IEEEDocumentProcessor._identify_sections before the compiled matcher, unchanged
+    sections = {}
+    lines = text.split('\n')
+    current_section = None
+    current_content = []
+
+    for line in lines:
+        line = line.strip()
+        print(f"[DEBUG] Processing line: '{line}'")
+        if not line:
+            print("[DEBUG] Skipping empty line")
+            continue
+
+        is_section_header = False
+        for section_type, pattern in section_patterns.items():
+            print(f"[DEBUG] Testing pattern '{pattern}' for section '{section_type}'")
+            if re.search(pattern, line, re.IGNORECASE):
+                print(f"[DEBUG] Match found for section pattern '{section_type}'")
+                if current_section:
+                    content_text = '\n'.join(current_content)
+                    print(f"[DEBUG] Storing content for section '{current_section}'. Content length: {len(content_text)}")
+                    sections[current_section] = content_text
+
+                current_section = section_type
+                current_content = []
+                is_section_header = True
+                print(f"[DEBUG] Current section set to: '{current_section}'")
+                break
+
+        if re.search(ignore_patterns, line.lower()):
+            print(f"[DEBUG] Line matches ignore pattern: '{line}'")
+            continue
+
+        if not is_section_header and current_section:
+            if not re.match(r'^\d+\s*$', line):
+                current_content.append(line)
+                print(f"[DEBUG] Appending line to current_content for section '{current_section}': '{line[:50]}'...")
+
+    if current_section and current_content:
+        final_content = '\n'.join(current_content)
+        sections[current_section] = final_content
+        print(f"[DEBUG] Storing final content for section '{current_section}'. Content length: {len(final_content)}")
+
+    return sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='*', default=[20, 200])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seeds', type=int, default=5, help='papers per size checked for identical output')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args()
+
+    matcher = SectionMatcher()
+    report = {}
+    for pages in args.pages:
+        # Identical output on several papers first, then timing on the first one
+        for seed in range(args.seeds):
+            text = '\n'.join(synthetic_paper(pages, seed=seed))
+            with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+                expected = reference_identify_sections(text)
+            actual = matcher.identify(text.split('\n'))
+            if actual != expected or list(actual) != list(expected):
+                raise AssertionError(f"Section mismatch for {pages} pages, seed {seed}")
+
+        lines = synthetic_paper(pages, seed=0)
+        text = '\n'.join(lines)
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            _, reference_s = median_time(lambda: reference_identify_sections(text), args.repeats)
+        _, compiled_s = median_time(lambda: matcher.identify(text.split('\n')), args.repeats)
+        _, iterator_s = median_time(lambda: matcher.identify(iter(lines)), args.repeats)
+
+        report[f'{pages}_pages'] = {
+            'lines': len(lines),
+            'identical_sections': True,
+            'reference_lines_per_s': round(len(lines) / reference_s),
+            'compiled_lines_per_s': round(len(lines) / compiled_s),
+            'compiled_iterator_lines_per_s': round(len(lines) / iterator_s),
+            'speedup': round(reference_s / compiled_s, 1)
+        }
+
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Small stand-ins for the pipeline's models, for benchmarking without the real weights.
+
+The stand-in ViT has the real model's interface and output shape (a
+16x16-patch convolution to 768 channels), so batching, preprocessing and
+keyframe selection do representative work; the features themselves are
+not meaningful beyond distinguishing different frames.
+"""
+import os
+from types import SimpleNamespace
+
+import torch
+import torch.nn as nn
+
+from model_registry import ModelRegistry, create_registry
+
+
+class StandInViT(nn.Module):
+    def __init__(self, hidden_size=768, patch_size=16):
+        super().__init__()
+        self.config = SimpleNamespace(hidden_size=hidden_size)
+        torch.manual_seed(0)
+        self.patch_embedding = nn.Conv2d(3, hidden_size, kernel_size=patch_size, stride=patch_size)
+        self.eval()
+
+    def forward(self, pixel_values):
+        patches = self.patch_embedding(pixel_values).flatten(2).transpose(1, 2)
+        cls = patches.mean(dim=1, keepdim=True)
+        return SimpleNamespace(last_hidden_state=torch.cat([cls, patches], dim=1))
+
+
+def stand_in_image_processor(size=224):
+    return SimpleNamespace(size={'height': size, 'width': size}, image_mean=[0.5] * 3,
+                           image_std=[0.5] * 3, rescale_factor=1 / 255)
+
+
+def create_stand_in_registry():
+    models = ModelRegistry('accurate')
+    models.register('vit_processor', stand_in_image_processor)
+    models.register('vit', StandInViT)
+    return models
+
+
+def load_registry(mode='auto'):
+    """(registry, 'real' | 'stand-in'); 'auto' uses the real ViT only if its weights are cached locally"""
+    if mode == 'stand-in':
+        return create_stand_in_registry(), 'stand-in'
+
+    if mode == 'auto':
+        # Never download weights from a benchmark run
+        os.environ.setdefault('HF_HUB_OFFLINE', '1')
+        os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+    models = create_registry()
+    try:
+        models.get('vit_processor')
+        models.get('vit')
+    except Exception as e:
+        if mode == 'real':
+            raise
+        print(f"Real ViT weights unavailable ({e}); using stand-in models")
+        return create_stand_in_registry(), 'stand-in'
+    return models, 'real'
@@ -0,0 +1,81 @@
+"""Import time of the backend modules, each measured in a fresh interpreter.
+
+For every module this reports wall-clock import time, which heavy
+dependencies ended up loaded, and the slowest imports according to
+`python -X importtime`.
+
+Run from presentation-ai-backend/:
+    python -m benchmarks.startup --repeats 3 --output startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from benchmarks.harness import write_report
+
+MODULES = ('app', 'tasks', 'job_manager', 'model_registry', 'video_processor',
+           'text_processor', 'document_processor')
+HEAVY = ('torch', 'transformers', 'whisper', 'cv2', 'yt_dlp', 'pytube', 'nltk', 'numpy',
+         'tensorflow', 'jax', 'google.generativeai')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module):
+    result = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'failed'}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(module, top=5):
+    # -X importtime writes "import time: self [us] | cumulative | imported package" to stderr
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        # Only top-level packages, so torch is not listed once per submodule
+        if '.' not in name:
+            rows.append((int(cumulative), name))
+    rows.sort(reverse=True)
+    return [{'module': name, 'seconds': round(us / 1e6, 3)} for us, name in rows[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--modules', nargs='*', default=list(MODULES))
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args()
+
+    report = {}
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeats)]
+        errors = [run['error'] for run in runs if 'error' in run]
+        if errors:
+            report[module] = {'error': errors[0]}
+            continue
+        report[module] = {
+            'import_seconds': round(statistics.median(run['seconds'] for run in runs), 3),
+            'heavy_modules': runs[0]['heavy'],
+            'slowest_imports': slowest_imports(module)
+        }
+        print(f"{module:20s} {report[module]['import_seconds']:7.3f}s  heavy: {', '.join(runs[0]['heavy']) or '-'}")
+
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
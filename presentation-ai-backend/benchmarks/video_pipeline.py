@@ -0,0 +1,170 @@
+"""Stage-by-stage benchmark of the VideoProcessor visual pipeline on synthetic videos.
+
+Each scenario writes a deterministic slide-deck video with cv2.VideoWriter
+and times the stages of VideoProcessor.process that work on frames:
+
+    extraction  decode samples at the ViT working size + scene-change filter
+    features    ViT embeddings (real weights if cached locally, else a stand-in)
+    temporal    keyframe selection
+    slides      full-resolution re-fetch of the keyframes + slide creation
+
+Per stage it reports wall time, items/s and the highest sampled RSS; keyframe recall
+against the known cut times is reported too. Results are compared to a
+JSON baseline so regressions show up in later runs.
+
+Run from presentation-ai-backend/:
+    python -m benchmarks.video_pipeline                      # compare with the baseline
+    python -m benchmarks.video_pipeline --update-baseline    # record a new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import transcript_sections, write_slide_video
+from benchmarks.harness import write_report
+from benchmarks.stand_in_models import load_registry
+from memory_usage import RSSSampler
+from video_processor import VideoProcessor
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'video_pipeline.json')
+DEFAULT_SCENARIOS = ('640x360@60', '1280x720@60', '1280x720@300', '1920x1080@120')
+
+
+def parse_scenario(text):
+    # 'WIDTHxHEIGHT@SECONDS'
+    size, seconds = text.split('@')
+    width, height = size.split('x')
+    return int(width), int(height), int(seconds)
+
+
+def run_stage(stats, name, items, func, *args):
+    with RSSSampler() as rss:
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+    count = items(result) if callable(items) else items
+    stats[name] = {
+        'seconds': round(elapsed, 4),
+        'items': count,
+        'items_per_s': round(count / elapsed, 2) if elapsed > 0 else None,
+        # Highest process RSS polled during the stage
+        'peak_rss_mb': round(rss.max_bytes / (1024 * 1024), 1)
+    }
+    return result
+
+
+def keyframe_recall(cuts, timestamps, keyframes, tolerance_ms):
+    # Fraction of slide cuts with a keyframe in the tolerance window after the cut
+    if not cuts:
+        return None
+    times = [timestamps[i] for i in keyframes]
+    found = sum(any(0 <= t - cut <= tolerance_ms for t in times) for cut in cuts)
+    return round(found / len(cuts), 3)
+
+
+def run_scenario(processor, scenario, fps, directory):
+    width, height, seconds = parse_scenario(scenario)
+    path = os.path.join(directory, f"{width}x{height}_{seconds}s.mp4")
+    cuts = write_slide_video(path, width, height, seconds, fps)
+
+    stats = {}
+    timestamps = []
+    samples = run_stage(stats, 'extraction', len, lambda: list(processor._unzip_samples(
+        processor._drop_static_frames(processor._iter_frames(path, 60, processor._working_size())), timestamps)))
+    features = run_stage(stats, 'features', len(samples), processor._extract_features, samples)
+    keyframes = run_stage(stats, 'temporal', len(features), processor._analyze_temporal, features, timestamps)
+
+    sections = [{'heading': f'Section {i + 1}', 'content': text}
+                for i, text in enumerate(transcript_sections(copies=4))]
+
+    def create_slides():
+        frames = processor._fetch_frames(path, timestamps, [0] + keyframes)
+        return processor._create_slides(frames, keyframes, sections, timestamps)
+
+    slides = run_stage(stats, 'slides', len, create_slides)
+
+    return {
+        'video': {'width': width, 'height': height, 'seconds': seconds, 'fps': fps, 'cuts': len(cuts)},
+        'frames_analyzed': len(samples),
+        'keyframes': len(keyframes),
+        'slides': len(slides),
+        'keyframe_recall': keyframe_recall(cuts, timestamps, keyframes, tolerance_ms=seconds * 1000 / 100 * 2),
+        'total_seconds': round(sum(stage['seconds'] for stage in stats.values()), 4),
+        'stages': stats
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Stages slower than the baseline by more than tolerance (a fraction)"""
+    regressions = []
+    for scenario, result in report['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(scenario)
+        if previous is None:
+            continue
+        for stage, stats in result['stages'].items():
+            before = previous['stages'].get(stage, {}).get('seconds')
+            if before and stats['seconds'] > before * (1 + tolerance):
+                regressions.append(f"{scenario} {stage}: {before:.4f}s -> {stats['seconds']:.4f}s "
+                                   f"(+{(stats['seconds'] / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='*', default=list(DEFAULT_SCENARIOS), help='WIDTHxHEIGHT@SECONDS')
+    parser.add_argument('--fps', type=int, default=10, help='frame rate of the generated videos')
+    parser.add_argument('--models', choices=('auto', 'real', 'stand-in'), default='auto')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help='write this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown per stage before flagging')
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    parser.add_argument('--scene-threshold', type=float,
+                        help='scene-change filter threshold (default: SCENE_CHANGE_THRESHOLD, off when unset)')
+    args = parser.parse_args()
+
+    models, model_kind = load_registry(args.models)
+    processor = VideoProcessor(models=models, cache=False, cache_summaries=False, cache_youtube=False, ocr=False,
+                               scene_threshold=args.scene_threshold)
+
+    report = {
+        'environment': {'python': platform.python_version(), 'machine': platform.machine(),
+                        'cpus': os.cpu_count(), 'models': model_kind,
+                        'batch_size': processor.batch_size, 'selector': processor.keyframe_selector.name,
+                        'scene_threshold': processor.scene_threshold},
+        'scenarios': {}
+    }
+    with tempfile.TemporaryDirectory(prefix='video-bench-') as directory:
+        for scenario in args.scenarios:
+            print(f"Running scenario {scenario}")
+            report['scenarios'][scenario] = run_scenario(processor, scenario, args.fps, directory)
+
+    output = write_report(report, args.output)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            f.write(output + '\n')
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['environment'].get('models') != model_kind:
+            print(f"Baseline was recorded with {baseline['environment'].get('models')} models; not comparing")
+            return 0
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No stage slower than the baseline by more than {args.tolerance * 100:.0f}%")
+    else:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
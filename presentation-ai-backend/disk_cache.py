@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's contents, read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_key(*parts):
+    """Stable cache key from strings, numbers and JSON-serializable dicts"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class DiskCache:
+    """Directory of cache entries with size-based LRU eviction.
+
+    Each entry is a sub-directory named after its key; names starting
+    with a dot are left alone for temporary and lock files. Access time is
+    tracked through the entry directory's mtime, so the cache survives
+    restarts and can be shared by several worker processes. With a ttl
+    (seconds), entries older than that are treated as missing.
+
+    The total size is kept as a running count, so a store only walks the
+    directory when it pushes the cache over max_bytes; eviction then
+    frees space down to low_water of the budget, so a full cache is not
+    rescanned on every store. The count is
+    re-read from disk at most every rescan_interval seconds to pick up
+    entries written or removed by other processes.
+    """
+
+    def __init__(self, directory, max_bytes, ttl=None, rescan_interval=60.0, low_water=0.9):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.ttl = ttl
+        self.rescan_interval = rescan_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+        self._total = None
+        self._scanned_at = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key)
+
+    def lookup(self, key, count=True):
+        """Return the entry directory for key, or None on a miss"""
+        path = self.entry_path(key)
+        if os.path.isdir(path) and self._expired(path):
+            self._delete(path)
+            self.expirations += 1
+        if os.path.isdir(path):
+            try:
+                os.utime(path)  # Mark as recently used
+            except OSError:
+                pass
+            if count:
+                self.hits += 1
+            return path
+        if count:
+            self.misses += 1
+        return None
+
+    def _expired(self, path):
+        # Entry files are never rewritten, so the oldest file's mtime is the creation time
+        if self.ttl is None:
+            return False
+        try:
+            created = min((entry.stat().st_mtime for entry in os.scandir(path)), default=None)
+        except OSError:
+            return False
+        return created is not None and time.time() - created > self.ttl
+
+    def store(self, key, writer):
+        """Create the entry for key by calling writer(directory), then evict if over budget"""
+        tmp_path = os.path.join(self.directory, f'.tmp-{uuid.uuid4().hex}')
+        os.makedirs(tmp_path)
+        try:
+            writer(tmp_path)
+            size = _directory_size(tmp_path)
+            path = self.entry_path(key)
+            try:
+                os.replace(tmp_path, path)
+                self._add(size)
+            except OSError:
+                # Another worker stored the same key first; keep its entry
+                if not os.path.isdir(path):
+                    raise
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        if self.size_bytes() > self.max_bytes:
+            self.evict()
+        return path
+
+    def remove(self, key):
+        path = self.entry_path(key)
+        if os.path.isdir(path):
+            self._delete(path)
+
+    def _delete(self, path):
+        size = _directory_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+        self._add(-size)
+
+    def _add(self, delta):
+        with self._lock:
+            if self._total is not None:
+                self._total = max(0, self._total + delta)
+
+    def evict(self):
+        """Delete least recently used entries until the cache is within max_bytes * low_water"""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if name.startswith('.') or not os.path.isdir(path):
+                    continue
+                size = _directory_size(path)
+                entries.append((os.path.getmtime(path), size, path))
+                total += size
+
+            entries.sort()
+            target = self.max_bytes * self.low_water if total > self.max_bytes else self.max_bytes
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                self.evictions += 1
+            self._total = total
+            self._scanned_at = time.monotonic()
+
+    def size_bytes(self):
+        """Total size of the entries, from the running count (re-read from disk when stale)"""
+        with self._lock:
+            if self._total is not None and time.monotonic() - self._scanned_at < self.rescan_interval:
+                return self._total
+            self._total = sum(
+                _directory_size(os.path.join(self.directory, name))
+                for name in os.listdir(self.directory)
+                if not name.startswith('.')
+            )
+            self._scanned_at = time.monotonic()
+            return self._total
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'size_bytes': self.size_bytes(),
+            'max_bytes': self.max_bytes
+        }
+
+
+def _directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
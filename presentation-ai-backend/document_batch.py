@@ -0,0 +1,109 @@
+import os
+import shutil
+import uuid
+import zipfile
+import zlib
+
+from werkzeug.utils import secure_filename
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+
+class BatchError(Exception):
+    """A batch that cannot be accepted at all, as opposed to one document in it failing"""
+
+
+class DocumentBatch:
+    """Files of one batch request saved to disk, from individual uploads or zip archives.
+
+    Every document gets an entry, {'filename', 'path', 'error'}, in upload
+    order; a file that cannot be processed keeps its place with an error
+    and no path. Zip members are written under generated names, so paths
+    inside an archive never leave the directory, and limits on the file
+    count and uncompressed size keep one request from filling the disk.
+    """
+
+    def __init__(self, directory='temp', max_files=None, max_bytes=None):
+        self.directory = directory
+        self.max_files = max_files or int(os.getenv('DOCUMENT_BATCH_MAX_FILES', '500'))
+        self.max_bytes = max_bytes or int(os.getenv('DOCUMENT_BATCH_MAX_MB', '1024')) * 1024 * 1024
+        self.entries = []
+        self._bytes = 0
+
+    def add_upload(self, file):
+        """Add an uploaded file (werkzeug FileStorage); a .zip adds every document inside it"""
+        if file.filename.lower().endswith('.zip'):
+            archive = self._temp_path(file.filename)
+            file.save(archive)
+            try:
+                self._add_zip(archive, file.filename)
+            finally:
+                os.remove(archive)
+            return
+
+        if self._check_document(file.filename):
+            path = self._temp_path(file.filename)
+            file.save(path)
+            self.entries.append({'filename': file.filename, 'path': path, 'error': None})
+            self._reserve(os.path.getsize(path))
+
+    def _add_zip(self, archive, archive_name):
+        try:
+            zf = zipfile.ZipFile(archive)
+        except zipfile.BadZipFile:
+            # A broken archive fails on its own line; the rest of the batch goes ahead
+            self._check_capacity()
+            self.entries.append({'filename': archive_name, 'path': None,
+                                 'error': f"Not a valid zip archive: {archive_name}"})
+            return
+
+        with zf:
+            for info in zf.infolist():
+                name = info.filename
+                # Directories and the resource forks macOS adds to archives are not documents
+                if info.is_dir() or name.startswith('__MACOSX/') or os.path.basename(name).startswith('.'):
+                    continue
+                if not self._check_document(name):
+                    continue
+                # Reads stop at the declared size, so reserving it bounds what is written
+                self._reserve(info.file_size)
+                path = self._temp_path(name)
+                try:
+                    with zf.open(info) as source, open(path, 'wb') as target:
+                        shutil.copyfileobj(source, target)
+                except (zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError) as e:
+                    # Corrupt, encrypted or unsupported member
+                    if os.path.exists(path):
+                        os.remove(path)
+                    self.entries.append({'filename': name, 'path': None, 'error': f"Cannot extract from zip: {e}"})
+                    continue
+                self.entries.append({'filename': name, 'path': path, 'error': None})
+
+    def _check_capacity(self):
+        if len(self.entries) >= self.max_files:
+            raise BatchError(f"Batch has more than {self.max_files} documents")
+
+    def _check_document(self, filename):
+        self._check_capacity()
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in SUPPORTED_EXTENSIONS:
+            self.entries.append({'filename': filename, 'path': None, 'error': f"Unsupported file type: {ext}"})
+            return False
+        return True
+
+    def _reserve(self, size):
+        self._bytes += size
+        if self._bytes > self.max_bytes:
+            raise BatchError(f"Batch is larger than {self.max_bytes // (1024 * 1024)} MB")
+
+    def _temp_path(self, filename):
+        # The extension is kept even when nothing of the name survives secure_filename
+        stem, ext = os.path.splitext(os.path.basename(filename))
+        name = secure_filename(stem) or 'document'
+        return os.path.join(self.directory, f'{uuid.uuid4().hex}_{name}{ext.lower()}')
+
+    def cleanup(self):
+        """Remove every saved file; for a batch that is rejected before its jobs take ownership"""
+        for entry in self.entries:
+            if entry['path'] and os.path.exists(entry['path']):
+                os.remove(entry['path'])
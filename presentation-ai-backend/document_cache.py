@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+
+from disk_cache import DiskCache, make_key
+from section_matcher import IEEE_SECTION_PATTERNS, IEEE_IGNORE_PATTERN
+
+# Bump when the cached layout changes
+DOCUMENT_CACHE_VERSION = 1
+# Bump the version of a stage when its output changes; that stage and the ones after it
+# are recomputed, earlier tiers stay valid
+EXTRACTION_VERSION = 1
+SECTIONS_VERSION = 1
+SLIDES_VERSION = 1
+
+TIERS = ('text', 'sections', 'slides')
+
+
+class DocumentCache:
+    """On-disk cache of document results per uploaded file's SHA-256, in three tiers.
+
+    The extracted text, the sections and the slides are separate entries
+    whose keys include the configuration of every stage up to their own,
+    so a change to key point scoring keeps the text and sections, and a
+    change to section matching keeps the text.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        directory = directory or os.getenv('DOCUMENT_CACHE_DIR', os.path.join('cache', 'documents'))
+        max_bytes = max_bytes or int(os.getenv('DOCUMENT_CACHE_MAX_MB', '256')) * 1024 * 1024
+        self.store = DiskCache(directory, max_bytes)
+        self.hits = {tier: 0 for tier in TIERS}
+        self.misses = {tier: 0 for tier in TIERS}
+        self._lock = threading.Lock()
+
+    def keys(self, file_hash, extension, section_config=None):
+        """{tier: key} for a file's hash and extension; section_config defaults to the IEEE patterns"""
+        text_config = {'extension': extension, 'extraction': EXTRACTION_VERSION}
+        section_config = section_config or {'patterns': IEEE_SECTION_PATTERNS, 'ignore': IEEE_IGNORE_PATTERN}
+        sections_config = dict(text_config, sections=SECTIONS_VERSION, **section_config)
+        slides_config = dict(sections_config, slides=SLIDES_VERSION)
+        return {
+            tier: make_key(DOCUMENT_CACHE_VERSION, tier, file_hash, config)
+            for tier, config in zip(TIERS, (text_config, sections_config, slides_config))
+        }
+
+    def get(self, tier, key, count_miss=True):
+        """Cached value of a tier or None. Pass count_miss=False for a lookup that is
+        repeated later (the web process checking slides before the worker does)"""
+        path = self.store.lookup(key, count=False)
+        value = None
+        if path is not None:
+            try:
+                with open(os.path.join(path, 'value.json'), encoding='utf-8') as f:
+                    value = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Discarding unreadable document cache entry {key}: {e}")
+                self.store.remove(key)
+        with self._lock:
+            if value is not None:
+                self.hits[tier] += 1
+            elif count_miss:
+                self.misses[tier] += 1
+        return value
+
+    def put(self, key, value):
+        def write(directory):
+            with open(os.path.join(directory, 'value.json'), 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+
+        try:
+            self.store.store(key, write)
+        except OSError as e:
+            print(f"Error writing document cache entry: {e}")
+
+    def stats(self):
+        with self._lock:
+            hits = dict(self.hits)
+            misses = dict(self.misses)
+        stats = self.store.stats()
+        # Hit rate is over slide lookups: the share of documents that skipped processing entirely
+        stats.update(hits=hits['slides'], misses=misses['slides'])
+        lookups = hits['slides'] + misses['slides']
+        stats['hit_rate'] = round(hits['slides'] / lookups, 3) if lookups else 0.0
+        for tier in TIERS:
+            stats[f'{tier}_hits'] = hits[tier]
+            stats[f'{tier}_misses'] = misses[tier]
+        return stats
+
+
+document_cache = DocumentCache()
@@ -1,37 +1,39 @@
-import PyPDF2
-from docx import Document
 from typing import List, Dict, Optional
 import os
 from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 import nltk
 import re
-from collections import defaultdict
-
-# Download required NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('averaged_perceptron_tagger')
+from document_cache import document_cache
+from instrumentation import metrics
+from key_point_scorer import KeyPointScorer
+from pdf_extractor import pdf_extractor, process_two_columns, join_pages
+from section_matcher import SectionMatcher, IEEE_SECTION_PATTERNS, IEEE_IGNORE_PATTERN, IEEE_PREFILTER
+
+# NLTK data is read from a local directory and never downloaded at import time;
+# populate it once with `python setup_nltk_data.py`
+NLTK_DATA_DIR = os.getenv('NLTK_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data'))
+NLTK_PACKAGES = ('punkt', 'punkt_tab', 'stopwords')
+if NLTK_DATA_DIR not in nltk.data.path:
+    nltk.data.path.insert(0, NLTK_DATA_DIR)
 
 class IEEEDocumentProcessor:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        self.section_patterns = {
-            'title': r'^\s*#\s+.+$',
-            'abstract': r'^\s*abstract\s*.*$',
-            'index_terms': r'^\s*index\s+terms\s*.*$|^\s*keywords\s*.*$',
-            'introduction': r'^\s*[i1]\.?\s+introduction\s*.*$',
-            'related_work': r'^\s*[ii2]\.?\s+related\s+work\s*.*$',
-            'methodology': r'^\s*[iii3]\.?\s+method(ology)?\s*.*$',
-            'results': r'^\s*[iv4]\.?\s+results\s*.*$',
-            'discussion': r'^\s*[v5]\.?\s+discussion\s*.*$',
-            'conclusion': r'^\s*[vi6]\.?\s+conclusion\s*.*$',
-            'references': r'^\s*references\s*$|^\s*bibliography\s*$'
-        }
-        self.ignore_patterns = r'acknowledgments|appendix|author\s+biographies'
+    def __init__(self, cache=None):
+        try:
+            self.stop_words = set(stopwords.words('english'))
+        except LookupError:
+            raise LookupError(
+                f"NLTK data not found in {NLTK_DATA_DIR}; run `python setup_nltk_data.py` once"
+            ) from None
+        self.section_patterns = IEEE_SECTION_PATTERNS
+        self.ignore_patterns = IEEE_IGNORE_PATTERN
+        self.section_matcher = SectionMatcher(self.section_patterns, self.ignore_patterns, IEEE_PREFILTER)
+        self.key_point_scorer = KeyPointScorer(self.stop_words, word_tokenize)
         self.figure_pattern = r'fig\.?\s*\d+|figure\s*\d+'
         self.table_pattern = r'table\s*\d+'
         self.column_threshold = 300
+        self.stats = {}
+        self.cache = cache or document_cache
 
     def _clean_text(self, text: str) -> str:
         text = re.sub(r'\[\d+(?:-\d+)?(?:,\s*\d+)*\]', '', text)
@@ -43,24 +45,7 @@ class IEEEDocumentProcessor:
         return re.sub(r'\s+', ' ', text).strip()
 
     def _process_two_columns(self, text: str) -> str:
-        lines = text.split('\n')
-        column1 = []
-        column2 = []
-        current_column = 1
-
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-            if (current_column == 1 and len(column1) > 0 and 
-                (len(stripped) < 15 or stripped.isupper())):
-                current_column = 2
-            if current_column == 1:
-                column1.append(stripped)
-            else:
-                column2.append(stripped)
-
-        return '\n'.join(column1 + column2)
+        return process_two_columns(text)
 
     def _extract_paper_title(self, text: str) -> str:
         lines = text.split('\n')[:10]
@@ -73,104 +58,51 @@ class IEEEDocumentProcessor:
                 return line
         return "Research Paper Summary"
 
-    def _identify_sections(self, text: str) -> Dict[str, str]:
-        sections = {}
-        lines = text.split('\n')
-        current_section = None
-        current_content = []
-
-        for line in lines:
-            line = line.strip()
-            print(f"[DEBUG] Processing line: '{line}'")
-            if not line:
-                print("[DEBUG] Skipping empty line")
-                continue
-
-            is_section_header = False
-            for section_type, pattern in self.section_patterns.items():
-                print(f"[DEBUG] Testing pattern '{pattern}' for section '{section_type}'")
-                if re.search(pattern, line, re.IGNORECASE):
-                    print(f"[DEBUG] Match found for section pattern '{section_type}'")
-                    if current_section:
-                        content_text = '\n'.join(current_content)
-                        print(f"[DEBUG] Storing content for section '{current_section}'. Content length: {len(content_text)}")
-                        sections[current_section] = content_text
-
-                    current_section = section_type
-                    current_content = []
-                    is_section_header = True
-                    print(f"[DEBUG] Current section set to: '{current_section}'")
-                    break
-
-            if re.search(self.ignore_patterns, line.lower()):
-                print(f"[DEBUG] Line matches ignore pattern: '{line}'")
-                continue
-
-            if not is_section_header and current_section:
-                if not re.match(r'^\d+\s*$', line):
-                    current_content.append(line)
-                    print(f"[DEBUG] Appending line to current_content for section '{current_section}': '{line[:50]}'...")
-
-        if current_section and current_content:
-            final_content = '\n'.join(current_content)
-            sections[current_section] = final_content
-            print(f"[DEBUG] Storing final content for section '{current_section}'. Content length: {len(final_content)}")
-
-        return sections
+    def _identify_sections(self, text) -> Dict[str, str]:
+        """Sections by heading; text is the whole document or an iterable of lines"""
+        lines = text.split('\n') if isinstance(text, str) else text
+        return self.section_matcher.identify(lines)
 
     def _extract_key_points(self, text: str, max_points: int = 5) -> List[str]:
-        text = self._clean_text(text)
-        sentences = sent_tokenize(text)
-
-        if not sentences:
-            return []
-
-        if len(sentences) >= 3 and text.lower().startswith('abstract'):
-            return [sentences[0], sentences[-1]] + sentences[1:max_points-1]
+        return self._extract_key_points_many([(text, max_points)])[0]
 
-        scores = {}
-        word_freq = defaultdict(int)
+    def _extract_key_points_many(self, requests) -> List[List[str]]:
+        """Key points for several (text, max_points) pairs, scored together in one pass"""
+        results = [[] for _ in requests]
+        batch = []
+        for i, (text, max_points) in enumerate(requests):
+            text = self._clean_text(text)
+            sentences = sent_tokenize(text)
 
-        for sentence in sentences:
-            words = word_tokenize(sentence.lower())
-            for word in words:
-                if word not in self.stop_words and word.isalnum():
-                    word_freq[word] += 1
-
-        for sentence in sentences:
-            words = word_tokenize(sentence.lower())
-            score = sum(word_freq.get(word, 0) for word in words if word not in self.stop_words)
+            if not sentences:
+                continue
 
-            if any(char.isdigit() for char in sentence):
-                score *= 1.5
-            if any(len(word) >= 8 for word in words):
-                score *= 1.3
-            if sentence.startswith(('The ', 'This ', 'These ', 'We ', 'Our ')):
-                score *= 1.2
-            if re.search(r'\([A-Z]{2,}\)', sentence):
-                score *= 1.2
+            if len(sentences) >= 3 and text.lower().startswith('abstract'):
+                results[i] = [sentences[0], sentences[-1]] + sentences[1:max_points-1]
+                continue
 
-            scores[sentence] = score / max(1, len(words))
+            batch.append((i, sentences, max_points))
 
-        return [sent for sent, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:max_points]]
+        ranked = self.key_point_scorer.top_k([(sentences, max_points) for _, sentences, max_points in batch])
+        for (i, _, _), points in zip(batch, ranked):
+            results[i] = points
+        return results
 
     def _extract_from_pdf(self, file_path: str) -> str:
-        text = []
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    processed_text = self._process_two_columns(page_text)
-                    processed_text = re.sub(r'\s+\n\s+', '\n', processed_text)
-                    processed_text = re.sub(r'-\n(\w)', r'\1', processed_text)
-                    text.append(processed_text)
-
-        full_text = '\n'.join(text)
-        full_text = re.sub(r'(\n\s*){3,}', '\n\n', full_text)
-        return re.sub(r'^\s*\d+\s*$', '', full_text, flags=re.MULTILINE)
+        return pdf_extractor.extract_text(file_path, self.stats.setdefault('pdf', {}))
+
+    def _iter_pdf_lines(self, file_path: str, pages: Optional[List[str]] = None):
+        # Lines of each page as soon as it is extracted; section matching gives the same result
+        # as on _extract_from_pdf's text, whose blank-line and page-number cleanup it skips anyway.
+        # Pages are collected into pages when given, so the text can be cached too
+        for page in pdf_extractor.iter_pages(file_path, self.stats.setdefault('pdf', {})):
+            if pages is not None:
+                pages.append(page)
+            yield from page.split('\n')
 
     def _extract_from_docx(self, file_path: str) -> str:
+        from docx import Document
+
         doc = Document(file_path)
         text = []
         for paragraph in doc.paragraphs:
@@ -222,8 +154,21 @@ class IEEEDocumentProcessor:
                     is_title=False
                 ))
 
+        section_order = ['introduction', 'related_work', 'methodology',
+                         'results', 'discussion', 'conclusion']
+
+        # Key points of the abstract and every section, scored together
+        requests = {}
         if 'abstract' in sections:
-            points = self._extract_key_points(sections['abstract'], 4)
+            requests['abstract'] = (sections['abstract'], 4)
+        for section in section_order:
+            if section in sections:
+                requests[section] = (sections[section], 6 if section in ['methodology', 'results'] else 4)
+        with metrics.span('document.key_points'):
+            key_points = dict(zip(requests, self._extract_key_points_many(list(requests.values()))))
+
+        if 'abstract' in sections:
+            points = key_points['abstract']
             if points:
                 slides.append(self._create_slide(
                     heading="Key Contributions",
@@ -239,15 +184,10 @@ class IEEEDocumentProcessor:
                     content="\n".join(f"• {kw}" for kw in keywords)
                 ))
 
-        section_order = ['introduction', 'related_work', 'methodology',
-                         'results', 'discussion', 'conclusion']
-
         for section in section_order:
             if section not in sections:
                 continue
-            content = sections[section]
-            max_points = 6 if section in ['methodology', 'results'] else 4
-            points = self._extract_key_points(content, max_points)
+            points = key_points[section]
             if not points:
                 continue
             heading = section.replace('_', ' ').title()
@@ -272,12 +212,58 @@ class IEEEDocumentProcessor:
 
         return slides
 
-    def process_document(self, file_path: str) -> List[Dict]:
+    def _section_config(self) -> Dict:
+        return {'patterns': self.section_patterns, 'ignore': self.ignore_patterns}
+
+    def _extract_sections(self, file_path: str, keys: Optional[Dict[str, str]]) -> Dict[str, str]:
+        text = self.cache.get('text', keys['text']) if keys else None
+        if text is not None:
+            self.stats['cached'] = 'text'
+            with metrics.span('document.sections'):
+                return self._identify_sections(text)
+
+        if file_path.lower().endswith('.pdf') and os.path.exists(file_path):
+            # Pages stream from the extraction workers into section matching
+            pages = []
+            with metrics.span('document.extract_sections'):
+                sections = self._identify_sections(self._iter_pdf_lines(file_path, pages))
+            text = join_pages(pages)
+        else:
+            with metrics.span('document.extract'):
+                text = self._extract_text(file_path)
+            with metrics.span('document.sections'):
+                sections = self._identify_sections(text)
+        if keys:
+            self.cache.put(keys['text'], text)
+        return sections
+
+    def process_document(self, file_path: str, file_hash: Optional[str] = None) -> List[Dict]:
+        """Slides for a document; with the SHA-256 of its contents, results are cached per stage"""
         try:
-            text = self._extract_text(file_path)
-            sections = self._identify_sections(text)
-            return self._organize_slides(sections)
+            keys = None
+            sections = None
+            if file_hash is not None:
+                keys = self.cache.keys(file_hash, os.path.splitext(file_path)[1].lower(), self._section_config())
+                slides = self.cache.get('slides', keys['slides'])
+                if slides is not None:
+                    self.stats['cached'] = 'slides'
+                    return slides
+                sections = self.cache.get('sections', keys['sections'])
+                if sections is not None:
+                    self.stats['cached'] = 'sections'
+
+            if sections is None:
+                sections = self._extract_sections(file_path, keys)
+                if keys:
+                    self.cache.put(keys['sections'], sections)
+            with metrics.span('document.slides'):
+                slides = self._organize_slides(sections)
+            if keys:
+                self.cache.put(keys['slides'], slides)
+            return slides
         except Exception as e:
+            # Still answered with an error slide; the batch endpoint reports it as a failed document
+            self.stats['error'] = str(e)
             return [self._create_slide(
                 heading="Processing Error",
                 content=str(e),
@@ -0,0 +1,85 @@
+import json
+import os
+
+from disk_cache import DiskCache, make_key
+
+# Bump when the cached layout or the meaning of cached values changes
+FEATURE_CACHE_VERSION = 1
+# Bump when transcript segmentation or summarization changes the sections of a video
+SECTIONS_VERSION = 1
+
+
+class FeatureCache:
+    """On-disk cache of per-video frame embeddings and keyframe selections, and of the
+    summarized transcript sections, so a repeat video skips both branches"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        directory = directory or os.getenv('FEATURE_CACHE_DIR', os.path.join('cache', 'features'))
+        max_bytes = max_bytes or int(os.getenv('FEATURE_CACHE_MAX_MB', '512')) * 1024 * 1024
+        self.store = DiskCache(directory, max_bytes)
+
+    def make_key(self, source_id, params):
+        """Key from the video's content hash (or YouTube id) and everything that affects the features"""
+        return make_key(FEATURE_CACHE_VERSION, source_id, params)
+
+    def get(self, key):
+        """Return (features, important_indices, timestamps) or None; features are memory-mapped"""
+        import numpy as np
+
+        path = self.store.lookup(key)
+        if path is None:
+            return None
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+            features = np.load(os.path.join(path, 'features.npy'), mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"Discarding unreadable feature cache entry {key}: {e}")
+            self.store.remove(key)
+            return None
+        return features, meta['important_indices'], meta['timestamps']
+
+    def put(self, key, features, important_indices, timestamps):
+        import numpy as np
+
+        def write(directory):
+            np.save(os.path.join(directory, 'features.npy'), np.asarray(features, dtype=np.float32))
+            with open(os.path.join(directory, 'meta.json'), 'w') as f:
+                json.dump({
+                    'important_indices': [int(i) for i in important_indices],
+                    'timestamps': [int(t) for t in timestamps]
+                }, f)
+
+        try:
+            self.store.store(key, write)
+        except OSError as e:
+            print(f"Error writing feature cache entry: {e}")
+
+    def get_sections(self, key):
+        """Return the cached sections of a video, or None"""
+        path = self.store.lookup(key)
+        if path is None:
+            return None
+        try:
+            with open(os.path.join(path, 'sections.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Discarding unreadable sections cache entry {key}: {e}")
+            self.store.remove(key)
+            return None
+
+    def put_sections(self, key, sections):
+        def write(directory):
+            with open(os.path.join(directory, 'sections.json'), 'w', encoding='utf-8') as f:
+                json.dump(sections, f)
+
+        try:
+            self.store.store(key, write)
+        except OSError as e:
+            print(f"Error writing sections cache entry: {e}")
+
+    def stats(self):
+        return self.store.stats()
+
+
+feature_cache = FeatureCache()
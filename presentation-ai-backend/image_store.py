@@ -0,0 +1,73 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from disk_cache import DiskCache
+
+IMAGE_FILENAME = 'image.jpg'
+
+
+class ImageStore:
+    """Content-addressed store of resized JPEG slide images, served by id"""
+
+    def __init__(self, directory=None, max_bytes=None, max_width=None, max_height=None, quality=None, workers=None):
+        directory = directory or os.getenv('IMAGE_STORE_DIR', os.path.join('cache', 'images'))
+        max_bytes = max_bytes or int(os.getenv('IMAGE_STORE_MAX_MB', '1024')) * 1024 * 1024
+        self.store = DiskCache(directory, max_bytes)
+        self.max_width = max_width or int(os.getenv('SLIDE_IMAGE_MAX_WIDTH', '1280'))
+        self.max_height = max_height or int(os.getenv('SLIDE_IMAGE_MAX_HEIGHT', '720'))
+        self.quality = quality or int(os.getenv('SLIDE_IMAGE_QUALITY', '85'))
+        # cv2.resize/imencode release the GIL, so threads encode in parallel
+        self._executor = ThreadPoolExecutor(max_workers=workers or int(os.getenv('IMAGE_WORKERS', '4')),
+                                            thread_name_prefix='image-encode')
+
+    def encode(self, frame, full_size=False):
+        """JPEG bytes of an RGB frame, scaled down to fit the configured maximum size and quality.
+        With full_size the frame keeps its resolution and OpenCV's default quality, as inline images always have"""
+        # Imported here so the web process can serve stored images without OpenCV
+        import cv2
+
+        params = []
+        if not full_size:
+            height, width = frame.shape[:2]
+            scale = min(self.max_width / width, self.max_height / height, 1.0)
+            if scale < 1.0:
+                frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+            params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        ok, buffer = cv2.imencode('.jpg', cv2.cvtColor(frame, cv2.COLOR_RGB2BGR), params)
+        if not ok:
+            raise Exception("Failed to encode slide image")
+        return buffer.tobytes()
+
+    def encode_many(self, frames, full_size=False):
+        """Encode frames in parallel, preserving order"""
+        return list(self._executor.map(partial(self.encode, full_size=full_size), frames))
+
+    def save(self, frame):
+        """Encode and store a frame; returns its image id (SHA-256 of the JPEG bytes)"""
+        data = self.encode(frame)
+        image_id = hashlib.sha256(data).hexdigest()
+        if self.store.lookup(image_id, count=False) is None:
+            def write(directory):
+                with open(os.path.join(directory, IMAGE_FILENAME), 'wb') as f:
+                    f.write(data)
+
+            self.store.store(image_id, write)
+        return image_id
+
+    def save_many(self, frames):
+        return list(self._executor.map(self.save, frames))
+
+    def path(self, image_id):
+        """File path of a stored image, or None if unknown"""
+        if not image_id or not all(c in '0123456789abcdef' for c in image_id):
+            return None
+        entry = self.store.lookup(image_id)
+        return os.path.join(entry, IMAGE_FILENAME) if entry else None
+
+    def stats(self):
+        return self.store.stats()
+
+
+image_store = ImageStore()
@@ -0,0 +1,197 @@
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from a single ViT batch up to a long video
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+PREFIX = 'presentation_ai_'
+
+# Stage durations of the request or job running in the current context, when recording
+_timings = contextvars.ContextVar('timings', default=None)
+
+
+def _labels_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class _Span:
+    __slots__ = ('metrics', 'name', 'labels', 'start')
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        self.metrics.observe('stage_duration_seconds', elapsed, stage=self.name, **self.labels)
+        timings = _timings.get()
+        if timings is not None:
+            # Repeated spans (one per batch, per call) add up
+            timings[self.name] = round(timings.get(self.name, 0.0) + elapsed, 4)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Metrics:
+    """Process-local latency histograms, counters and gauges.
+
+    Worker processes drain() their metrics into each job's stats and the
+    web process merge()s them, so /metrics covers every process. With
+    enabled=False (METRICS_ENABLED=0) every call returns immediately.
+    """
+
+    def __init__(self, enabled=None, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled if enabled is not None else os.getenv('METRICS_ENABLED', '1') != '0'
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def span(self, name, **labels):
+        """Context manager timing one stage into stage_duration_seconds{stage=name}"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, labels)
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, _labels_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # Per-bucket counts (non-cumulative), then sum and count
+                histogram = self._histograms[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[i] += 1
+                    break
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def add_gauge(self, name, delta, **labels):
+        if not self.enabled:
+            return
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def drain(self):
+        """Serializable snapshot of histograms and counters, resetting them (gauges stay local)"""
+        with self._lock:
+            snapshot = {
+                'histograms': [[name, list(labels), values] for (name, labels), values in self._histograms.items()],
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()]
+            }
+            self._histograms = {}
+            self._counters = {}
+        return snapshot
+
+    def merge(self, snapshot):
+        """Add a drained snapshot from another process"""
+        if not snapshot or not self.enabled:
+            return
+        with self._lock:
+            for name, labels, values in snapshot.get('histograms', []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                histogram = self._histograms.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+                for i, value in enumerate(values):
+                    histogram[i] += value
+            for name, labels, value in snapshot.get('counters', []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def render(self, gauges=()):
+        """Prometheus text exposition of everything recorded, plus (name, labels, value) gauges read at scrape time"""
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            local_gauges = [(name, dict(labels), value) for (name, labels), value in sorted(self._gauges.items())]
+
+        # Every family's samples are contiguous under a single TYPE line, as the exposition format requires;
+        # gauges arrive in caller order, interleaved across families, so they are grouped by name first
+        families = {}
+
+        def family(name, kind):
+            return families.setdefault(PREFIX + name, (kind, []))[1]
+
+        for (name, labels), values in histograms:
+            metric = PREFIX + name
+            samples = family(name, 'histogram')
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                samples.append(f"{metric}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}")
+            samples.append(f"{metric}_bucket{_format_labels(labels + (('le', '+Inf'),))} {values[-1]}")
+            samples.append(f"{metric}_sum{_format_labels(labels)} {_format_value(values[-2])}")
+            samples.append(f"{metric}_count{_format_labels(labels)} {values[-1]}")
+
+        for (name, labels), value in counters:
+            family(name, 'counter').append(f"{PREFIX + name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name, labels, value in list(local_gauges) + list(gauges):
+            # e.g. the load time of a model that has not been loaded yet
+            if value is None:
+                continue
+            family(name, 'gauge').append(f"{PREFIX + name}{_format_labels(_labels_key(labels))} {_format_value(value)}")
+
+        for metric, (kind, samples) in families.items():
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+@contextmanager
+def record_timings():
+    """Collect the span durations of the current request or job into a dict"""
+    timings = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+metrics = Metrics()
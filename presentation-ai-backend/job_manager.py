@@ -0,0 +1,275 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class Job:
+    def __init__(self, job_type, func, args, owned_path=None):
+        self.id = uuid.uuid4().hex
+        self.type = job_type
+        self.func = func
+        self.args = args
+        # File the job deletes when it runs; removed here instead if it never does
+        self.owned_path = owned_path
+        self.status = QUEUED
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.cancel_requested = False
+        self.done = threading.Event()
+        # Queues of as_completed() callers waiting for this job
+        self._waiters = []
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns False on timeout"""
+        return self.done.wait(timeout)
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'type': self.type,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'wait_time': _elapsed(self.submitted_at, self.started_at),
+            'run_time': _elapsed(self.started_at, self.finished_at),
+            'error': self.error
+        }
+
+
+class JobManager:
+    """Runs jobs on one bounded process pool per job type.
+
+    Jobs wait in an in-process queue until their type has a free worker,
+    so a dispatched job is a running job. Queued jobs can be cancelled
+    outright; a running job cannot be interrupted, so cancelling it only
+    discards its result.
+    """
+
+    def __init__(self, limits, initializers=None, on_complete=None, retention=3600):
+        self.limits = dict(limits)
+        self.initializers = initializers or {}
+        self.on_complete = on_complete
+        self.retention = retention
+        self._pools = {}
+        self._queues = {job_type: deque() for job_type in self.limits}
+        self._running = {job_type: 0 for job_type in self.limits}
+        self._wait_times = {job_type: deque(maxlen=100) for job_type in self.limits}
+        self._jobs = {}
+        # Re-entrant: a future that is already done runs its callback inside submit
+        self._lock = threading.RLock()
+        self._context = multiprocessing.get_context('spawn')
+
+    def start(self):
+        """Create the worker pools (also done lazily on first submit)"""
+        with self._lock:
+            self._start_pools()
+
+    def _start_pools(self):
+        # ProcessPoolExecutor workers are not daemonic, so jobs may start processes of their own
+        for job_type, limit in self.limits.items():
+            if job_type not in self._pools:
+                pool = ProcessPoolExecutor(
+                    max_workers=limit,
+                    mp_context=self._context,
+                    initializer=self.initializers.get(job_type)
+                )
+                # Workers are spawned on demand; a no-op per slot starts (and warms) them all now
+                for _ in range(limit):
+                    pool.submit(os.getpid)
+                self._pools[job_type] = pool
+
+    def submit(self, job_type, func, *args, owned_path=None):
+        """Queue func(*args) as a job of job_type and return the Job.
+
+        owned_path is a file func takes ownership of (and deletes); it is
+        deleted here if the job is cancelled or fails before it starts.
+        """
+        if job_type not in self.limits:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job = Job(job_type, func, args, owned_path)
+        with self._lock:
+            self._start_pools()
+            self._prune()
+            self._jobs[job.id] = job
+            self._queues[job_type].append(job)
+            self._dispatch(job_type)
+        return job
+
+    def complete(self, job_type, result):
+        """Register a job that is already done (e.g. answered from a cache) without running it"""
+        if job_type not in self.limits:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job = Job(job_type, None, ())
+        job.started_at = job.submitted_at
+        job.result = result
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+            self._finish(job, DONE)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def as_completed(self, jobs):
+        """Yield the given jobs as they finish, in completion order"""
+        finished = queue.Queue()
+        with self._lock:
+            for job in jobs:
+                if job.done.is_set():
+                    finished.put(job)
+                else:
+                    job._waiters.append(finished)
+        for _ in range(len(jobs)):
+            yield finished.get()
+
+    def cancel(self, job_id):
+        """Cancel a job; returns False if it already finished or does not exist"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done.is_set():
+                return False
+            job.cancel_requested = True
+            if job.status == QUEUED:
+                self._queues[job.type].remove(job)
+                self._finish(job, CANCELLED)
+                _remove_owned(job)
+            return True
+
+    def stats(self):
+        """Queue depth, running count and recent wait times per job type"""
+        with self._lock:
+            stats = {}
+            for job_type, limit in self.limits.items():
+                waits = list(self._wait_times[job_type])
+                queue = self._queues[job_type]
+                stats[job_type] = {
+                    'limit': limit,
+                    'running': self._running[job_type],
+                    'queued': len(queue),
+                    'oldest_queued_wait': round(time.time() - queue[0].submitted_at, 3) if queue else 0.0,
+                    'avg_wait_time': round(sum(waits) / len(waits), 3) if waits else 0.0,
+                    'max_wait_time': round(max(waits), 3) if waits else 0.0
+                }
+            return stats
+
+    def shutdown(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self, job_type):
+        # Called with the lock held
+        queue = self._queues[job_type]
+        while queue and self._running[job_type] < self.limits[job_type]:
+            job = queue.popleft()
+            job.status = RUNNING
+            job.started_at = time.time()
+            self._wait_times[job_type].append(job.started_at - job.submitted_at)
+            self._running[job_type] += 1
+            pool = self._pools.get(job_type)
+            try:
+                if pool is None:
+                    raise RuntimeError(f"No worker pool for '{job_type}' jobs (shut down)")
+                future = pool.submit(job.func, *job.args)
+            except Exception as e:
+                # The pool broke or was shut down between jobs; fail this one and keep the queue moving
+                print(f"Error submitting '{job_type}' job {job.id}: {e}")
+                self._running[job_type] -= 1
+                job.error = str(e)
+                self._finish(job, FAILED)
+                _remove_owned(job)
+                self._replace_pool(job_type, pool)
+                continue
+            future.add_done_callback(lambda future, job=job, pool=pool: self._on_future_done(job, pool, future))
+
+    def _on_future_done(self, job, pool, future):
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool):
+            # A worker died (e.g. out of memory); replace the pool once so later jobs can run
+            with self._lock:
+                self._replace_pool(job.type, pool)
+        self._on_complete(job, None if error else future.result(), error)
+
+    def _replace_pool(self, job_type, pool):
+        # Called with the lock held; only the first caller for a broken pool replaces it,
+        # and a pool removed by shutdown() is not brought back
+        if pool is not None and self._pools.get(job_type) is pool:
+            print(f"Worker pool for '{job_type}' jobs broke, restarting it")
+            del self._pools[job_type]
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._start_pools()
+
+    def _on_complete(self, job, result, error):
+        # Runs on the pool's management thread
+        with self._lock:
+            self._running[job.type] -= 1
+            if job.cancel_requested:
+                self._finish(job, CANCELLED)
+            elif error is not None:
+                job.error = str(error)
+                self._finish(job, FAILED)
+            else:
+                job.result = result
+                self._finish(job, DONE)
+            self._dispatch(job.type)
+
+        # Called for every job a worker ran, whatever its final status
+        if self.on_complete is not None:
+            try:
+                self.on_complete(job)
+            except Exception as e:
+                print(f"Error in job completion hook: {e}")
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = time.time()
+        job.done.set()
+        for waiter in job._waiters:
+            waiter.put(job)
+        job._waiters = []
+
+    def _prune(self):
+        # Forget finished jobs older than the retention period
+        cutoff = time.time() - self.retention
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+def _remove_owned(job):
+    # For a job that will never run, so its file would otherwise be left behind
+    if job.owned_path and os.path.exists(job.owned_path):
+        try:
+            os.remove(job.owned_path)
+        except OSError as e:
+            print(f"Error removing file of job {job.id}: {e}")
+
+
+def _elapsed(start, end):
+    if start is None:
+        return None
+    return round((end or time.time()) - start, 3)
@@ -0,0 +1,101 @@
+import re
+
+import numpy as np
+from scipy import sparse
+
+LEADING_WORDS = ('The ', 'This ', 'These ', 'We ', 'Our ')
+ACRONYM = re.compile(r'\([A-Z]{2,}\)')
+# Digits, a word of 8+ characters, a leading pronoun/article, a parenthesized acronym.
+# Applied one after another in this order, so the float scores match the per-sentence loop bit for bit.
+MULTIPLIERS = (1.5, 1.3, 1.2, 1.2)
+
+
+class KeyPointScorer:
+    """Frequency-based key sentence ranking for all sections of a document in one pass.
+
+    Each sentence is tokenized once. Term counts of every sentence go into
+    one sparse matrix; a section's word frequencies are the column sums of
+    its rows, and a sentence scores the frequencies of its words, times
+    the heuristic multipliers, divided by its token count.
+    """
+
+    def __init__(self, stop_words, tokenize):
+        self.stop_words = stop_words
+        self.tokenize = tokenize
+
+    def top_k(self, sections):
+        """Best sentences for each (sentences, k) pair, highest score first, ties in text order"""
+        if not sections:
+            return []
+        scores, offsets = self.score([sentences for sentences, _ in sections])
+        return [
+            self._rank(sentences, scores[offsets[i]:offsets[i + 1]], k)
+            for i, (sentences, k) in enumerate(sections)
+        ]
+
+    def score(self, sections):
+        """(scores of every sentence, row offset of each section) for lists of sentences"""
+        vocabulary = {}
+        indices = []
+        indptr = [0]
+        section_of = []
+        lengths = []
+        flags = []
+        for section, sentences in enumerate(sections):
+            for sentence in sentences:
+                words = self.tokenize(sentence.lower())
+                for word in words:
+                    if word not in self.stop_words and word.isalnum():
+                        indices.append(vocabulary.setdefault(word, len(vocabulary)))
+                indptr.append(len(indices))
+                section_of.append(section)
+                lengths.append(len(words))
+                flags.append((
+                    any(char.isdigit() for char in sentence),
+                    any(len(word) >= 8 for word in words),
+                    sentence.startswith(LEADING_WORDS),
+                    ACRONYM.search(sentence) is not None
+                ))
+
+        count = len(section_of)
+        offsets = np.concatenate(([0], np.cumsum([len(sentences) for sentences in sections])))
+        if count == 0:
+            return np.zeros(0), offsets
+
+        counts = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+            shape=(count, len(vocabulary))
+        )
+        counts.sum_duplicates()
+        section_of = np.asarray(section_of)
+
+        # Word frequencies per section, then each sentence's frequency sum within its own section
+        membership = sparse.csr_matrix(
+            (np.ones(count, dtype=np.int64), (section_of, np.arange(count))), shape=(len(sections), count)
+        )
+        frequencies = (membership @ counts).tocsr()
+        raw = np.asarray(counts.multiply(frequencies[section_of]).sum(axis=1)).ravel()
+
+        scores = raw.astype(np.float64)
+        flags = np.asarray(flags, dtype=bool).reshape(count, len(MULTIPLIERS))
+        for column, multiplier in enumerate(MULTIPLIERS):
+            scores = np.where(flags[:, column], scores * multiplier, scores)
+        scores /= np.maximum(1, np.asarray(lengths))
+        return scores, offsets
+
+    def _rank(self, sentences, scores, k):
+        # A repeated sentence counts once, at its first position
+        first = {}
+        for position, sentence in enumerate(sentences):
+            first.setdefault(sentence, position)
+        positions = np.fromiter(first.values(), dtype=np.int64, count=len(first))
+        unique_scores = scores[positions]
+
+        if 0 < k < len(positions):
+            # Value of the k-th best score; everything tied with it stays a candidate so ties resolve by position
+            kth = unique_scores[np.argpartition(-unique_scores, k - 1)[k - 1]]
+            candidates = np.flatnonzero(unique_scores >= kth)
+        else:
+            candidates = np.arange(len(positions))
+        order = candidates[np.lexsort((candidates, -unique_scores[candidates]))]
+        return [sentences[positions[i]] for i in order[:k]]
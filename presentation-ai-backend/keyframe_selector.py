@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+
+
+def target_slide_count(frame_count):
+    """Number of keyframes to select for a video with frame_count analyzed frames"""
+    if frame_count <= 5:
+        return frame_count  # Very short content
+    if frame_count <= 10:
+        return 5  # Short content
+    if frame_count <= 20:
+        return 8  # Medium content
+    return min(12, frame_count // 3)  # Longer content
+
+
+def _top_k(scores, k):
+    # Indices of the k highest scores, highest first; argpartition avoids a full sort
+    if k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+class ChangePointSelector:
+    """Keyframes where the content changes: peaks of the cosine distance between consecutive embeddings.
+
+    A frame's score is its distance to the previous analyzed frame. Local
+    maxima are taken highest first, skipping any within min_gap_ms of a
+    frame already chosen; if that leaves fewer than the target count, the
+    remaining frames fill in by score.
+    """
+
+    name = 'changepoint'
+
+    def __init__(self, min_gap_ms=None):
+        self.min_gap_ms = min_gap_ms if min_gap_ms is not None else int(os.getenv('KEYFRAME_MIN_GAP_MS', '5000'))
+
+    def params(self):
+        return {'min_gap_ms': self.min_gap_ms}
+
+    def scores(self, features):
+        """Cosine distance of every frame to the one before it (0 for the first frame)"""
+        features = np.asarray(features, dtype=np.float32)
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        unit = features / np.maximum(norms, 1e-8)
+        scores = np.zeros(len(features), dtype=np.float32)
+        if len(features) > 1:
+            scores[1:] = 1.0 - np.einsum('ij,ij->i', unit[1:], unit[:-1])
+        return scores
+
+    def select(self, features, timestamps=None):
+        scores = self.scores(features)
+        count = len(scores)
+        if count == 0:
+            return [0]
+        target = target_slide_count(count)
+        # Without timestamps, treat analyzed frames as one second apart
+        times = np.asarray(timestamps, dtype=np.float64) if timestamps is not None else np.arange(count) * 1000.0
+
+        padded = np.concatenate(([-np.inf], scores, [-np.inf]))
+        is_peak = (scores > 0) & (scores >= padded[:-2]) & (scores >= padded[2:])
+        peaks = np.flatnonzero(is_peak)
+
+        # Peaks first (best candidates only), then every other frame as fallback
+        pool = peaks[_top_k(scores[peaks], min(len(peaks), target * 4))] if len(peaks) else peaks
+        rest = np.setdiff1d(np.arange(count), pool, assume_unique=True)
+        candidates = np.concatenate((pool, rest[_top_k(scores[rest], len(rest))]))
+
+        selected = []
+        for index in candidates:
+            if len(selected) == target:
+                break
+            if all(abs(times[index] - times[other]) >= self.min_gap_ms for other in selected):
+                selected.append(int(index))
+        # Too few frames far enough apart: relax the gap rather than return fewer slides
+        for index in candidates:
+            if len(selected) == target:
+                break
+            if int(index) not in selected:
+                selected.append(int(index))
+        return sorted(selected)
+
+
+class LSTMSelector:
+    """Importance scores from a 2-layer LSTM over the embeddings (Xavier-initialized, untrained)"""
+
+    name = 'lstm'
+
+    def __init__(self, input_size=768, hidden_size=256):
+        import torch.nn as nn
+
+        self.lstm = nn.LSTM(
+            input_size=input_size,  # ViT feature size
+            hidden_size=hidden_size,
+            num_layers=2,
+            batch_first=True
+        )
+        for name, param in self.lstm.named_parameters():
+            if 'weight' in name:
+                nn.init.xavier_uniform_(param)
+            elif 'bias' in name:
+                nn.init.zeros_(param)
+
+    def params(self):
+        return {}
+
+    def scores(self, features):
+        """Per-frame importance: sigmoid of the LSTM output averaged over the hidden units"""
+        import torch
+
+        with torch.inference_mode():
+            lstm_out, _ = self.lstm(torch.as_tensor(np.asarray(features, dtype=np.float32)).unsqueeze(0))
+            return torch.sigmoid(lstm_out.squeeze(0)).mean(dim=1).numpy()
+
+    def select(self, features, timestamps=None):
+        scores = self.scores(features)
+        if len(scores) == 0:
+            return [0]
+        return sorted(int(i) for i in _top_k(scores, target_slide_count(len(scores))))
+
+
+SELECTORS = {
+    ChangePointSelector.name: ChangePointSelector,
+    LSTMSelector.name: LSTMSelector
+}
+
+
+def create_selector(name=None, **kwargs):
+    """Keyframe selector by name (KEYFRAME_SELECTOR, default 'changepoint')"""
+    name = name or os.getenv('KEYFRAME_SELECTOR', ChangePointSelector.name)
+    if name not in SELECTORS:
+        raise ValueError(f"Unknown keyframe selector: {name}")
+    return SELECTORS[name](**kwargs)
@@ -0,0 +1,75 @@
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_rss_bytes():
+    """Resident set size of this process right now"""
+    value = _read_proc_status('VmRSS')
+    return value if value is not None else peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process since it started"""
+    value = _read_proc_status('VmHWM')
+    if value is not None:
+        return value
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _read_proc_status(field):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class RSSSampler:
+    """Process RSS at the start and end of a block, and the highest value polled in between.
+
+    Nothing is reset, so concurrent stages, jobs and other readers are
+    unaffected; the readings are of the whole process, so they include
+    whatever else it runs at the same time. A peak shorter than interval
+    can be missed.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.start_bytes = None
+        self.end_bytes = None
+        self.max_bytes = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start_bytes = self.max_bytes = current_rss_bytes()
+        self._thread = threading.Thread(target=self._poll, name='rss-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.end_bytes = current_rss_bytes()
+        self.max_bytes = max(self.max_bytes, self.end_bytes)
+        return False
+
+    def _poll(self):
+        while not self._stop.wait(self.interval):
+            self.max_bytes = max(self.max_bytes, current_rss_bytes())
+
+    def stats(self):
+        return {'rss_start_bytes': self.start_bytes, 'rss_end_bytes': self.end_bytes,
+                'rss_max_sampled_bytes': self.max_bytes}
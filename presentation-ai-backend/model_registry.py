@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from functools import partial
+
+# torch, transformers and whisper are imported by the loaders, so creating the
+# registry (and importing this module) stays cheap until a model is needed
+
+VIT_MODEL_NAME = 'google/vit-base-patch16-224'
+SUMMARIZER_MODEL_NAME = 'facebook/bart-large-cnn'
+WHISPER_MODEL_NAME = 'base'
+
+# 'accurate' runs fp32 eager models; 'fast-cpu' applies dynamic int8 quantization
+# to the Linear layers of ViT and BART and uses every core for intra-op threads
+PROFILES = ('accurate', 'fast-cpu')
+DEFAULT_PROFILE = os.getenv('INFERENCE_PROFILE', 'accurate')
+
+
+class ModelRegistry:
+    """Process-wide store that loads each model once and shares it between requests"""
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown inference profile: {profile}")
+        self.profile = profile
+        self._loaders = {}
+        self._models = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._model_locks = {}
+
+    def register(self, name, loader):
+        """Register a zero-argument loader under a model name"""
+        with self._lock:
+            self._loaders[name] = loader
+            self._model_locks[name] = threading.Lock()
+
+    def get(self, name):
+        """Return the shared instance for name, loading it on first use"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        # Per-model lock so loading ViT does not block a request waiting on Whisper
+        with self._model_locks[name]:
+            model = self._models.get(name)
+            if model is None:
+                print(f"Loading model '{name}'")
+                start = time.perf_counter()
+                model = self._loaders[name]()
+                load_time = time.perf_counter() - start
+                self._stats[name] = {
+                    'load_time': round(load_time, 3),
+                    'size_bytes': _estimate_size(model)
+                }
+                self._models[name] = model
+                print(f"Loaded model '{name}' in {load_time:.2f}s")
+        return model
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def warm_up(self, names=None):
+        """Load the given models (all registered ones by default) ahead of the first request"""
+        for name in names or list(self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Error warming up model '{name}': {e}")
+
+    def stats(self):
+        """Load time and resident size for every registered model"""
+        return {
+            name: {
+                'profile': self.profile,
+                'loaded': name in self._models,
+                'load_time': self._stats.get(name, {}).get('load_time'),
+                'size_bytes': self._stats.get(name, {}).get('size_bytes')
+            }
+            for name in self._loaders
+        }
+
+
+def _estimate_size(model):
+    # Storage of every tensor in the state dict, which includes the int8 weights dynamic quantization
+    # packs into _packed_params (not parameters or buffers); tied weights count once.
+    # Pipelines keep their network in .model
+    import torch
+    import torch.nn as nn
+
+    module = getattr(model, 'model', model)
+    if not isinstance(module, nn.Module):
+        return 0
+    seen = set()
+    size = 0
+    pending = list(module.state_dict().values())
+    while pending:
+        value = pending.pop()
+        if isinstance(value, (tuple, list)):
+            # Packed params are saved as a (weight, bias) tuple
+            pending.extend(value)
+        elif isinstance(value, torch.Tensor) and value.nelement() and value.data_ptr() not in seen:
+            seen.add(value.data_ptr())
+            size += value.nelement() * value.element_size()
+    return size
+
+
+def _quantize(model):
+    # Dynamic int8 quantization: Linear weights stored as int8, activations quantized on the fly
+    import torch
+    import torch.nn as nn
+
+    return torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def _configure_threads(profile):
+    import torch
+
+    if profile == 'fast-cpu' and not os.getenv('TORCH_NUM_THREADS'):
+        torch.set_num_threads(os.cpu_count() or 1)
+
+
+def _load_vit_processor(profile):
+    from transformers import ViTImageProcessor
+
+    return ViTImageProcessor.from_pretrained(VIT_MODEL_NAME)
+
+
+def _load_vit(profile):
+    import torch.nn as nn
+    from transformers import ViTModel
+
+    model = ViTModel.from_pretrained(VIT_MODEL_NAME)
+    model.eval()
+
+    # Initialize the ViT model's pooler weights if they exist
+    if hasattr(model, 'pooler') and hasattr(model.pooler, 'dense'):
+        nn.init.xavier_uniform_(model.pooler.dense.weight)
+        nn.init.zeros_(model.pooler.dense.bias)
+
+    if profile == 'fast-cpu':
+        _configure_threads(profile)
+        model = _quantize(model)
+    return model
+
+
+def _load_summarizer(profile):
+    from transformers import pipeline
+
+    summarizer = pipeline("summarization", model=SUMMARIZER_MODEL_NAME)
+    if profile == 'fast-cpu':
+        _configure_threads(profile)
+        summarizer.model = _quantize(summarizer.model)
+    return summarizer
+
+
+def _load_whisper(profile):
+    # Whisper uses its own Linear subclass, which dynamic quantization leaves alone
+    import whisper
+
+    return whisper.load_model(WHISPER_MODEL_NAME)
+
+
+def create_registry(profile=DEFAULT_PROFILE):
+    """Registry with the standard models loaded for the given inference profile"""
+    models = ModelRegistry(profile)
+    models.register('vit_processor', partial(_load_vit_processor, profile))
+    models.register('vit', partial(_load_vit, profile))
+    models.register('summarizer', partial(_load_summarizer, profile))
+    models.register('whisper', partial(_load_whisper, profile))
+    return models
+
+
+registry = create_registry()
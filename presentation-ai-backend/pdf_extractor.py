@@ -0,0 +1,151 @@
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from instrumentation import metrics
+
+
+def process_two_columns(text):
+    lines = text.split('\n')
+    column1 = []
+    column2 = []
+    current_column = 1
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if (current_column == 1 and len(column1) > 0 and
+            (len(stripped) < 15 or stripped.isupper())):
+            current_column = 2
+        if current_column == 1:
+            column1.append(stripped)
+        else:
+            column2.append(stripped)
+
+    return '\n'.join(column1 + column2)
+
+
+def clean_page(page_text):
+    processed_text = process_two_columns(page_text)
+    processed_text = re.sub(r'\s+\n\s+', '\n', processed_text)
+    return re.sub(r'-\n(\w)', r'\1', processed_text)
+
+
+def join_pages(pages):
+    """Document text from cleaned pages, as IEEEDocumentProcessor has always returned it"""
+    full_text = '\n'.join(pages)
+    full_text = re.sub(r'(\n\s*){3,}', '\n\n', full_text)
+    return re.sub(r'^\s*\d+\s*$', '', full_text, flags=re.MULTILINE)
+
+
+def _iter_range(file_path, start=0, stop=None):
+    # (cleaned text or None for a page without text, seconds) for pages [start, stop)
+    import PyPDF2
+
+    with open(file_path, 'rb') as file:
+        pages = PyPDF2.PdfReader(file).pages
+        for index in range(start, len(pages) if stop is None else stop):
+            page_start = time.perf_counter()
+            page_text = pages[index].extract_text()
+            yield (clean_page(page_text) if page_text else None), time.perf_counter() - page_start
+
+
+def _extract_range(file_path, start, stop):
+    # Runs in a worker, which opens the file itself
+    return list(_iter_range(file_path, start, stop))
+
+
+class PDFExtractor:
+    """Page-level PDF text extraction in a pool of worker processes.
+
+    Each worker opens the file itself and extracts a range of pages;
+    iter_pages() yields the cleaned pages in document order as soon as
+    each range is done, so section matching can start before the last
+    page is read. Short documents are extracted in-process.
+    """
+
+    def __init__(self, workers=None, pages_per_task=None, min_pages=None):
+        self.workers = workers or int(os.getenv('PDF_WORKERS', str(min(4, os.cpu_count() or 1))))
+        # Smallest page range a worker is given
+        self.pages_per_task = pages_per_task or int(os.getenv('PDF_PAGES_PER_TASK', '8'))
+        # Below this many pages, starting the pool costs more than it saves
+        self.min_pages = min_pages if min_pages is not None else int(os.getenv('PDF_PARALLEL_MIN_PAGES', '16'))
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        # Started on first use and kept for later documents in this process
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def page_count(self, file_path):
+        import PyPDF2
+
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+
+    def iter_pages(self, file_path, stats=None):
+        """Cleaned text of every page with text, in order; fills stats (pages, pages/s, per-page timings) when done"""
+        start = time.perf_counter()
+        count = self.page_count(file_path) if self.workers > 1 else 0
+        parallel = self.workers > 1 and count >= max(self.min_pages, 2)
+
+        if parallel:
+            # Every reader resolves the whole page tree when opened, so each worker gets a
+            # couple of large ranges rather than many small ones
+            size = max(self.pages_per_task, -(-count // (2 * self.workers)))
+            pool = self._get_pool()
+            futures = [pool.submit(_extract_range, file_path, first, min(first + size, count))
+                       for first in range(0, count, size)]
+            results = (future.result() for future in futures)
+        else:
+            futures = []
+            results = [_iter_range(file_path)]
+
+        page_seconds = []
+        try:
+            for pages in results:
+                for text, seconds in pages:
+                    page_seconds.append(seconds)
+                    metrics.observe('pdf_page_seconds', seconds)
+                    if text is not None:
+                        yield text
+        finally:
+            # A consumer that stops early (or fails) shouldn't leave ranges queued
+            for future in futures:
+                future.cancel()
+
+        elapsed = time.perf_counter() - start
+        count = len(page_seconds)
+        summary = {
+            'pages': count,
+            'workers': self.workers if parallel else 1,
+            'seconds': round(elapsed, 3),
+            'pages_per_s': round(count / elapsed, 1) if elapsed > 0 else None,
+            'mean_page_seconds': round(sum(page_seconds) / len(page_seconds), 4) if page_seconds else None,
+            'max_page_seconds': round(max(page_seconds), 4) if page_seconds else None
+        }
+        metrics.inc('pdf_pages_total', count)
+        print(f"Extracted {count} PDF pages in {summary['seconds']}s ({summary['pages_per_s']} pages/s, "
+              f"{summary['mean_page_seconds']}s mean per page, {summary['workers']} workers)")
+        if stats is not None:
+            stats.update(summary)
+
+    def extract_text(self, file_path, stats=None):
+        return join_pages(self.iter_pages(file_path, stats))
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+pdf_extractor = PDFExtractor()
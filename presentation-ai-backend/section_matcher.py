@@ -0,0 +1,107 @@
+import logging
+import os
+import re
+
+# Per-line diagnostics are off unless DOCUMENT_LOG_LEVEL=DEBUG
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv('DOCUMENT_LOG_LEVEL', 'WARNING').upper())
+if os.getenv('DOCUMENT_LOG_LEVEL') and not logger.handlers:
+    logger.addHandler(logging.StreamHandler())
+
+# Section headings of an IEEE-style paper, tried in this order; the first match wins
+IEEE_SECTION_PATTERNS = {
+    'title': r'^\s*#\s+.+$',
+    'abstract': r'^\s*abstract\s*.*$',
+    'index_terms': r'^\s*index\s+terms\s*.*$|^\s*keywords\s*.*$',
+    'introduction': r'^\s*[i1]\.?\s+introduction\s*.*$',
+    'related_work': r'^\s*[ii2]\.?\s+related\s+work\s*.*$',
+    'methodology': r'^\s*[iii3]\.?\s+method(ology)?\s*.*$',
+    'results': r'^\s*[iv4]\.?\s+results\s*.*$',
+    'discussion': r'^\s*[v5]\.?\s+discussion\s*.*$',
+    'conclusion': r'^\s*[vi6]\.?\s+conclusion\s*.*$',
+    'references': r'^\s*references\s*$|^\s*bibliography\s*$'
+}
+IEEE_IGNORE_PATTERN = r'acknowledgments|appendix|author\s+biographies'
+
+# Leading character of a stripped line -> shortest line any of the patterns above can match.
+# Each pattern element matches exactly one character, so these are exact lower bounds.
+# The non-ASCII keys are the characters IGNORECASE also matches for 'i' and 'k'.
+_IEEE_MIN_LENGTHS = {
+    '#': 3, 'a': 8, 'i': 8, 'k': 8, 'r': 10, 'b': 12, 'v': 9,
+    '1': 14, '2': 14, '3': 8, '4': 9, '5': 12, '6': 12
+}
+IEEE_PREFILTER = {
+    **_IEEE_MIN_LENGTHS,
+    **{char.upper(): length for char, length in _IEEE_MIN_LENGTHS.items()},
+    '\u0130': 8, '\u0131': 8, '\u212a': 8  # İ, ı and the Kelvin sign
+}
+
+_PAGE_NUMBER = re.compile(r'^\d+\s*$')
+
+
+class SectionMatcher:
+    """Splits document lines into sections with one compiled alternation of the heading patterns.
+
+    A line is a heading for the first pattern (in dict order) it matches;
+    lines whose leading character and length rule out every heading skip
+    the regex entirely. Pass a prefilter only if it is exact for the
+    patterns; None checks every line.
+    """
+
+    def __init__(self, patterns=None, ignore_pattern=None, prefilter=None):
+        if patterns is None:
+            patterns = IEEE_SECTION_PATTERNS
+            prefilter = IEEE_PREFILTER if prefilter is None else prefilter
+        self.patterns = dict(patterns)
+        self.prefilter = prefilter
+        # Each pattern becomes a named group; alternation order keeps dict order, so the first match wins
+        self.heading = re.compile(
+            '|'.join(f'(?P<{name}>{pattern})' for name, pattern in self.patterns.items()),
+            re.IGNORECASE
+        )
+        self.ignore = re.compile(ignore_pattern if ignore_pattern is not None else IEEE_IGNORE_PATTERN)
+
+    def match_heading(self, line):
+        """Section name for a stripped, non-empty line, or None"""
+        if self.prefilter is not None:
+            min_length = self.prefilter.get(line[0])
+            if min_length is None or len(line) < min_length:
+                return None
+        match = self.heading.match(line)
+        return match.lastgroup if match else None
+
+    def identify(self, lines):
+        """{section: content} from an iterable of lines (trailing newlines allowed)"""
+        debug = logger.isEnabledFor(logging.DEBUG)
+        sections = {}
+        current_section = None
+        current_content = []
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            section_type = self.match_heading(line)
+            if section_type is not None:
+                if debug:
+                    logger.debug("Section '%s' starts at line '%s'", section_type, line[:50])
+                if current_section:
+                    sections[current_section] = '\n'.join(current_content)
+                current_section = section_type
+                current_content = []
+                continue
+
+            if self.ignore.search(line.lower()):
+                if debug:
+                    logger.debug("Ignoring line '%s'", line[:50])
+                continue
+
+            if current_section and not _PAGE_NUMBER.match(line):
+                current_content.append(line)
+
+        if current_section and current_content:
+            sections[current_section] = '\n'.join(current_content)
+        if debug:
+            logger.debug("Sections: %s", {name: len(content) for name, content in sections.items()})
+        return sections
@@ -0,0 +1,28 @@
+"""One-time download of the NLTK data used by the document processor.
+
+Run after installing the requirements (or while building an image):
+    python setup_nltk_data.py
+The data goes to NLTK_DATA_DIR (default: nltk_data/ next to this file).
+"""
+import sys
+
+import nltk
+
+from document_processor import NLTK_DATA_DIR, NLTK_PACKAGES
+
+
+def main():
+    failed = []
+    for package in NLTK_PACKAGES:
+        if not nltk.download(package, download_dir=NLTK_DATA_DIR, quiet=True):
+            failed.append(package)
+    print(f"NLTK data in {NLTK_DATA_DIR}: {', '.join(p for p in NLTK_PACKAGES if p not in failed)}")
+    # punkt_tab only exists for NLTK >= 3.8.2, older versions read punkt
+    if [p for p in failed if p != 'punkt_tab']:
+        print(f"Failed to download: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import difflib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def normalize_text(text):
+    return ' '.join(text.split())
+
+
+def _init_worker(tesseract_cmd):
+    import pytesseract
+
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def _ocr_frame(frame, language):
+    # Returns (text, seconds) for one RGB frame; grayscale input is faster for Tesseract and as accurate
+    import cv2
+    import pytesseract
+
+    start = time.perf_counter()
+    gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+    text = pytesseract.image_to_string(gray, lang=language)
+    return normalize_text(text), time.perf_counter() - start
+
+
+class SlideOCR:
+    """Tesseract OCR of keyframes in a pool of worker processes.
+
+    submit() returns immediately so OCR overlaps the rest of the request;
+    collect() waits for the results and blanks text that is nearly the same
+    as the previous keyframe's (e.g. a slide captured twice).
+    """
+
+    def __init__(self, workers=None, tesseract_cmd=None, language=None, similarity=None):
+        self.workers = workers or int(os.getenv('OCR_WORKERS', '2'))
+        # Tesseract binary; pytesseract looks for 'tesseract' on PATH when unset
+        self.tesseract_cmd = tesseract_cmd or os.getenv('TESSERACT_CMD') or None
+        self.language = language or os.getenv('OCR_LANGUAGE', 'eng')
+        self.similarity = similarity if similarity is not None else float(os.getenv('OCR_DEDUPE_SIMILARITY', '0.85'))
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        # Started on first use and kept for later requests in this process
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_init_worker, initargs=(self.tesseract_cmd,))
+            return self._pool
+
+    def submit(self, frames):
+        """Start OCR of RGB frames; returns a handle for collect()"""
+        pool = self._get_pool()
+        return time.perf_counter(), [pool.submit(_ocr_frame, frame, self.language) for frame in frames]
+
+    def collect(self, handle):
+        """[{'text', 'duplicate', 'latency'}] per submitted frame, in order, plus summary stats"""
+        start, futures = handle
+        results = []
+        previous = ''
+        for future in futures:
+            try:
+                text, latency = future.result()
+            except Exception as e:
+                print(f"OCR failed for keyframe: {e}")
+                text, latency = '', None
+            duplicate = bool(text) and bool(previous) and self._similar(text, previous)
+            results.append({'text': text, 'duplicate': duplicate, 'latency': latency})
+            previous = text
+
+        latencies = [r['latency'] for r in results if r['latency'] is not None]
+        stats = {
+            'frames': len(results),
+            'duplicates': sum(r['duplicate'] for r in results),
+            'mean_frame_latency': round(sum(latencies) / len(latencies), 3) if latencies else None,
+            'max_frame_latency': round(max(latencies), 3) if latencies else None,
+            'elapsed': round(time.perf_counter() - start, 3)
+        }
+        print(f"OCR of {stats['frames']} keyframes: {stats['mean_frame_latency']}s per frame, "
+              f"{stats['duplicates']} duplicates, {stats['elapsed']}s wall")
+        return results, stats
+
+    def _similar(self, a, b):
+        matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+        # Cheap upper bounds first; full ratio only when they pass
+        return (matcher.real_quick_ratio() >= self.similarity and matcher.quick_ratio() >= self.similarity
+                and matcher.ratio() >= self.similarity)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+slide_ocr = SlideOCR()
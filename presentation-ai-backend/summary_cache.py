@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import OrderedDict
+
+from disk_cache import DiskCache, make_key
+
+
+def normalize_text(text):
+    # Only whitespace is collapsed; _summarize_texts already builds chunks this way,
+    # so a cached summary is always for exactly the text the model would see
+    return ' '.join(text.split())
+
+
+class SummaryCache:
+    """Two-tier cache of summarizer output: an in-memory LRU and an optional on-disk tier"""
+
+    def __init__(self, max_bytes=None, directory=None, disk_max_bytes=None):
+        self.max_bytes = max_bytes or int(os.getenv('SUMMARY_CACHE_MAX_MB', '16')) * 1024 * 1024
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # The disk tier is off unless a directory is configured
+        directory = directory if directory is not None else os.getenv('SUMMARY_CACHE_DIR', '')
+        disk_max_bytes = disk_max_bytes or int(os.getenv('SUMMARY_CACHE_DISK_MAX_MB', '256')) * 1024 * 1024
+        self.disk = DiskCache(directory, disk_max_bytes) if directory else None
+
+    def make_key(self, model_name, text, params):
+        """Key from the model, the normalized chunk and the generation parameters"""
+        return make_key(model_name, normalize_text(text), params)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key]
+
+        if self.disk is not None:
+            path = self.disk.lookup(key)
+            if path is not None:
+                try:
+                    with open(os.path.join(path, 'summary.txt'), encoding='utf-8', newline='') as f:
+                        summary = f.read()
+                except OSError:
+                    summary = None
+                if summary is not None:
+                    self._remember(key, summary)
+                    with self._lock:
+                        self.disk_hits += 1
+                    return summary
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, summary):
+        self._remember(key, summary)
+        if self.disk is not None:
+            def write(directory):
+                with open(os.path.join(directory, 'summary.txt'), 'w', encoding='utf-8', newline='') as f:
+                    f.write(summary)
+
+            try:
+                self.disk.store(key, write)
+            except OSError as e:
+                print(f"Error writing summary cache entry: {e}")
+
+    def _remember(self, key, summary):
+        size = len(summary.encode('utf-8'))
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key).encode('utf-8'))
+            self._entries[key] = summary
+            self._size += size
+            # Evict least recently used summaries until under the memory budget
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.encode('utf-8'))
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            stats = {
+                'hits': hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes
+            }
+        if self.disk is not None:
+            stats['disk'] = self.disk.stats()
+        return stats
+
+
+summary_cache = SummaryCache()
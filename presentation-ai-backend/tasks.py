@@ -0,0 +1,75 @@
+import os
+
+from instrumentation import metrics, record_timings
+
+# Job functions executed in the worker processes started by JobManager.
+# Processors are imported inside each task so a worker only loads the
+# stack its job type needs. Every task returns {'slides': [...], 'stats': {...}};
+# stats carry the job's stage durations ('spans') and the worker's metrics
+# since its previous job ('metrics'), which the web process merges.
+
+
+def _job_stats(spans, **stats):
+    return dict(stats, worker_pid=os.getpid(), spans=spans, metrics=metrics.drain())
+
+
+def init_video_worker():
+    """Load shared models when a video worker starts so its first job doesn't pay for it.
+
+    WARMUP_MODELS is a comma-separated list of model names, 'all' or 'none'.
+    """
+    from model_registry import registry
+
+    setting = os.getenv('WARMUP_MODELS', 'all').strip().lower()
+    if setting == 'none':
+        return
+    names = None if setting == 'all' else [n.strip() for n in setting.split(',') if n.strip()]
+    registry.warm_up(names)
+
+
+def process_video(video_input, content_hash=None, cleanup_path=None, image_mode=None):
+    from feature_cache import feature_cache
+    from model_registry import registry
+    from summary_cache import summary_cache
+    from youtube_cache import youtube_cache
+    from video_processor import VideoProcessor
+
+    try:
+        with record_timings() as spans:
+            processor = VideoProcessor(image_mode=image_mode)
+            slides = processor.process(video_input, content_hash=content_hash)
+        stats = _job_stats(spans, **processor.stats, models=registry.stats(),
+                           caches={'features': feature_cache.stats(), 'summaries': summary_cache.stats(),
+                                   'youtube': youtube_cache.stats()})
+        return {'slides': slides, 'stats': stats}
+    finally:
+        # Uploaded videos are owned by the job once submitted
+        if cleanup_path and os.path.exists(cleanup_path):
+            os.remove(cleanup_path)
+
+
+def process_text(kind, value):
+    from text_processor import TextProcessor
+
+    with record_timings() as spans:
+        processor = TextProcessor()
+        if kind == 'topic':
+            slides = processor.process_topic(value)
+        else:
+            slides = processor.process_text(value)
+    return {'slides': slides, 'stats': _job_stats(spans)}
+
+
+def process_document(file_path, file_hash=None):
+    from document_cache import document_cache
+    from document_processor import IEEEDocumentProcessor
+
+    try:
+        with record_timings() as spans:
+            processor = IEEEDocumentProcessor()
+            slides = processor.process_document(file_path, file_hash)
+        stats = _job_stats(spans, **processor.stats, caches={'documents': document_cache.stats()})
+        return {'slides': slides, 'stats': stats}
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import audio_transcriber
+from audio_transcriber import SAMPLE_RATE, AudioTranscriber, find_speech_windows
+
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def fake_transcribe_window(audio, language=None):
+    # One segment covering the window, like Whisper on a short clip
+    return [{'start': 0.0, 'end': len(audio) / SAMPLE_RATE, 'text': f' {len(audio)} samples'}]
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=2)
+    submitted = []
+
+    def submit(func, *args):
+        submitted.append(args)
+        return ThreadPoolExecutor.submit(pool, func, *args)
+
+    pool.submit = submit
+    monkeypatch.setattr(audio_transcriber, '_get_pool', lambda workers: pool)
+    monkeypatch.setattr(audio_transcriber, '_transcribe_window', fake_transcribe_window)
+    yield submitted
+    pool.shutdown()
+
+
+def test_single_window_clip_uses_pool_without_local_model(monkeypatch, thread_pool):
+    audio = tone(10)
+    monkeypatch.setattr(audio_transcriber, 'load_audio', lambda path: audio)
+    windows = find_speech_windows(audio)
+    assert len(windows) == 1
+
+    transcriber = AudioTranscriber(model=None, workers=2)
+    segments = list(transcriber.transcribe('clip.mp4'))
+
+    assert len(thread_pool) == 1
+    assert [segment['text'] for segment in segments] == [f' {windows[0][1] - windows[0][0]} samples']
+    assert transcriber.stats['windows'] == 1
+
+
+def test_segment_times_are_offset_by_window_start(monkeypatch, thread_pool):
+    audio = np.concatenate([tone(20), np.zeros(3 * SAMPLE_RATE, np.float32), tone(20)])
+    monkeypatch.setattr(audio_transcriber, 'load_audio', lambda path: audio)
+    windows = find_speech_windows(audio)
+    assert len(windows) == 2
+
+    segments = list(AudioTranscriber(workers=2).transcribe('clip.mp4'))
+
+    assert [segment['start'] for segment in segments] == [round(start / SAMPLE_RATE, 3) for start, _ in windows]
+
+
+def test_in_process_uses_given_model(monkeypatch):
+    class Model:
+        def transcribe(self, audio, fp16=False, language=None):
+            return {'segments': fake_transcribe_window(audio)}
+
+    monkeypatch.setattr(audio_transcriber, 'load_audio', lambda path: tone(5))
+    segments = list(AudioTranscriber(model=Model(), workers=1).transcribe('clip.mp4'))
+    assert len(segments) == 1
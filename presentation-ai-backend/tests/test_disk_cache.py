@@ -0,0 +1,140 @@
+import os
+import time
+
+import pytest
+
+import disk_cache
+from disk_cache import DiskCache, make_key
+
+
+def writer(size):
+    def write(directory):
+        with open(os.path.join(directory, 'value.bin'), 'wb') as f:
+            f.write(b'x' * size)
+    return write
+
+
+def age(cache, key, seconds):
+    # Last use `seconds` ago, without waiting on mtime granularity
+    when = time.time() - seconds
+    os.utime(cache.entry_path(key), (when, when))
+
+
+def entries(cache):
+    return sorted(name for name in os.listdir(cache.directory) if not name.startswith('.'))
+
+
+def test_store_and_lookup_counts_hits_and_misses(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000)
+    assert cache.lookup('a') is None
+    path = cache.store('a', writer(10))
+
+    assert cache.lookup('a') == path
+    assert cache.lookup('b', count=False) is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size_bytes']) == (1, 1, 10)
+
+
+def test_evicts_least_recently_used_first(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=300, low_water=1.0)
+    for key, seconds in (('a', 30), ('b', 20), ('c', 10)):
+        cache.store(key, writer(100))
+        age(cache, key, seconds)
+    # Using 'a' makes 'b' the least recently used
+    cache.lookup('a')
+
+    cache.store('d', writer(100))
+
+    assert entries(cache) == ['a', 'c', 'd']
+    assert cache.evictions == 1
+    assert cache.size_bytes() == 300
+
+
+def test_eviction_frees_down_to_low_water(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=400, low_water=0.5)
+    for index, key in enumerate('abcd'):
+        cache.store(key, writer(100))
+        age(cache, key, 40 - index)
+
+    cache.store('e', writer(100))
+
+    assert entries(cache) == ['d', 'e']
+    assert cache.size_bytes() == 200
+
+
+def test_entry_larger_than_cap_is_evicted(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=100)
+    cache.store('big', writer(500))
+    assert cache.lookup('big') is None
+    assert cache.size_bytes() == 0
+
+
+def test_running_total_tracks_stores_and_removes_without_rescanning(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), max_bytes=10_000)
+    cache.store('a', writer(100))
+    cache.store('b', writer(50))
+    assert cache.size_bytes() == 150
+
+    scans = []
+    original = disk_cache._directory_size
+    monkeypatch.setattr(disk_cache, '_directory_size', lambda path: scans.append(path) or original(path))
+    for index in range(20):
+        cache.store(f'k{index}', writer(10))
+    cache.remove('a')
+
+    # One size per new entry and one for the removed entry; no full rescans
+    assert len(scans) == 21
+    assert cache.size_bytes() == 50 + 20 * 10
+
+
+def test_size_is_reread_when_stale(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10_000, rescan_interval=0.0)
+    cache.store('a', writer(100))
+    # Written by another process behind this one's back
+    other = DiskCache(str(tmp_path), max_bytes=10_000)
+    other.store('b', writer(40))
+
+    assert cache.size_bytes() == 140
+
+
+def test_ttl_expires_entries(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000, ttl=60)
+    cache.store('old', writer(10))
+    cache.store('new', writer(10))
+    old_file = os.path.join(cache.entry_path('old'), 'value.bin')
+    when = time.time() - 120
+    os.utime(old_file, (when, when))
+
+    assert cache.lookup('old') is None
+    assert cache.lookup('new') is not None
+    assert cache.expirations == 1
+    assert entries(cache) == ['new']
+    assert cache.size_bytes() == 10
+
+
+def test_failed_writer_leaves_nothing(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000)
+
+    def failing(directory):
+        writer(10)(directory)
+        raise RuntimeError('disk full')
+
+    with pytest.raises(RuntimeError):
+        cache.store('a', failing)
+    assert os.listdir(tmp_path) == []
+    assert cache.size_bytes() == 0
+
+
+def test_second_store_of_a_key_keeps_first_entry(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000)
+    first = cache.store('a', writer(10))
+    second = cache.store('a', writer(20))
+
+    assert first == second
+    assert os.path.getsize(os.path.join(first, 'value.bin')) == 10
+    assert cache.size_bytes() == 10
+
+
+def test_make_key_is_stable_and_order_insensitive_for_dicts():
+    assert make_key('v1', {'a': 1, 'b': 2}) == make_key('v1', {'b': 2, 'a': 1})
+    assert make_key('v1', {'a': 1}) != make_key('v2', {'a': 1})
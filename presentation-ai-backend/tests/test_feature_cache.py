@@ -0,0 +1,41 @@
+import numpy as np
+
+from feature_cache import FeatureCache
+
+
+def test_features_round_trip(tmp_path):
+    cache = FeatureCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+    key = cache.make_key('sha256:abc', {'sample_rate': 60})
+    features = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+    assert cache.get(key) is None
+    cache.put(key, features, [0, 2], [0, 1000, 2000])
+
+    cached, important, timestamps = cache.get(key)
+    assert np.array_equal(cached, features)
+    assert important == [0, 2] and timestamps == [0, 1000, 2000]
+
+
+def test_sections_are_keyed_by_content_hash(tmp_path):
+    cache = FeatureCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+    params = {'sections': 1, 'summarizer_model': 'bart'}
+    sections = [{'heading': 'Introduction', 'content': 'Summary', 'start': 0.0, 'end': 12.5}]
+
+    cache.put_sections(cache.make_key('sha256:abc', params), sections)
+
+    assert cache.get_sections(cache.make_key('sha256:abc', params)) == sections
+    assert cache.get_sections(cache.make_key('sha256:def', params)) is None
+    assert cache.get_sections(cache.make_key('sha256:abc', dict(params, sections=2))) is None
+
+
+def test_unreadable_sections_entry_is_discarded(tmp_path):
+    cache = FeatureCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+    key = cache.make_key('sha256:abc', {})
+
+    def write(directory):
+        with open(f'{directory}/sections.json', 'w') as f:
+            f.write('{not json')
+
+    cache.store.store(key, write)
+    assert cache.get_sections(key) is None
+    assert cache.store.lookup(key) is None
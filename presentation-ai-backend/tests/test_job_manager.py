@@ -0,0 +1,57 @@
+import operator
+import time
+
+import pytest
+
+from job_manager import CANCELLED, DONE, FAILED, JobManager
+
+
+@pytest.fixture
+def manager():
+    jobs = JobManager({'work': 1})
+    yield jobs
+    jobs.shutdown()
+
+
+def test_cancel_queued_job_removes_owned_file(manager, tmp_path):
+    blocker = manager.submit('work', time.sleep, 1.0)
+    path = tmp_path / 'upload.mp4'
+    path.write_bytes(b'video')
+
+    queued = manager.submit('work', operator.add, 1, 2, owned_path=str(path))
+    assert manager.cancel(queued.id)
+
+    assert queued.status == CANCELLED
+    assert not path.exists()
+    assert blocker.wait(30) and blocker.status == DONE
+
+
+def test_owned_file_is_left_to_a_job_that_runs(manager, tmp_path):
+    path = tmp_path / 'document.pdf'
+    path.write_bytes(b'pdf')
+
+    job = manager.submit('work', operator.add, 1, 2, owned_path=str(path))
+    assert job.wait(30)
+
+    assert job.status == DONE and job.result == 3
+    assert path.exists()
+
+
+def test_failed_submit_fails_job_and_keeps_dispatching(manager, tmp_path):
+    manager.start()
+    pool = manager._pools['work']
+
+    def broken_submit(*args, **kwargs):
+        raise RuntimeError('cannot schedule new futures after shutdown')
+
+    pool.submit = broken_submit
+    path = tmp_path / 'upload.mp4'
+    path.write_bytes(b'video')
+
+    failed = manager.submit('work', operator.add, 1, 2, owned_path=str(path))
+    assert failed.status == FAILED
+    assert not path.exists()
+    assert manager.stats()['work']['running'] == 0
+
+    job = manager.submit('work', operator.add, 3, 4)
+    assert job.wait(30) and job.result == 7
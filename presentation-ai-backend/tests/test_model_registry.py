@@ -0,0 +1,23 @@
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from model_registry import _estimate_size, _quantize  # noqa: E402
+
+
+def test_size_counts_dynamically_quantized_weights():
+    model = torch.nn.Sequential(torch.nn.Linear(256, 256), torch.nn.ReLU(), torch.nn.Linear(256, 256))
+    fp32 = _estimate_size(model)
+    assert fp32 == 2 * (256 * 256 + 256) * 4
+
+    int8 = _estimate_size(_quantize(model))
+    # int8 weights plus fp32 biases
+    assert int8 >= 2 * (256 * 256 + 256 * 4)
+    assert int8 < fp32 / 2
+
+
+def test_tied_weights_count_once():
+    embedding = torch.nn.Embedding(100, 32)
+    head = torch.nn.Linear(32, 100, bias=False)
+    head.weight = embedding.weight
+    assert _estimate_size(torch.nn.ModuleDict({'embedding': embedding, 'head': head})) == 100 * 32 * 4
@@ -0,0 +1,136 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+pytest.importorskip('werkzeug')
+
+from upload_store import UploadError, UploadStore  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadStore(directory=str(tmp_path), chunk_size=4, max_bytes=32)
+
+
+def append(store, upload_id, data, offset):
+    return store.append(upload_id, io.BytesIO(data), offset)
+
+
+def test_resumable_upload_in_chunks(store):
+    upload_id = store.create('talk.mp4', total_size=10)
+    assert append(store, upload_id, b'0123', 0) == 4
+    assert store.get(upload_id)['offset'] == 4
+    assert append(store, upload_id, b'456789', 4) == 10
+
+    upload = store.complete(upload_id)
+    assert upload['complete'] and upload['offset'] == 10
+    assert upload['sha256'] == hashlib.sha256(b'0123456789').hexdigest()
+    assert upload['path'].endswith('.mp4')
+
+
+def test_resume_after_restart_rehashes_file(store, tmp_path):
+    upload_id = store.create('talk.mp4')
+    append(store, upload_id, b'first', 0)
+
+    restarted = UploadStore(directory=str(tmp_path), chunk_size=4, max_bytes=32)
+    assert restarted.get(upload_id)['offset'] == 5
+    append(restarted, upload_id, b'second', 5)
+    assert restarted.complete(upload_id)['sha256'] == hashlib.sha256(b'firstsecond').hexdigest()
+
+
+def test_offset_mismatch_is_409_with_current_offset(store):
+    upload_id = store.create()
+    append(store, upload_id, b'abc', 0)
+
+    with pytest.raises(UploadError) as error:
+        append(store, upload_id, b'def', 0)
+    assert error.value.status == 409 and error.value.offset == 3
+    assert store.get(upload_id)['offset'] == 3
+
+
+def test_complete_before_all_bytes_is_409(store):
+    upload_id = store.create(total_size=6)
+    append(store, upload_id, b'abc', 0)
+
+    with pytest.raises(UploadError) as error:
+        store.complete(upload_id)
+    assert error.value.status == 409 and error.value.offset == 3
+
+
+def test_appending_after_complete_is_409(store):
+    upload_id = store.create()
+    append(store, upload_id, b'abc', 0)
+    store.complete(upload_id)
+
+    with pytest.raises(UploadError) as error:
+        append(store, upload_id, b'def', 3)
+    assert error.value.status == 409
+
+
+def test_total_size_cap_is_413_and_upload_can_resume(store):
+    upload_id = store.create()
+    append(store, upload_id, b'x' * 30, 0)
+
+    with pytest.raises(UploadError) as error:
+        append(store, upload_id, b'y' * 8, 30)
+    assert error.value.status == 413 and error.value.offset == 30
+    assert store.get(upload_id)['offset'] == 30
+
+    assert append(store, upload_id, b'yy', 30) == 32
+    assert store.complete(upload_id)['sha256'] == hashlib.sha256(b'x' * 30 + b'yy').hexdigest()
+
+
+def test_declared_size_over_cap_is_413(store):
+    with pytest.raises(UploadError) as error:
+        store.create(total_size=33)
+    assert error.value.status == 413
+
+
+def test_bytes_past_declared_size_are_413(store):
+    upload_id = store.create(total_size=4)
+    with pytest.raises(UploadError) as error:
+        append(store, upload_id, b'12345', 0)
+    assert error.value.status == 413 and error.value.offset == 0
+    assert store.get(upload_id)['offset'] == 0
+
+
+def test_one_shot_upload_over_cap_leaves_nothing(store, tmp_path):
+    with pytest.raises(UploadError) as error:
+        store.save_stream(io.BytesIO(b'z' * 40), 'big.mp4')
+    assert error.value.status == 413
+    assert os.listdir(tmp_path) == []
+    assert store._locks == {} and store._hashers == {}
+
+
+def test_release_hands_file_to_job(store):
+    upload = store.save_stream(io.BytesIO(b'video'), 'talk.mp4')
+    store.release(upload['upload_id'])
+
+    # The data file now belongs to the job; the upload itself is gone
+    with open(upload['path'], 'rb') as f:
+        assert f.read() == b'video'
+    with pytest.raises(UploadError) as error:
+        store.get(upload['upload_id'])
+    assert error.value.status == 404
+    assert store._locks == {} and store._hashers == {}
+
+
+def test_unknown_and_malformed_ids_are_404_without_locks(store):
+    for upload_id in ('0' * 32, '../etc/passwd', ''):
+        with pytest.raises(UploadError) as error:
+            append(store, upload_id, b'abc', 0)
+        assert error.value.status == 404
+    assert store._locks == {}
+
+
+def test_prune_removes_abandoned_uploads(store, tmp_path):
+    upload_id = store.create()
+    append(store, upload_id, b'abc', 0)
+    store.retention = -1
+    store.create()
+
+    with pytest.raises(UploadError):
+        store.get(upload_id)
+    assert upload_id not in store._locks and upload_id not in store._hashers
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+
+import pytest
+
+from disk_cache import make_key
+from youtube_cache import YouTubeCache
+
+
+class FakeDownloader:
+    """Writes a small file in place of yt-dlp and counts the downloads"""
+
+    def __init__(self, delay=0.0, data=b'video bytes'):
+        self.delay = delay
+        self.data = data
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url, directory, video_format):
+        with self._lock:
+            self.calls.append((url, video_format))
+        time.sleep(self.delay)
+        path = os.path.join(directory, 'download.mp4')
+        with open(path, 'wb') as f:
+            f.write(self.data)
+        return path
+
+
+@pytest.fixture
+def temp_dir(tmp_path):
+    return str(tmp_path / 'temp')
+
+
+def make_cache(tmp_path, downloader, **kwargs):
+    return YouTubeCache(directory=str(tmp_path / 'cache'), max_bytes=1024 * 1024,
+                        video_format='worst', downloader=downloader, **kwargs)
+
+
+def assert_no_locks_left(cache):
+    assert cache._thread_locks == {}
+    assert os.listdir(cache._lock_dir) == []
+
+
+def test_miss_downloads_then_hit_reuses(tmp_path, temp_dir):
+    downloader = FakeDownloader()
+    cache = make_cache(tmp_path, downloader)
+
+    first = cache.checkout_media('https://youtu.be/abc', 'abc', temp_dir)
+    second = cache.checkout_media('https://youtu.be/abc', 'abc', temp_dir)
+
+    assert downloader.calls == [('https://youtu.be/abc', 'worst')]
+    assert first != second
+    with open(first, 'rb') as f:
+        assert f.read() == b'video bytes'
+    with open(second, 'rb') as f:
+        assert f.read() == b'video bytes'
+    assert cache.stats()['hits'] == 1
+    assert_no_locks_left(cache)
+
+
+def test_checkout_survives_eviction(tmp_path, temp_dir):
+    cache = make_cache(tmp_path, FakeDownloader())
+    path = cache.checkout_media('https://youtu.be/abc', 'abc', temp_dir)
+
+    cache.store.remove(make_key('media', 'abc', 'worst'))
+    assert cache.store.lookup(make_key('media', 'abc', 'worst')) is None
+
+    with open(path, 'rb') as f:
+        assert f.read() == b'video bytes'
+
+
+def test_concurrent_callers_download_once(tmp_path, temp_dir):
+    downloader = FakeDownloader(delay=0.2)
+    cache = make_cache(tmp_path, downloader)
+    paths = []
+    errors = []
+
+    def checkout():
+        try:
+            paths.append(cache.checkout_media('https://youtu.be/abc', 'abc', temp_dir))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=checkout) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(downloader.calls) == 1
+    assert len(set(paths)) == 4
+    assert_no_locks_left(cache)
+
+
+def test_failed_download_is_not_cached(tmp_path, temp_dir):
+    def failing(url, directory, video_format):
+        raise RuntimeError('network down')
+
+    cache = make_cache(tmp_path, failing)
+    with pytest.raises(RuntimeError):
+        cache.checkout_media('https://youtu.be/abc', 'abc', temp_dir)
+    assert_no_locks_left(cache)
+
+    cache.downloader = FakeDownloader()
+    assert os.path.exists(cache.checkout_media('https://youtu.be/abc', 'abc', temp_dir))
+
+
+def test_transcript_none_is_not_cached(tmp_path):
+    cache = make_cache(tmp_path, FakeDownloader())
+    assert cache.transcript('abc', lambda: None) is None
+    assert cache.transcript('abc', lambda: 'hello') == 'hello'
+    assert cache.transcript('abc', lambda: 'changed') == 'hello'
+    assert_no_locks_left(cache)
@@ -4,6 +4,7 @@ import os
 from dotenv import load_dotenv
 import time
 from datetime import datetime, timedelta
+from instrumentation import metrics
 
 load_dotenv()  # Add this at the top with other imports
 
@@ -109,9 +110,11 @@ class TextProcessor:
             Format as JSON with sections array containing heading and points.
             """
 
-            response = self.model.generate_content(prompt)
+            with metrics.span('text.gemini'):
+                response = self.model.generate_content(prompt)
             content = response.text
-            return self._organize_slides(content)
+            with metrics.span('text.organize'):
+                return self._organize_slides(content)
         except Exception as e:
             print(f"Error generating topic slides: {e}")
             return self._handle_api_error(e)
@@ -146,10 +149,12 @@ class TextProcessor:
             - Ensure the response is valid JSON
             """
 
-            response = self.model.generate_content(prompt)
+            with metrics.span('text.gemini'):
+                response = self.model.generate_content(prompt)
             content = response.text
             print(f"Raw API response: {content}")  # Debug logging
-            return self._organize_slides(content)
+            with metrics.span('text.organize'):
+                return self._organize_slides(content)
         except Exception as e:
             print(f"Error processing text: {e}")
             return self._handle_api_error(e)
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+
+from werkzeug.utils import secure_filename
+
+from disk_cache import hash_file
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadError(Exception):
+    """Raised for unknown uploads, out-of-order chunks and uploads over the size limit"""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+class UploadStore:
+    """Streams uploaded bytes to unique files on disk in bounded chunks, hashing as it goes.
+
+    Each upload is a data file plus a small JSON sidecar, so resumable
+    uploads survive a restart and can continue from the last offset.
+    No upload grows past max_bytes, however many chunks it arrives in.
+    """
+
+    def __init__(self, directory=None, chunk_size=CHUNK_SIZE, retention=24 * 3600, max_bytes=None):
+        self.directory = directory or os.path.join('temp', 'uploads')
+        self.chunk_size = chunk_size
+        self.retention = retention
+        self.max_bytes = max_bytes or int(os.getenv('MAX_UPLOAD_MB', '2048')) * 1024 * 1024
+        self._hashers = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def create(self, filename=None, total_size=None):
+        """Start a resumable upload and return its id"""
+        if total_size is not None and total_size > self.max_bytes:
+            raise UploadError(self._too_large_message(), status=413)
+        self._prune()
+        upload_id = uuid.uuid4().hex
+        extension = os.path.splitext(secure_filename(filename or ''))[1] or '.mp4'
+        meta = {
+            'filename': filename,
+            'extension': extension,
+            'total_size': total_size,
+            'created_at': time.time(),
+            'complete': False,
+            'sha256': None
+        }
+        open(self._data_path(upload_id, meta), 'wb').close()
+        self._write_meta(upload_id, meta)
+        self._hashers[upload_id] = hashlib.sha256()
+        return upload_id
+
+    def append(self, upload_id, stream, offset):
+        """Append bytes from stream at offset; returns the new offset"""
+        with self._upload_lock(upload_id):
+            meta = self._read_meta(upload_id)
+            if meta['complete']:
+                raise UploadError('Upload already completed', status=409)
+
+            path = self._data_path(upload_id, meta)
+            current = os.path.getsize(path)
+            if offset != current:
+                raise UploadError(f'Offset mismatch: expected {current}', status=409, offset=current)
+
+            # A declared size is the limit, so a resumable upload can't grow past what complete() accepts
+            limit = meta['total_size'] if meta['total_size'] is not None else self.max_bytes
+            # A hasher lost to a restart is rebuilt from the file when the upload completes
+            hasher = self._hashers.get(upload_id)
+            with open(path, 'ab') as f:
+                size = current
+                for chunk in iter(lambda: stream.read(self.chunk_size), b''):
+                    size += len(chunk)
+                    if size > limit:
+                        # Drop this request's bytes so the upload can resume from where it was
+                        f.truncate(current)
+                        self._hashers.pop(upload_id, None)
+                        message = (self._too_large_message() if limit == self.max_bytes
+                                   else f"Upload is larger than its declared {limit} bytes")
+                        raise UploadError(message, status=413, offset=current)
+                    f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+            return os.path.getsize(path)
+
+    def complete(self, upload_id):
+        """Finish a resumable upload and return its metadata"""
+        with self._upload_lock(upload_id):
+            meta = self._read_meta(upload_id)
+            if meta['complete']:
+                return self._describe(upload_id, meta)
+
+            path = self._data_path(upload_id, meta)
+            size = os.path.getsize(path)
+            if meta['total_size'] is not None and size != meta['total_size']:
+                raise UploadError(f"Upload incomplete: {size} of {meta['total_size']} bytes", status=409, offset=size)
+
+            hasher = self._hashers.pop(upload_id, None)
+            meta['sha256'] = hasher.hexdigest() if hasher is not None else hash_file(path)
+            meta['complete'] = True
+            self._write_meta(upload_id, meta)
+            # Callers that find the upload complete don't write to it, so its lock can go
+            self._forget(upload_id)
+            return self._describe(upload_id, meta)
+
+    def save_stream(self, stream, filename=None):
+        """One-shot upload of a whole stream; returns its metadata"""
+        upload_id = self.create(filename)
+        try:
+            self.append(upload_id, stream, 0)
+        except UploadError:
+            self.discard(upload_id)
+            raise
+        return self.complete(upload_id)
+
+    def get(self, upload_id):
+        # The sidecar is replaced atomically, so reading it needs no lock
+        meta = self._read_meta(upload_id)
+        return self._describe(upload_id, meta)
+
+    def release(self, upload_id):
+        """Forget an upload's sidecar; the data file now belongs to the caller"""
+        self._forget(upload_id)
+        try:
+            os.remove(self._meta_path(upload_id))
+        except OSError:
+            pass
+
+    def discard(self, upload_id):
+        """Remove an upload and its data file"""
+        meta = self._read_meta(upload_id)
+        path = self._data_path(upload_id, meta)
+        self.release(upload_id)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _forget(self, upload_id):
+        self._hashers.pop(upload_id, None)
+        with self._lock:
+            self._locks.pop(upload_id, None)
+
+    def _too_large_message(self):
+        return f"Upload is larger than {self.max_bytes // (1024 * 1024)} MB"
+
+    def _describe(self, upload_id, meta):
+        path = self._data_path(upload_id, meta)
+        return {
+            'upload_id': upload_id,
+            'path': path,
+            'filename': meta['filename'],
+            'offset': os.path.getsize(path),
+            'total_size': meta['total_size'],
+            'complete': meta['complete'],
+            'sha256': meta['sha256']
+        }
+
+    def _upload_lock(self, upload_id):
+        # Only existing uploads get a lock, so requests for unknown ids leave nothing behind
+        self._read_meta(upload_id)
+        with self._lock:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    def _meta_path(self, upload_id):
+        return os.path.join(self.directory, f'{upload_id}.json')
+
+    def _data_path(self, upload_id, meta):
+        return os.path.join(self.directory, f"{upload_id}{meta['extension']}")
+
+    def _read_meta(self, upload_id):
+        # Ids are hex strings we generated; anything else can't name a file here
+        if not upload_id or not all(c in '0123456789abcdef' for c in upload_id):
+            raise UploadError('Upload not found', status=404)
+        try:
+            with open(self._meta_path(upload_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            raise UploadError('Upload not found', status=404)
+
+    def _write_meta(self, upload_id, meta):
+        tmp_path = self._meta_path(upload_id) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(upload_id))
+
+    def _prune(self):
+        # Drop uploads that were abandoned or never processed
+        cutoff = time.time() - self.retention
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    self._forget(name.split('.', 1)[0])
+            except OSError:
+                pass
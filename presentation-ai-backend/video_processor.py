@@ -1,352 +1,747 @@
 import cv2
 import numpy as np
 import torch
-import torch.nn as nn
-from transformers import ViTImageProcessor, ViTModel
-from PIL import Image
-import pytesseract
 import base64
-from pytube import YouTube
+import contextvars
 import os
-import yt_dlp
-import whisper
-from youtube_transcript_api import YouTubeTranscriptApi
-from transformers import pipeline
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'  # Adjust path if different
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from model_registry import registry, VIT_MODEL_NAME, SUMMARIZER_MODEL_NAME, WHISPER_MODEL_NAME
+from feature_cache import feature_cache, SECTIONS_VERSION
+from summary_cache import summary_cache
+from audio_transcriber import AudioTranscriber
+from youtube_cache import youtube_cache, download_with_yt_dlp
+from disk_cache import hash_file
+from image_store import image_store
+from memory_usage import RSSSampler, current_rss_bytes
+from keyframe_selector import create_selector
+from slide_ocr import slide_ocr
+from instrumentation import metrics
 
 class VideoProcessor:
-    def __init__(self):
-        # Initialize the ViT model for feature extraction
-        self.feature_extractor = ViTImageProcessor.from_pretrained('google/vit-base-patch16-224')
-        self.vit_model = ViTModel.from_pretrained('google/vit-base-patch16-224')
-        
-        # Initialize LSTM for temporal analysis
-        self.lstm = nn.LSTM(
-            input_size=768,  # ViT feature size
-            hidden_size=256,
-            num_layers=2,
-            batch_first=True
-        )
-
-        self.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-        self.audio_model = whisper.load_model("base")
-
-        # Initialize the model weights properly
-        self._initialize_model_weights()
-
-    def _initialize_model_weights(self):
-        # Initialize the LSTM weights
-        for name, param in self.lstm.named_parameters():
-            if 'weight' in name:
-                nn.init.xavier_uniform_(param)
-            elif 'bias' in name:
-                nn.init.zeros_(param)
-
-        # Initialize the ViT model's pooler weights if they exist
-        if hasattr(self.vit_model, 'pooler'):
-            if hasattr(self.vit_model.pooler, 'dense'):
-                nn.init.xavier_uniform_(self.vit_model.pooler.dense.weight)
-                nn.init.zeros_(self.vit_model.pooler.dense.bias)
-
-    def process(self, video_input):
+    def __init__(self, models=None, batch_size=None, num_threads=None, seek_frames=None, scene_threshold=None,
+                 cache=True, cache_summaries=True, cache_youtube=True, image_mode=None, selector=None, ocr=None):
+        # Shared models come from the process-wide registry and are loaded on first use
+        self.models = models or registry
+
+        # Embeddings and keyframe selections of previously seen videos (cache=False disables)
+        self.feature_cache = feature_cache if cache is True else (cache or None)
+
+        # Summaries of previously seen transcript chunks (cache_summaries=False disables)
+        self.summary_cache = summary_cache if cache_summaries is True else (cache_summaries or None)
+
+        # Downloads, transcripts and Whisper output per YouTube video id (cache_youtube=False disables)
+        self.youtube_cache = youtube_cache if cache_youtube is True else (cache_youtube or None)
+
+        # ViT mini-batch size and intra-op thread count (0 keeps torch's default)
+        self.batch_size = max(1, batch_size or int(os.getenv('VIT_BATCH_SIZE', '16')))
+        self.num_threads = num_threads if num_threads is not None else int(os.getenv('TORCH_NUM_THREADS', '0'))
+
+        # Worker processes for Whisper transcription (1 transcribes in-process)
+        self.audio_workers = int(os.getenv('AUDIO_WORKERS', '2'))
+
+        # Chunks per BART forward pass when summarizing a transcript
+        self.summary_batch_size = max(1, int(os.getenv('SUMMARY_BATCH_SIZE', '8')))
+
+        # Mean absolute change (0-1) a sample needs over the last kept one to reach ViT; 0 disables the filter
+        self.scene_threshold = scene_threshold if scene_threshold is not None else float(os.getenv('SCENE_CHANGE_THRESHOLD', '0'))
+
+        # Seek to sample times instead of decoding every frame (FRAME_SEEK=0 forces sequential reads)
+        self.seek_frames = seek_frames if seek_frames is not None else os.getenv('FRAME_SEEK', '1') != '0'
+
+        # Slide images: 'inline' base64 JPEG (default) or 'url' references served by /api/images
+        self.image_mode = image_mode or os.getenv('SLIDE_IMAGE_MODE', 'inline')
+        self.image_store = image_store
+
+        # Per-request measurements from the last process() call
+        self.stats = {}
+
+        # On-screen text of the keyframes via Tesseract (VIDEO_OCR=1 enables; off by default)
+        ocr = ocr if ocr is not None else os.getenv('VIDEO_OCR', '0') == '1'
+        self.ocr = slide_ocr if ocr is True else (ocr or None)
+
+        # Keyframe selection over the frame embeddings: 'changepoint' (default) or 'lstm'
+        self.keyframe_selector = selector if hasattr(selector, 'select') else create_selector(selector)
+
+    @property
+    def profile(self):
+        # Inference profile of the shared models; part of every cache key
+        return getattr(self.models, 'profile', 'accurate')
+
+    @property
+    def feature_extractor(self):
+        return self.models.get('vit_processor')
+
+    @property
+    def vit_model(self):
+        return self.models.get('vit')
+
+    @property
+    def summarizer(self):
+        return self.models.get('summarizer')
+
+    @property
+    def audio_model(self):
+        return self.models.get('whisper')
+
+    def process(self, video_input, content_hash=None):
+        # Process RSS is sampled, never reset, so concurrent stages and jobs don't disturb each other's readings
+        with RSSSampler() as rss:
+            slides = self._process(video_input, content_hash)
+        self.stats['memory'] = rss.stats()
+        print(f"Process RSS during request: {rss.start_bytes / (1024 * 1024):.1f} MB at start, "
+              f"{rss.max_bytes / (1024 * 1024):.1f} MB highest sampled, {rss.end_bytes / (1024 * 1024):.1f} MB at end")
+        return slides
+
+    def _process(self, video_input, content_hash=None):
+        video_path = None
         try:
             print(f"Processing video input: {video_input}")
+            self.stats['timings'] = {}
+            self.stats['rss_delta_bytes'] = {}
+            start = time.perf_counter()
             
             # Download YouTube video
-            if 'youtube.com' in video_input or 'youtu.be' in video_input:
-                video_path = self._download_youtube_video(video_input)
+            if self._is_youtube_url(video_input):
+                video_path = self._timed('download', self._download_youtube_video, video_input)
                 print(f"Downloaded video to: {video_path}")
-                # Get video text and summary
-                summary = self._get_video_text(video_input, video_path)
             else:
                 video_path = video_input
-                summary = ""
+                if content_hash is None and self.feature_cache:
+                    # Hashed once here; both branches key their cache entries by it
+                    content_hash = self._timed('hash', hash_file, video_path)
 
-            # Extract frames
-            frames = self._extract_frames(video_path, sample_rate=60)  # Changed from 30 to 60
-            print(f"Extracted {len(frames)} frames")
-            
-            # Extract features and analyze
-            features = self._extract_features(frames)
-            important_frames = self._analyze_temporal(features)
-            print(f"Selected {len(important_frames)} important frames")
-            
-            # Create slides from important frames
-            slides = self._create_slides(frames, important_frames, summary)
-            
-            # Cleanup downloaded video
-            if 'youtube.com' in video_input or 'youtu.be' in video_input:
-                if os.path.exists(video_path):
-                    os.remove(video_path)
+            # The text branch (transcript/Whisper + summaries) and the visual branch
+            # (frames, ViT, temporal analysis) are independent until slide creation
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix='video-branch') as pool:
+                # Each branch runs in a copy of this context so its spans reach the job's timings
+                text_future = pool.submit(contextvars.copy_context().run, self._timed, 'text', self._get_sections,
+                                          video_input, video_path, content_hash)
+                visual_future = pool.submit(contextvars.copy_context().run, self._timed, 'visual', self._analyze_frames,
+                                            video_input, video_path, content_hash)
+                features, important_frames, timestamps = visual_future.result()
+
+                # Re-fetch full-resolution pixels for the keyframes while the text branch may still be running
+                slide_frames = self._timed('fetch_frames', self._fetch_frames, video_path, timestamps, [0] + important_frames)
+                summary = text_future.result()
+
+            # Content slides pair sections with keyframes, so only that many keyframes are OCR'd;
+            # OCR runs while the slide images are encoded
+            slide_count = min(len(summary), len(important_frames))
+            ocr_handle = self.ocr.submit([slide_frames[i] for i in important_frames[:slide_count]]) if self.ocr else None
+
+            slides = self._timed('slides', self._create_slides, slide_frames, important_frames, summary, timestamps)
+            if ocr_handle is not None:
+                # Only the OCR time not hidden behind slide encoding shows up here
+                self._timed('ocr', self._attach_ocr_text, slides, ocr_handle)
             
+            timings = self.stats['timings']
+            timings['total'] = round(time.perf_counter() - start, 3)
+            timings['critical_path'] = 'text' if timings['text'] > timings['visual'] else 'visual'
+            print(f"Stage timings (s): {timings}")
             return slides
 
         except Exception as e:
             print(f"Error in process: {str(e)}")
             raise e
+        finally:
+            # The download (or this job's link to the cached one) is only needed for this request
+            if self._is_youtube_url(video_input) and video_path and os.path.exists(video_path):
+                os.remove(video_path)
+
+    def _timed(self, name, func, *args):
+        # Run one pipeline stage and record its wall time in stats['timings'] and the change in
+        # process RSS over it in stats['rss_delta_bytes'] (stages on other threads count too)
+        start = time.perf_counter()
+        rss_start = current_rss_bytes()
+        try:
+            with metrics.span(f'video.{name}'):
+                return func(*args)
+        finally:
+            self.stats['timings'][name] = round(time.perf_counter() - start, 3)
+            self.stats['rss_delta_bytes'][name] = current_rss_bytes() - rss_start
+
+    def _analyze_frames(self, video_input, video_path, content_hash=None):
+        # Visual branch: returns (features, important frame indices, timestamps)
+        # Repeat videos skip decoding, ViT and temporal analysis entirely
+        cache_key = self._feature_cache_key(video_input, video_path, content_hash)
+        cached = self.feature_cache.get(cache_key) if self.feature_cache else None
+        if cached is not None:
+            features, important_frames, timestamps = cached
+            print(f"Feature cache hit: {len(timestamps)} frames, {len(important_frames)} important frames")
+            return features, important_frames, timestamps
+
+        # Stream downscaled working copies straight into feature extraction,
+        # skipping frames that barely differ from the last one kept
+        timestamps = []
+        samples = self._iter_frames(video_path, sample_rate=60, size=self._working_size())
+        samples = self._drop_static_frames(samples)
+        features = self._extract_features(self._unzip_samples(samples, timestamps))
+        print(f"Extracted {len(timestamps)} frames")
+        
+        # Analyze
+        important_frames = self._analyze_temporal(features, timestamps)
+
+        if self.feature_cache:
+            self.feature_cache.put(cache_key, features, important_frames, timestamps)
+        return features, important_frames, timestamps
+
+    def _source_id(self, video_input, video_path, content_hash=None):
+        # Uploads are keyed by content hash, YouTube videos by their id
+        if self._is_youtube_url(video_input):
+            return f"youtube:{self._youtube_video_id(video_input)}"
+        return f"sha256:{content_hash or hash_file(video_path)}"
+
+    def _feature_cache_key(self, video_input, video_path, content_hash=None):
+        return self.feature_cache.make_key(self._source_id(video_input, video_path, content_hash), {
+            'vit_model': VIT_MODEL_NAME,
+            'profile': self.profile,
+            'sample_rate': 60,
+            'max_frames': 100,
+            'scene_threshold': self.scene_threshold,
+            'selector': self.keyframe_selector.name,
+            'selector_params': self.keyframe_selector.params()
+        })
+
+    def _is_youtube_url(self, video_input):
+        return 'youtube.com' in video_input or 'youtu.be' in video_input
+
+    def _youtube_video_id(self, url):
+        video_id = url.split('watch?v=')[1] if 'watch?v=' in url else url.split('/')[-1].split('?')[0]
+        return video_id.split('&')[0]
 
     def _download_youtube_video(self, url):
         try:
+            # Cached downloads are shared between requests for the same video id;
+            # the job reads its own link to the file, which process() removes when done
+            if self.youtube_cache:
+                return self.youtube_cache.checkout_media(url, self._youtube_video_id(url))
+
             # Create temp directory if it doesn't exist
             if not os.path.exists('temp'):
                 os.makedirs('temp')
             
-            # Configure yt-dlp options
-            ydl_opts = {
-                'format': 'best[ext=mp4]',
-                'outtmpl': os.path.join('temp', '%(id)s.mp4'),
-                'quiet': True
-            }
-            
-            # Download the video
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                print(f"Downloading video from {url}")
-                info = ydl.extract_info(url, download=True)
-                video_id = info['id']
-                temp_path = os.path.join('temp', f'{video_id}.mp4')
-                
-                if not os.path.exists(temp_path):
-                    raise Exception("Download failed - file not created")
-                    
-                print(f"Video downloaded successfully to {temp_path}")
-                return temp_path
+            temp_path = download_with_yt_dlp(url, 'temp', 'best[ext=mp4]')
+            print(f"Video downloaded successfully to {temp_path}")
+            return temp_path
                 
         except Exception as e:
             print(f"Error in download: {str(e)}")
             raise Exception(f"Error downloading YouTube video: {str(e)}")
 
-    def _extract_frames(self, video_path, sample_rate=60):  # Changed from 30 to 60
-        frames = []
+    def _extract_frames(self, video_path, sample_rate=60, size=None):  # Changed from 30 to 60
+        timestamps = []
+        frames = list(self._unzip_samples(self._iter_frames(video_path, sample_rate, size), timestamps))
+        return frames, timestamps
+
+    def _iter_frames(self, video_path, sample_rate=60, size=None):
+        # Yields (timestamp_ms, RGB frame) one sample at a time, resized to size=(width, height) when given
         cap = cv2.VideoCapture(video_path)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        # Take max 100 frames regardless of video length
-        target_frames = min(100, total_frames // sample_rate)
-        sample_rate = total_frames // target_frames if target_frames > 0 else sample_rate
-        
-        frame_count = 0
-        processed_frames = 0
-        
-        while cap.isOpened() and processed_frames < target_frames:
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            if frame_count % sample_rate == 0:
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frames.append(frame_rgb)
-                processed_frames += 1
-            
-            frame_count += 1
-            
-        cap.release()
+        try:
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+            # Take max 100 frames regardless of video length
+            target_frames = min(100, total_frames // sample_rate)
+            if target_frames <= 0:
+                return
+            sample_rate = total_frames // target_frames
+
+            # Sample at evenly spaced points in time rather than frame counts
+            interval_ms = sample_rate * 1000.0 / fps
+            sample_times = [i * interval_ms for i in range(target_frames)]
+
+            for timestamp, frame in self._sample_frames(cap, sample_times, fps):
+                if size is not None:
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                yield timestamp, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        finally:
+            cap.release()
+
+    def _unzip_samples(self, samples, timestamps):
+        # Pass frames through while recording their timestamps in order
+        for timestamp, frame in samples:
+            timestamps.append(timestamp)
+            yield frame
+
+    def _drop_static_frames(self, samples):
+        # Keep a sample only if its small grayscale thumbnail differs enough from the last kept one
+        self.stats['frames_dropped'] = 0
+        if self.scene_threshold <= 0:
+            yield from samples
+            return
+
+        last_thumb = None
+        kept = dropped = 0
+        for timestamp, frame in samples:
+            thumb = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY), (32, 32), interpolation=cv2.INTER_AREA)
+            thumb = thumb.astype(np.float32) / 255.0
+            if last_thumb is not None and np.abs(thumb - last_thumb).mean() < self.scene_threshold:
+                dropped += 1
+                continue
+            last_thumb = thumb
+            kept += 1
+            yield timestamp, frame
+
+        self.stats['frames_dropped'] = dropped
+        print(f"Scene-change filter kept {kept} frames, dropped {dropped}")
+
+    def _fetch_frames(self, video_path, timestamps, indices):
+        # Decode full-resolution RGB frames for the given sample indices only
+        indices = sorted(set(indices))
+        frames = {}
+        cap = cv2.VideoCapture(video_path)
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            sample_times = [timestamps[i] for i in indices]
+            for index, (_, frame) in zip(indices, self._sample_frames(cap, sample_times, fps)):
+                frames[index] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        finally:
+            cap.release()
         return frames
 
+    def _working_size(self):
+        # Analysis runs on copies already scaled to the ViT input size
+        size = self.feature_extractor.size
+        return size['width'], size['height']
+
+    def _sample_frames(self, cap, sample_times, fps):
+        # Yields (timestamp_ms, BGR frame) for each requested time, decoding only kept frames
+        seeking = self.seek_frames
+        half_frame_ms = 500.0 / fps
+
+        for target in sample_times:
+            if seeking:
+                # Jump straight to the target; containers that can't seek fall back below
+                if cap.set(cv2.CAP_PROP_POS_MSEC, target):
+                    with metrics.span('video.decode'):
+                        ret, frame = cap.read()
+                    if not ret:
+                        return
+                    yield self._frame_timestamp(cap, fps), frame
+                    continue
+                print("Video is not seekable, falling back to sequential decoding")
+                seeking = False
+
+            # Sequential fallback: grab() skips colour conversion for frames we don't keep
+            while True:
+                if not cap.grab():
+                    return
+                timestamp = self._frame_timestamp(cap, fps)
+                if timestamp + half_frame_ms >= target:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        return
+                    yield timestamp, frame
+                    break
+
+    def _frame_timestamp(self, cap, fps):
+        # Container timestamp of the last decoded frame, derived from its index if unavailable
+        timestamp = cap.get(cv2.CAP_PROP_POS_MSEC)
+        if timestamp <= 0:
+            timestamp = max(cap.get(cv2.CAP_PROP_POS_FRAMES) - 1, 0) * 1000.0 / fps
+        return int(round(timestamp))
+
     def _extract_features(self, frames):
+        # frames may be a list or a generator; only one mini-batch is held at a time
+        hidden_size = self.vit_model.config.hidden_size
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+
         features = []
-        
-        for frame in frames:
-            # Convert to PIL Image
-            pil_image = Image.fromarray(frame)
-            
-            # Extract features using ViT
-            inputs = self.feature_extractor(images=pil_image, return_tensors="pt")
-            with torch.no_grad():
-                outputs = self.vit_model(**inputs)
-            
-            # Get the [CLS] token representation and flatten it
-            feature = outputs.last_hidden_state[:, 0, :].squeeze(0).detach().numpy()  # Added detach()
-            features.append(feature)
-            
-        return np.array(features)
+        batch = []
+        frame_count = 0
+        start = time.perf_counter()
 
-    def _analyze_temporal(self, features, threshold=0.7):
-        # Ensure features are the right shape
-        features_tensor = torch.FloatTensor(features).unsqueeze(0)
-        
-        # Process through LSTM
-        lstm_out, _ = self.lstm(features_tensor)
+        # Run ViT over mini-batches instead of one frame at a time
+        with torch.inference_mode():
+            for frame in frames:
+                batch.append(frame)
+                if len(batch) == self.batch_size:
+                    features.append(self._embed_batch(batch))
+                    frame_count += len(batch)
+                    batch = []
+            if batch:
+                features.append(self._embed_batch(batch))
+                frame_count += len(batch)
+
+        if not features:
+            return np.empty((0, hidden_size), dtype=np.float32)
+
+        elapsed = time.perf_counter() - start
+        print(f"Extracted features for {frame_count} frames in {elapsed:.2f}s "
+              f"({frame_count / max(elapsed, 1e-9):.1f} frames/s, batch size {self.batch_size})")
+        return np.concatenate(features)
+
+    def _embed_batch(self, frames):
+        with metrics.span('video.preprocess'):
+            pixel_values = self._preprocess_frames(frames)
+        with metrics.span('video.vit'):
+            outputs = self.vit_model(pixel_values=pixel_values)
+        # Get the [CLS] token representation for every frame in the batch
+        return outputs.last_hidden_state[:, 0, :].numpy()
+
+    def _preprocess_frames(self, frames):
+        # Same resize/rescale/normalize as ViTImageProcessor, on a whole batch at once
+        processor = self.feature_extractor
+        height, width = processor.size['height'], processor.size['width']
+
+        batch = np.empty((len(frames), height, width, 3), dtype=np.float32)
+        for i, frame in enumerate(frames):
+            shrinking = frame.shape[0] > height or frame.shape[1] > width
+            interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR
+            batch[i] = cv2.resize(frame, (width, height), interpolation=interpolation)
+
+        mean = np.asarray(processor.image_mean, dtype=np.float32)
+        std = np.asarray(processor.image_std, dtype=np.float32)
+        batch *= processor.rescale_factor
+        batch -= mean
+        batch /= std
+
+        # NHWC -> NCHW as expected by ViTModel
+        return torch.from_numpy(np.ascontiguousarray(batch.transpose(0, 3, 1, 2)))
+
+    def _analyze_temporal(self, features, timestamps=None):
+        # Indices of the analyzed frames that become slides, in temporal order
+        start = time.perf_counter()
+        with metrics.span('video.keyframes'):
+            important_indices = self.keyframe_selector.select(features, timestamps)
+        elapsed = time.perf_counter() - start
+        print(f"Selected {len(important_indices)} keyframes from {len(features)} frames "
+              f"with '{self.keyframe_selector.name}' in {elapsed * 1000:.1f}ms")
+        return important_indices
+
+    def _get_sections(self, video_input, video_path, content_hash=None):
+        # Text branch: summarized sections of the transcript
+        # Repeat videos skip the transcript, Whisper and BART entirely
+        url = video_input if self._is_youtube_url(video_input) else None
+        cache_key = None
+        if self.feature_cache:
+            cache_key = self.feature_cache.make_key(self._source_id(video_input, video_path, content_hash), {
+                'sections': SECTIONS_VERSION,
+                'whisper_model': WHISPER_MODEL_NAME,
+                'audio_language': os.getenv('AUDIO_LANGUAGE') or None,
+                'summarizer_model': SUMMARIZER_MODEL_NAME,
+                'profile': self.profile
+            })
+            sections = self.feature_cache.get_sections(cache_key)
+            if sections is not None:
+                print(f"Sections cache hit: {len(sections)} sections")
+                self.stats['sections_cached'] = True
+                return sections
+
+        self.stats['sections_cached'] = False
+        try:
+            sections = self._get_video_text(url, video_path)
+        except Exception as e:
+            print(f"All transcript methods failed: {e}")
+            return [{"heading": "Content", "content": "No text could be extracted from the video"}]
+        # The unsummarized fallback of _organize_content is a failure too, and not worth keeping
+        if cache_key and not (len(sections) == 1 and sections[0]['heading'] == 'Content'):
+            self.feature_cache.put_sections(cache_key, sections)
+        return sections
+
+    def _get_video_text(self, url, video_path):
+        # url is None for uploaded files, which have no YouTube transcript to fetch
+        # Raises when neither a transcript nor Whisper produced text
+        video_id = self._youtube_video_id(url) if url else None
+        full_text = None
+        if video_id and self.youtube_cache:
+            with metrics.span('video.transcript'):
+                full_text = self.youtube_cache.transcript(video_id, lambda: self._get_youtube_transcript(video_id))
+        elif video_id:
+            with metrics.span('video.transcript'):
+                full_text = self._get_youtube_transcript(video_id)
+        if full_text:
+            sections = self._organize_content(full_text)
+            return sections
         
-        # Calculate importance scores
-        importance_scores = torch.sigmoid(lstm_out.squeeze(0)).detach()
-        scores = importance_scores.numpy()
+        # If no transcript found, try whisper
+        print(f"Starting audio transcription for {video_path}")
+        if not os.path.exists(video_path):
+            raise Exception(f"Video file not found at {video_path}")
         
-        # Dynamic slide count based on content length
-        content_length = len(scores)
-        if content_length <= 5:
-            target_slides = content_length  # Very short content
-        elif content_length <= 10:
-            target_slides = 5  # Short content
-        elif content_length <= 20:
-            target_slides = 8  # Medium content
+        # Segments stream into content organization while later windows are still transcribing
+        transcriber = AudioTranscriber(model=self.audio_model if self.audio_workers <= 1 else None,
+                                       workers=self.audio_workers)
+        if video_id and self.youtube_cache:
+            segments = self.youtube_cache.whisper_segments(
+                video_id,
+                {'model': WHISPER_MODEL_NAME, 'language': transcriber.language},
+                lambda: transcriber.transcribe(video_path)
+            )
         else:
-            target_slides = min(12, content_length // 3)  # Longer content
+            segments = transcriber.transcribe(video_path)
+        sections = self._organize_content(segments)
+        self.stats['transcription'] = transcriber.stats
+        if transcriber.stats:
+            # Whisper runs interleaved with content organization, so it is recorded after the fact
+            metrics.observe('stage_duration_seconds', transcriber.stats['elapsed'], stage='video.whisper')
+        return sections
+
+    def _get_youtube_transcript(self, video_id):
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        # Try different language codes
+        transcript = None
+        try_languages = ['en', 'en-US', 'en-GB', 'en-IN']  # Add more if needed
         
-        # Select most important frames
-        threshold = np.percentile(scores, 100 - (target_slides * 100 / len(scores)))
-        important_indices = np.where(scores > threshold)[0]
-        important_indices = [int(i) for i in important_indices[:target_slides]]
+        for lang in try_languages:
+            try:
+                transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[lang])
+                break  # Break if successful
+            except Exception as e:
+                print(f"Couldn't get transcript for language {lang}: {str(e)}")
+                continue
         
-        if len(important_indices) < 1:
-            important_indices = [0]
+        if transcript:
+            return ' '.join([t['text'] for t in transcript])
         
-        print(f"Generated {len(important_indices)} slides based on content length of {content_length}")
-        return important_indices
-
-    def _get_video_text(self, url, video_path):
+        # If no transcript found, try auto-translate
         try:
-            # Get transcript and organize by topics
-            video_id = url.split('watch?v=')[1] if 'watch?v=' in url else url.split('/')[-1].split('?')[0]
-            
-            # Try different language codes
-            transcript = None
-            try_languages = ['en', 'en-US', 'en-GB', 'en-IN']  # Add more if needed
-            
-            for lang in try_languages:
-                try:
-                    transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[lang])
-                    break  # Break if successful
-                except Exception as e:
-                    print(f"Couldn't get transcript for language {lang}: {str(e)}")
-                    continue
-            
-            if transcript:
-                full_text = ' '.join([t['text'] for t in transcript])
-                sections = self._organize_content(full_text)
-                return sections
-            
-            # If no transcript found, try auto-translate
-            try:
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                transcript = transcript_list.find_transcript(['hi'])  # Try Hindi since it's available
-                translated = transcript.translate('en')  # Translate to English
-                full_text = ' '.join([t['text'] for t in translated.fetch()])
-                sections = self._organize_content(full_text)
-                return sections
-            except Exception as e:
-                print(f"Translation failed: {str(e)}")
-            
-            # If all above fails, try whisper
-            print(f"Starting audio transcription for {video_path}")
-            if not os.path.exists(video_path):
-                raise Exception(f"Video file not found at {video_path}")
-            
-            result = self.audio_model.transcribe(video_path, fp16=False)
-            sections = self._organize_content(result["text"])
-            return sections
-            
+            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            transcript = transcript_list.find_transcript(['hi'])  # Try Hindi since it's available
+            translated = transcript.translate('en')  # Translate to English
+            return ' '.join([t['text'] for t in translated.fetch()])
         except Exception as e:
-            print(f"All transcript methods failed: {e}")
-            return [{"heading": "Content", "content": "No text could be extracted from the video"}]
+            print(f"Translation failed: {str(e)}")
+        return None
 
     def _organize_content(self, text):
+        # text is a transcript string or a stream of {'text': ...} segments from AudioTranscriber
         try:
-            # Split text into sentences
-            sentences = text.split('. ')
-            sections = []
-            current_section = []
-            
-            # Keywords for topic detection
-            topics = {
-                'introduction': ['introduction', 'begin', 'first', 'start'],
-                'main_points': ['key point', 'important', 'main', 'significant', 'feature', 'benefit'],
-                'examples': ['example', 'instance', 'case', 'illustration', 'such as'],
-                'conclusion': ['conclusion', 'finally', 'in summary', 'to conclude', 'lastly']
-            }
-            
-            # Force create sections every N sentences if no topic markers found
-            SECTION_SIZE = 4
-            
-            for i, sentence in enumerate(sentences):
-                current_section.append(sentence)
-                
-                # Check for topic changes or section size limit
-                should_split = False
-                detected_topic = None
-                
-                # Check for topic markers
-                for topic, keywords in topics.items():
-                    if any(keyword in sentence.lower() for keyword in keywords):
-                        detected_topic = topic
-                        should_split = True
-                        break
-                
-                # Split if section is long enough or it's a topic change
-                if should_split or len(current_section) >= SECTION_SIZE or i == len(sentences) - 1:
-                    if current_section:
-                        full_text = '. '.join(current_section)
-                        summary = self._summarize_text(full_text)
-                        
-                        # Generate appropriate heading
-                        if detected_topic:
-                            heading = self._generate_heading(detected_topic, current_section[0])
-                        else:
-                            # Extract key phrases for heading if no topic detected
-                            first_sentence = current_section[0]
-                            words = first_sentence.split()
-                            heading = ' '.join(words[:6]) + "..."
-                        
-                        sections.append({
-                            "heading": heading,
-                            "content": summary
-                        })
-                        current_section = []
+            # First pass: segment the transcript; second pass: summarize every section together
+            if isinstance(text, str):
+                sentences = text.split('. ')
+            else:
+                sentences = self._stream_sentences(text)
+            segments = self._segment_content(sentences)
             
             # Ensure we have at least some sections
-            if not sections:
-                sections = [{
-                    "heading": "Key Points",
-                    "content": self._summarize_text(text)
-                }]
+            if not segments:
+                if not isinstance(text, str):
+                    raise Exception("Transcription produced no text")
+                segments = [("Key Points", text, None, None)]
             
+            summaries = self._summarize_texts([section_text for _, section_text, _, _ in segments])
+            sections = []
+            for (heading, _, start, end), summary in zip(segments, summaries):
+                section = {"heading": heading, "content": summary}
+                if start is not None:
+                    # Time range of the speech the section was made from (Whisper transcripts only)
+                    section["start"], section["end"] = start, end
+                sections.append(section)
             return sections
         
         except Exception as e:
             print(f"Error organizing content: {e}")
-            return [{"heading": "Content", "content": content}]
+            if not isinstance(text, str):
+                raise
+            return [{"heading": "Content", "content": text}]
 
-    def _summarize_text(self, text):
-        try:
-            words = text.split()
-            # If text is too short, return as is
-            if len(words) < 50:
-                return text
-
-            # Calculate appropriate max_length based on input length
-            input_length = len(words)
-            max_length = min(input_length - 10, 100)  # Make summary shorter than input
-            min_length = min(30, max_length - 10)  # Ensure min_length is less than max_length
+    def _stream_sentences(self, segments):
+        # Same split as text.split('. ') on the concatenated segment texts, but yields sentences as they
+        # complete, as (sentence, start, end) with the times of the segments they begin and end in
+        buffer = ''
+        start = end = None
+        for segment in segments:
+            if start is None:
+                start = segment['start']
+            end = segment['end']
+            buffer += segment['text']
+            parts = buffer.split('. ')
+            for part in parts[:-1]:
+                yield part, start, end
+                start = segment['start']
+            buffer = parts[-1]
+        yield buffer, start, end
+
+    def _segment_content(self, sentences):
+        # Returns (heading, section_text, start, end) in transcript order; sentences may be a generator
+        # of strings, or of (sentence, start, end) with times in seconds (None when unknown)
+        segments = []
+        current_section = []
+        section_start = section_end = None
+        
+        # Keywords for topic detection
+        topics = {
+            'introduction': ['introduction', 'begin', 'first', 'start'],
+            'main_points': ['key point', 'important', 'main', 'significant', 'feature', 'benefit'],
+            'examples': ['example', 'instance', 'case', 'illustration', 'such as'],
+            'conclusion': ['conclusion', 'finally', 'in summary', 'to conclude', 'lastly']
+        }
+        
+        # Force create sections every N sentences if no topic markers found
+        SECTION_SIZE = 4
+        
+        for item, is_last in self._mark_last(sentences):
+            sentence, start, end = item if isinstance(item, tuple) else (item, None, None)
+            if not current_section:
+                section_start = start
+            section_end = end
+            current_section.append(sentence)
+            
+            # Check for topic changes or section size limit
+            should_split = False
+            detected_topic = None
             
-            # Process text in smaller chunks
-            chunks = []
-            max_chunk_length = 500
+            # Check for topic markers
+            for topic, keywords in topics.items():
+                if any(keyword in sentence.lower() for keyword in keywords):
+                    detected_topic = topic
+                    should_split = True
+                    break
             
-            for i in range(0, len(words), max_chunk_length):
-                chunk = ' '.join(words[i:i + max_chunk_length])
-                if len(chunk.split()) > 50:  # Only summarize if chunk is long enough
-                    try:
-                        summary = self.summarizer(
-                            chunk,
+            # Split if section is long enough or it's a topic change
+            if should_split or len(current_section) >= SECTION_SIZE or is_last:
+                if current_section:
+                    # Generate appropriate heading
+                    if detected_topic:
+                        heading = self._generate_heading(detected_topic, current_section[0])
+                    else:
+                        # Extract key phrases for heading if no topic detected
+                        first_sentence = current_section[0]
+                        words = first_sentence.split()
+                        heading = ' '.join(words[:6]) + "..."
+                    
+                    segments.append((heading, '. '.join(current_section), section_start, section_end))
+                    current_section = []
+        
+        return segments
+
+    def _mark_last(self, items):
+        # Yields (item, is_last) with one item of lookahead
+        iterator = iter(items)
+        try:
+            previous = next(iterator)
+        except StopIteration:
+            return
+        for item in iterator:
+            yield previous, False
+            previous = item
+        yield previous, True
+
+    def _summarize_text(self, text):
+        return self._summarize_texts([text])[0]
+
+    def _summarize_texts(self, texts):
+        # Plan every text's chunks first, then summarize all chunks in batches
+        plans = []
+        requests = []  # (chunk, max_length, min_length)
+        for text in texts:
+            try:
+                words = text.split()
+                # If text is too short, return as is
+                if len(words) < 50:
+                    plans.append([text])
+                    continue
+
+                # Calculate appropriate max_length based on input length
+                input_length = len(words)
+                max_length = min(input_length - 10, 100)  # Make summary shorter than input
+                min_length = min(30, max_length - 10)  # Ensure min_length is less than max_length
+                
+                # Process text in smaller chunks
+                parts = []
+                max_chunk_length = 500
+                
+                for i in range(0, len(words), max_chunk_length):
+                    chunk = ' '.join(words[i:i + max_chunk_length])
+                    if len(chunk.split()) > 50:  # Only summarize if chunk is long enough
+                        parts.append(len(requests))
+                        requests.append((chunk, max_length, min_length))
+                    else:
+                        parts.append(chunk)
+                plans.append(parts)
+            except Exception as e:
+                print(f"Error in text summarization: {e}")
+                plans.append([text[:500] + "..."])  # Return truncated text if summarization fails
+
+        outputs = self._run_summarizer(requests)
+        return [
+            ' '.join(outputs[part] if isinstance(part, int) else part for part in parts)
+            for parts in plans
+        ]
+
+    def _run_summarizer(self, requests):
+        # Chunks sharing generation parameters are batched, longest first so each batch pads little
+        results = [None] * len(requests)
+        if not requests:
+            return results
+
+        # Identical chunks with identical generation parameters reuse earlier summaries
+        keys = [None] * len(requests)
+        groups = defaultdict(list)
+        for index, (chunk, max_length, min_length) in enumerate(requests):
+            if self.summary_cache:
+                keys[index] = self.summary_cache.make_key(SUMMARIZER_MODEL_NAME, chunk, {
+                    'max_length': max_length,
+                    'min_length': min_length,
+                    'length_penalty': 2.0,
+                    'do_sample': False,
+                    'truncation': True,
+                    'profile': self.profile
+                })
+                cached = self.summary_cache.get(keys[index])
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            groups[(max_length, min_length)].append(index)
+
+        start = time.perf_counter()
+        for (max_length, min_length), indices in groups.items():
+            indices.sort(key=lambda i: len(requests[i][0]), reverse=True)
+            for b in range(0, len(indices), self.summary_batch_size):
+                batch = indices[b:b + self.summary_batch_size]
+                try:
+                    with metrics.span('video.bart'), torch.inference_mode():
+                        summaries = self.summarizer(
+                            [requests[i][0] for i in batch],
                             max_length=max_length,
                             min_length=min_length,
                             do_sample=False,
                             truncation=True,
                             length_penalty=2.0,  # Encourage concise summaries
+                            batch_size=len(batch),
                         )
-                        chunks.append(summary[0]['summary_text'])
-                    except Exception as e:
-                        print(f"Error summarizing chunk: {e}")
-                        # Extract key sentences instead of using full chunk
-                        sentences = chunk.split('. ')
-                        key_sentences = sentences[:3]  # Take first 3 sentences
-                        chunks.append('. '.join(key_sentences))
-                else:
-                    chunks.append(chunk)
-            
-            return ' '.join(chunks)
+                    for i, summary in zip(batch, summaries):
+                        results[i] = summary['summary_text']
+                        if self.summary_cache:
+                            self.summary_cache.put(keys[i], results[i])
+                except Exception as e:
+                    print(f"Error summarizing batch, retrying chunks one by one: {e}")
+                    for i in batch:
+                        results[i] = self._summarize_chunk(*requests[i], cache_key=keys[i])
+
+        elapsed = time.perf_counter() - start
+        summarized = sum(len(indices) for indices in groups.values())
+        print(f"Summarized {summarized} chunks in {elapsed:.2f}s "
+              f"({summarized / max(elapsed, 1e-9):.2f} chunks/s, batch size {self.summary_batch_size}), "
+              f"{len(requests) - summarized} from cache")
+        return results
+
+    def _summarize_chunk(self, chunk, max_length, min_length, cache_key=None):
+        try:
+            with metrics.span('video.bart'), torch.inference_mode():
+                summary = self.summarizer(
+                    chunk,
+                    max_length=max_length,
+                    min_length=min_length,
+                    do_sample=False,
+                    truncation=True,
+                    length_penalty=2.0,  # Encourage concise summaries
+                )
+            # Only real model output is cached, never the fallback below
+            if cache_key is not None:
+                self.summary_cache.put(cache_key, summary[0]['summary_text'])
+            return summary[0]['summary_text']
         except Exception as e:
-            print(f"Error in text summarization: {e}")
-            return text[:500] + "..."  # Return truncated text if summarization fails
+            print(f"Error summarizing chunk: {e}")
+            # Extract key sentences instead of using full chunk
+            sentences = chunk.split('. ')
+            key_sentences = sentences[:3]  # Take first 3 sentences
+            return '. '.join(key_sentences)
 
     def _generate_heading(self, topic_type, first_sentence):
         try:
@@ -372,12 +767,16 @@ class VideoProcessor:
             print(f"Error generating heading: {e}")
             return "Section"
 
-    def _create_slides(self, frames, important_indices, sections):
+    def _create_slides(self, frames, important_indices, sections, timestamps=None):
         slides = []
         
+        # Encode the title frame and every content slide's frame in parallel up front
+        slide_count = min(len(sections), len(important_indices))
+        images = self._encode_frames([frames[0]] + [frames[important_indices[i]] for i in range(slide_count)])
+        
         # Create title slide
         title_slide = {
-            'image': self._encode_frame(frames[0]),
+            **images[0],
             'content': 'Video Summary',
             'heading': 'Video Presentation',
             'is_title': True
@@ -389,20 +788,42 @@ class VideoProcessor:
             if i >= len(important_indices):
                 break
             
-            frame = frames[important_indices[i]]
-            
             slide = {
-                'image': self._encode_frame(frame),
+                **images[i + 1],
                 'content': section['content'],
                 'heading': section['heading'],
-                'timestamp': int(important_indices[i]),
+                # Video time in milliseconds when known, otherwise the sample index
+                'timestamp': int(timestamps[important_indices[i]]) if timestamps else int(important_indices[i]),
                 'is_title': False
             }
+            if 'start' in section:
+                # Video time in milliseconds of the speech this slide summarizes
+                slide['speech_start'] = int(section['start'] * 1000)
+                slide['speech_end'] = int(section['end'] * 1000)
             slides.append(slide)
         
         return slides
 
+    def _attach_ocr_text(self, slides, ocr_handle):
+        # Content slides follow important_frames order; text repeated from the previous keyframe is left off
+        results, self.stats['ocr'] = self.ocr.collect(ocr_handle)
+        for slide, result in zip(slides[1:], results):
+            if result['text'] and not result['duplicate']:
+                slide['ocr_text'] = result['text']
+
+    def _encode_frames(self, frames):
+        # Image fields for each frame: an inline base64 JPEG at the frame's own resolution, or a
+        # downscaled reference into the image store
+        if self.image_mode == 'url':
+            return [
+                {'image_id': image_id, 'image_url': f'/api/images/{image_id}'}
+                for image_id in self.image_store.save_many(frames)
+            ]
+        return [
+            {'image': base64.b64encode(data).decode('utf-8')}
+            for data in self.image_store.encode_many(frames, full_size=True)
+        ]
+
     def _encode_frame(self, frame):
         # Convert frame to base64 for transmission
-        _, buffer = cv2.imencode('.jpg', cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
-        return base64.b64encode(buffer).decode('utf-8') 
\ No newline at end of file
+        return base64.b64encode(self.image_store.encode(frame, full_size=True)).decode('utf-8')
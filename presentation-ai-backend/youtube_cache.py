@@ -0,0 +1,201 @@
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+
+from disk_cache import DiskCache, make_key
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-flight only within one process
+    fcntl = None
+
+DEFAULT_FORMAT = 'best[ext=mp4][height<=720]/best[ext=mp4]'
+
+
+def download_with_yt_dlp(url, directory, video_format=DEFAULT_FORMAT):
+    """Download url into directory with yt-dlp and return the file path"""
+    import yt_dlp
+
+    ydl_opts = {
+        'format': video_format,
+        'outtmpl': os.path.join(directory, '%(id)s.mp4'),
+        'quiet': True,
+        'updatetime': False  # Keep the download time as mtime so cache TTLs work
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        print(f"Downloading video from {url}")
+        info = ydl.extract_info(url, download=True)
+        path = os.path.join(directory, f"{info['id']}.mp4")
+    if not os.path.exists(path):
+        raise Exception("Download failed - file not created")
+    return path
+
+
+def _link_or_copy(source, target):
+    # A hard link keeps the data alive after the cache entry is evicted; copy across filesystems
+    try:
+        os.link(source, target)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+class YouTubeCache:
+    """Local artifacts per YouTube video id: downloaded media, raw transcript and Whisper output.
+
+    Entries expire after a TTL and are evicted LRU under a disk quota.
+    Concurrent requests for the same artifact (threads or worker
+    processes) wait for a single producer instead of repeating the work.
+    downloader(url, directory, video_format) -> path can replace yt-dlp,
+    e.g. in tests.
+    """
+
+    def __init__(self, directory=None, max_bytes=None, ttl=None, video_format=None, downloader=None):
+        directory = directory or os.getenv('YOUTUBE_CACHE_DIR', os.path.join('cache', 'youtube'))
+        max_bytes = max_bytes or int(os.getenv('YOUTUBE_CACHE_MAX_MB', '4096')) * 1024 * 1024
+        ttl = ttl or int(os.getenv('YOUTUBE_CACHE_TTL', str(7 * 24 * 3600)))
+        self.store = DiskCache(directory, max_bytes, ttl=ttl)
+        self.video_format = video_format or os.getenv('YOUTUBE_FORMAT', DEFAULT_FORMAT)
+        self.downloader = downloader or download_with_yt_dlp
+        self._lock_dir = os.path.join(directory, '.locks')
+        self._thread_locks = {}
+        self._lock = threading.Lock()
+        os.makedirs(self._lock_dir, exist_ok=True)
+
+    def checkout_media(self, url, video_id, directory='temp'):
+        """Path of the job's own hard link (or copy) of the cached download, downloading on a miss.
+
+        Eviction can delete the cache entry at any time, even right after
+        the download stores it; the job's link stays readable until the
+        caller removes it.
+        """
+        os.makedirs(directory, exist_ok=True)
+        target = os.path.join(directory, f'{uuid.uuid4().hex}_{video_id}.mp4')
+
+        def create(entry_directory):
+            path = os.path.join(entry_directory, 'video.mp4')
+            os.replace(self.downloader(url, entry_directory, self.video_format), path)
+            _link_or_copy(path, target)
+
+        key = make_key('media', video_id, self.video_format)
+        for _ in range(2):
+            entry = self._get_or_create(key, create)
+            if os.path.exists(target):
+                return target
+            try:
+                _link_or_copy(os.path.join(entry, 'video.mp4'), target)
+                return target
+            except FileNotFoundError:
+                # Evicted between the lookup and the link; look it up (and download) again
+                continue
+        raise Exception(f"Cached download of {video_id} was evicted before it could be used")
+
+    def transcript(self, video_id, fetch):
+        """Raw transcript text from cache or fetch(); a None result (no transcript, API error) is not cached"""
+        key = make_key('transcript', video_id)
+        entry = self.store.lookup(key)
+        if entry is None:
+            with self._single_flight(key):
+                entry = self.store.lookup(key, count=False)
+                if entry is None:
+                    text = fetch()
+                    if text is None:
+                        return None
+
+                    def write(directory):
+                        with open(os.path.join(directory, 'transcript.json'), 'w', encoding='utf-8') as f:
+                            json.dump({'text': text}, f)
+
+                    self.store.store(key, write)
+                    return text
+
+        with open(os.path.join(entry, 'transcript.json'), encoding='utf-8') as f:
+            return json.load(f)['text']
+
+    def whisper_segments(self, video_id, params, transcribe):
+        """Yield Whisper segments from cache, or stream them from transcribe() and cache them"""
+        key = make_key('whisper', video_id, params)
+        entry = self.store.lookup(key)
+        if entry is None:
+            with self._single_flight(key):
+                entry = self.store.lookup(key, count=False)
+                if entry is None:
+                    segments = []
+                    for segment in transcribe():
+                        segments.append(segment)
+                        yield segment
+
+                    def write(directory):
+                        with open(os.path.join(directory, 'whisper.json'), 'w', encoding='utf-8') as f:
+                            json.dump(segments, f)
+
+                    self.store.store(key, write)
+                    return
+
+        with open(os.path.join(entry, 'whisper.json'), encoding='utf-8') as f:
+            yield from json.load(f)
+
+    def stats(self):
+        return self.store.stats()
+
+    def _get_or_create(self, key, create):
+        entry = self.store.lookup(key)
+        if entry is not None:
+            return entry
+        with self._single_flight(key):
+            # Another request may have produced it while we waited
+            entry = self.store.lookup(key, count=False)
+            if entry is None:
+                entry = self.store.store(key, create)
+        return entry
+
+    @contextmanager
+    def _single_flight(self, key):
+        # Thread lock for requests in this process, file lock for other worker processes.
+        # The last holder removes both, so they don't build up with every video id
+        with self._lock:
+            entry = self._thread_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                if fcntl is None:
+                    yield
+                else:
+                    with self._file_lock(key):
+                        yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._thread_locks[key]
+
+    @contextmanager
+    def _file_lock(self, key):
+        path = os.path.join(self._lock_dir, f'{key}.lock')
+        while True:
+            lock_file = open(path, 'a')
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                held = os.fstat(lock_file.fileno())
+                current = os.stat(path)
+                if (held.st_dev, held.st_ino) == (current.st_dev, current.st_ino):
+                    break
+            except FileNotFoundError:
+                pass
+            # The previous holder removed the file after we opened it; lock the new one
+            lock_file.close()
+        try:
+            yield
+        finally:
+            # Removed while still locked, so processes waiting on this file retry on a fresh one
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            lock_file.close()
+
+youtube_cache = YouTubeCache()